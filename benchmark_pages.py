@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Page Benchmark
+Headless AppTest benchmark of every space, page and representative panel count, checked against a committed baseline
+"""
+
+import os
+
+# Every case must build its own figures: no background warm-up, no shared on-disk figures, no timing log
+os.environ.setdefault('CBC_WARMUP', '0')
+os.environ.setdefault('CBC_FIGURE_CACHE', '0')
+os.environ.setdefault('CBC_TIMING_LOG', '0')
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from figure_warmup import clear_figure_store
+from scoped_cache import invalidate
+from session_memory import clear_session_figures
+from space_registry import get_space, space_names
+
+DASHBOARD = Path(__file__).resolve().parent / 'cbc8_acoustic_dashboard.py'
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+PAGES = ["Summary", "Data Explorer", "3D Room Model", "Frequency Response", "Treatment Simulator", "Complete Analysis"]
+PANEL_COUNT_VIEWS = {"3D Room Model", "STI Degradation Heatmap"}
+METRICS = ('wall_s', 'peak_mb', 'payload_kb')
+# Differences below these are noise whatever the relative change. Heap peaks (lowest of several runs)
+# repeat within about 0.15 MB; single runs occasionally spike a few MB
+NOISE_FLOOR = {'wall_s': 0.05, 'peak_mb': 0.5, 'payload_kb': 1.0}
+DEFAULT_THRESHOLD = 0.4
+# Even the fastest of five runs of a case moves by up to about +120% between benchmark processes on a
+# shared single-CPU machine (CPU time moves with it, so it is not waiting), so wall time only flags
+# pages that got markedly slower
+DEFAULT_WALL_THRESHOLD = 1.5
+DEFAULT_REPEATS = 5
+
+# AppTest sets session state outside a script run, which Streamlit warns about on every case
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+    lambda record: "missing ScriptRunContext" not in record.getMessage())
+
+
+def benchmark_cases():
+    """[(case_id, space, page, analysis_view, panel_count)] for every space and page
+
+    Frequency Response expands to each of the space's analysis views; views
+    with a panel-count input run at 0, the space default and the maximum.
+    """
+    cases = []
+    for space in space_names():
+        space_def = get_space(space)
+        panel_counts = sorted({0, space_def.default_panels, space_def.max_panels})
+        for page in PAGES:
+            views = space_def.features.get('analysis_views', []) if page == "Frequency Response" else [None]
+            for view in views:
+                name = f"{space}/{page}" + (f"/{view}" if view else "")
+                if (view or page) in PANEL_COUNT_VIEWS:
+                    cases.extend((f"{name}/panels={count}", space, page, view, count) for count in panel_counts)
+                else:
+                    cases.append((name, space, page, view, None))
+    return cases
+
+
+def _app(space, page, view, panel_count):
+    at = AppTest.from_file(str(DASHBOARD), default_timeout=180)
+    at.query_params["space"] = space
+    at.query_params["page"] = page
+    if view is not None:
+        at.session_state["freq_analysis_type"] = view
+    if panel_count is not None:
+        at.session_state["panel_count"] = panel_count
+    return at
+
+
+def _reset_caches():
+    """Forget figures and computed results so the next run rebuilds them; loaded components stay warm"""
+    clear_figure_store()
+    clear_session_figures()
+    invalidate()
+
+
+def run_case(space, page, view, panel_count):
+    """Wall time, Python heap peak (tracemalloc) and plotly payload of one fresh session
+
+    The heap peak comes from a second run, as tracing allocations slows the
+    script down. It never drops below what AppTest needs to compile the
+    dashboard script (about 3.2 MB).
+    """
+    _reset_caches()
+    at = _app(space, page, view, panel_count)
+    start = time.perf_counter()
+    at.run()
+    wall_s = time.perf_counter() - start
+
+    errors = [str(element.value) for element in at.exception] + [str(element.value) for element in at.error]
+    charts = at.get("plotly_chart")
+    payload_bytes = sum(len(chart.proto.spec) for chart in charts)
+
+    _reset_caches()
+    at = _app(space, page, view, panel_count)
+    tracemalloc.start()
+    at.run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'wall_s': wall_s, 'peak_mb': peak / 1024 / 1024, 'payload_kb': payload_bytes / 1024,
+            'charts': len(charts), 'errors': errors[:3]}
+
+
+def run_cases(cases, repeats=DEFAULT_REPEATS):
+    """{case_id: result} with the fastest wall time and lowest heap peak of repeats runs per case
+
+    Noise only ever adds time or memory, so the lowest run is the steadiest
+    figure to compare. The repeats go round-robin over the cases rather
+    than back to back, so a few seconds of load on the machine slow one
+    run of several cases instead of every run of one case.
+    """
+    runs = {case_id: [] for case_id, *_ in cases}
+    for _ in range(repeats):
+        for case_id, space, page, view, panel_count in cases:
+            runs[case_id].append(run_case(space, page, view, panel_count))
+    results = {}
+    for case_id, case_runs in runs.items():
+        last = case_runs[-1]
+        results[case_id] = {'wall_s': round(min(run['wall_s'] for run in case_runs), 3),
+                            'peak_mb': round(min(run['peak_mb'] for run in case_runs), 2),
+                            'payload_kb': round(last['payload_kb'], 1), 'charts': last['charts'],
+                            'errors': next((run['errors'] for run in case_runs if run['errors']), [])}
+    return results
+
+
+def compare(results, baseline, threshold, wall_threshold=DEFAULT_WALL_THRESHOLD):
+    """[(case_id, metric, baseline, current)] for metrics that regressed beyond their threshold and noise floor
+
+    wall_threshold applies to wall time, threshold to the heap peak and payload.
+    """
+    regressions = []
+    for case_id, result in results.items():
+        expected = baseline.get('cases', {}).get(case_id)
+        if expected is None:
+            continue
+        for metric in METRICS:
+            before, after = expected.get(metric), result[metric]
+            if before is None:
+                continue
+            allowed = wall_threshold if metric == 'wall_s' else threshold
+            if after > before * (1 + allowed) and after - before > NOISE_FLOOR[metric]:
+                regressions.append((case_id, metric, before, after))
+    return regressions
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[-1])
+    parser.add_argument('--filter', default='', help="only run cases whose id contains this text")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS,
+                        help="timed and traced runs per case (the lowest is reported)")
+    parser.add_argument('--threshold', type=float, default=None,
+                        help=f"allowed relative heap peak and payload regression "
+                             f"(default: baseline's, else {DEFAULT_THRESHOLD})")
+    parser.add_argument('--wall-threshold', type=float, default=None,
+                        help=f"allowed relative wall time regression "
+                             f"(default: baseline's, else {DEFAULT_WALL_THRESHOLD})")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true', help="write these results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    threshold = args.threshold if args.threshold is not None else baseline.get('threshold', DEFAULT_THRESHOLD)
+    wall_threshold = (args.wall_threshold if args.wall_threshold is not None
+                      else baseline.get('wall_threshold', DEFAULT_WALL_THRESHOLD))
+    cases = [case for case in benchmark_cases() if args.filter in case[0]]
+
+    # Build the shared components (and import the page modules) before anything is timed
+    for space in {case[1] for case in cases}:
+        for page in PAGES:
+            _app(space, page, None, None).run()
+
+    results = run_cases(cases, repeats=args.repeats)
+    print(f"{'case':62s} {'wall s':>7s} {'peak MB':>8s} {'payload KB':>11s}")
+    for case_id, result in results.items():
+        expected = baseline.get('cases', {}).get(case_id, {})
+        delta = f"  ({(result['wall_s'] / expected['wall_s'] - 1) * 100:+.0f}%)" if expected.get('wall_s') else ""
+        print(f"{case_id:62s} {result['wall_s']:7.3f} {result['peak_mb']:8.2f} {result['payload_kb']:11.1f}{delta}"
+              + (f"  ERRORS {result['errors']}" if result['errors'] else ""))
+
+    failed = [case_id for case_id, result in results.items() if result['errors']]
+    if args.update_baseline:
+        if failed:
+            print(f"Not updating the baseline: {len(failed)} cases raised errors")
+            return 1
+        cases_out = dict(baseline.get('cases', {}))
+        cases_out.update({case_id: {metric: result[metric] for metric in METRICS}
+                          for case_id, result in results.items()})
+        with open(args.baseline, 'w') as f:
+            json.dump({'threshold': threshold, 'wall_threshold': wall_threshold, 'repeats': args.repeats,
+                       'environment': {'python': platform.python_version(), 'streamlit': st.__version__,
+                                       'machine': platform.machine(), 'system': platform.system()},
+                       'cases': dict(sorted(cases_out.items()))}, f, indent=1)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline} ({len(cases_out)} cases)")
+        return 0
+
+    regressions = compare(results, baseline, threshold, wall_threshold)
+    for case_id, metric, before, after in regressions:
+        print(f"REGRESSION {case_id}: {metric} {before} -> {after} (+{(after / before - 1) * 100:.0f}%)")
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+    if failed:
+        print(f"{len(failed)} cases raised errors")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,29 +5,38 @@ Removed problematic CSS transitions that may cause scroll crashes
 """
 
 import streamlit as st
-import pandas as pd
+import base64
+import functools
+import os
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import json
 from pathlib import Path
 import re
 from datetime import datetime
 
-# Import our specialized components with error handling
+from columnar_store import GENERATED_DIR, dataset_files, read_dataset
+from smaart_parser import band_label
+from space_registry import get_space, space_names
+from debounce import mark_changed, settle
+from figure_cache import cached_figure
+from render_timing import begin_run, render_debug_panel, timed
+from session_memory import drop_session_figures, keep_session_figure, render_memory_panel, session_figure
+from startup_profile import import_component
+
+# Import the component layer with error handling; page components are imported on first use
 try:
-    from enhanced_3d_visualizer import Enhanced3DVisualizer
-    from frequency_response_explorer import FrequencyResponseExplorer
-    from treatment_simulator import TreatmentSimulator
-    from rt60_heatmap_analyzer_fixed import RT60HeatmapAnalyzer
-    from data_explorer import render_data_explorer
+    from shared_models import get_shared_models
+    from figure_warmup import get_figure_store, start_warmup
     COMPONENTS_LOADED = True
     COMPONENT_ERROR = None
 except ImportError as e:
     COMPONENTS_LOADED = False
     COMPONENT_ERROR = f"⚠️ Component import error: {e}"
 
+# Panel-count figures precomputed for every count at server start and shared by all sessions
+FIGURE_VIEWS = ('3d_model', 'rt60_heatmap', 'sti_adjusted')
+
 # Simplified CSS without problematic transitions and transforms
 DASHBOARD_CSS = """
 <style>
@@ -188,29 +197,31 @@ DASHBOARD_CSS = """
 </style>
 """
 
+@functools.lru_cache(maxsize=4)
+def _encode_logo(path, mtime_ns):
+    with open(path, 'rb') as f:
+        return base64.b64encode(f.read()).decode()
+
+
 class AcousticDashboard:
     def __init__(self):
         self.base_path = Path('.')
         self.data_cache = {}
         
-        # Initialize specialized components with error handling
+        # Specialized components are shared by all sessions and built once per data version
         try:
-            if COMPONENTS_LOADED:
-                self.visualizer_3d = Enhanced3DVisualizer()
-                self.freq_explorer = FrequencyResponseExplorer()
-                self.treatment_sim = TreatmentSimulator()
-                self.rt60_analyzer = RT60HeatmapAnalyzer()
-            else:
-                self.visualizer_3d = None
-                self.freq_explorer = None
-                self.treatment_sim = None
-                self.rt60_analyzer = None
+            self.models = get_shared_models() if COMPONENTS_LOADED else None
         except Exception as e:
             st.error(f"⚠️ Component initialization error: {e}")
-            self.visualizer_3d = None
-            self.freq_explorer = None  
-            self.treatment_sim = None
-            self.rt60_analyzer = None
+            self.models = None
+        
+        # Figures this class builds itself are keyed by the same fingerprint (see cached_figure)
+        self.data_fingerprint = self.models.fingerprint if self.models else None
+        
+        # The first run in this process (or after a data change) starts warming every panel-count figure
+        self.figures = get_figure_store(self.models.fingerprint) if self.models else None
+        if self.models:
+            start_warmup(self.models.fingerprint, self.warmup_jobs)
         
     def convert_panel_count_to_specs_hub(self, panel_count):
         """Convert total panel count to panel specifications for The Hub
@@ -247,12 +258,68 @@ class AcousticDashboard:
                    "3_inch": min(6, 4 + (panel_count - 12) // 3), 
                    "2_inch": max(0, panel_count - 12)}
     
+    def get_component(self, kind, space):
+        """Shared component ('visualizer_3d', 'freq_explorer', 'treatment_sim' or 'rt60_analyzer'), built on first use"""
+        if not self.models:
+            return None
+        try:
+            return getattr(self.models, kind)(space)
+        except Exception as e:
+            st.error(f"⚠️ Component initialization error for {space}: {e}")
+            return None
+    
+    def build_figure(self, view, space, panel_count):
+        """Build one panel-count figure ('3d_model', 'rt60_heatmap' or 'sti_adjusted'); None if the space has no such view"""
+        space_def = get_space(space)
+        if view == '3d_model':
+            visualizer_3d = self.get_component('visualizer_3d', space)
+            return visualizer_3d.create_space_model(space, show_panels=True, panel_count=panel_count) if visualizer_3d else None
+        if view == 'rt60_heatmap':
+            # Spaces with a calibrated panel model use their analyzer; others scale the measurements
+            heatmap_source = space_def.features.get('rt60_heatmap')
+            if heatmap_source == "analyzer":
+                rt60_analyzer = self.get_component('rt60_analyzer', space)
+                return rt60_analyzer.create_rt60_heatmap(panel_count) if rt60_analyzer else None
+            if heatmap_source == "scaled_measurements":
+                return self.create_hub_theoretical_heatmap(panel_count)
+            return None
+        if view == 'sti_adjusted':
+            freq_explorer = self.get_component('freq_explorer', space) if space_def.has('sti') else None
+            return freq_explorer.create_sti_adjusted_figure(panel_count) if freq_explorer else None
+        raise ValueError(f"Unknown figure view: {view}")
+    
+    @timed('figure')
+    def get_figure(self, view, space, panel_count):
+        """Panel-count figure from the shared figure store, built now if the warm-up has not reached it yet
+        
+        Stored figures are shared by every session; draw a copy when adjusting one.
+        """
+        if self.figures is None:
+            return self.build_figure(view, space, panel_count)
+        return self.figures.get_or_build((get_space(space).name, view, panel_count),
+                                         lambda: self.build_figure(view, space, panel_count))
+    
+    def warmup_jobs(self):
+        """(key, build) for every figure view at every panel count of every space, default counts first"""
+        jobs = []
+        for space in space_names():
+            space_def = get_space(space)
+            counts = sorted(range(space_def.max_panels + 1), key=lambda count: abs(count - space_def.default_panels))
+            for panel_count in counts:
+                for view in FIGURE_VIEWS:
+                    if view == 'sti_adjusted' and not space_def.has('sti'):
+                        continue
+                    jobs.append(((space_def.name, view, panel_count),
+                                 functools.partial(self.build_figure, view, space, panel_count)))
+        return jobs
+    
+    @timed('load')
     def load_csv_data(self, filename_pattern):
         """Load CSV data matching pattern"""
         try:
-            matching_files = list(self.base_path.glob(f"*{filename_pattern}*.csv"))
+            matching_files = dataset_files(self.base_path, f"*{filename_pattern}*")
             if matching_files:
-                return pd.read_csv(matching_files[0])
+                return read_dataset(matching_files[0])
             return None
         except Exception as e:
             st.error(f"Error loading {filename_pattern}: {e}")
@@ -260,27 +327,20 @@ class AcousticDashboard:
     
     def get_space_data_files(self, space):
         """Get space-specific data file paths"""
-        space_id = "Studio8" if space == "Studio 8" else "TheHub"
-        
-        # Map of data types to file patterns
-        data_files = {
-            'frequency_response': f'data/generated/*{space_id}-Complete_Frequency_Response.csv',
-            'treatment_priority': f'data/generated/*{space_id}-Treatment_Priority_Matrix.csv',
-            'evidence_degradation': f'data/generated/*{space_id}-Evidence_Degradation_Analysis.csv',
-            'modal_stack': f'data/generated/*{space_id}-Modal_Stack_Analysis.csv',
-            'drape_compensation': f'data/generated/*{space_id}-Drape_Compensation_Evidence.csv'
-        }
-        
-        return data_files
+        # Data types map to file patterns in the space's registry entry
+        datasets = get_space(space).datasets
+        return {data_type: str(GENERATED_DIR / f'{pattern}.csv') for data_type, pattern in datasets.items()}
     
+    @timed('load')
     def load_space_data(self, space, data_type):
         """Load specific data type for a given space"""
         try:
             data_files = self.get_space_data_files(space)
             if data_type in data_files:
-                matching_files = list(self.base_path.glob(data_files[data_type]))
+                pattern = Path(data_files[data_type])
+                matching_files = dataset_files(self.base_path / pattern.parent, pattern.stem)
                 if matching_files:
-                    return pd.read_csv(matching_files[0])
+                    return read_dataset(matching_files[0])
             return None
         except Exception as e:
             st.error(f"Error loading {data_type} data for {space}: {e}")
@@ -288,18 +348,16 @@ class AcousticDashboard:
     
     def _get_logo_base64(self):
         """Convert CBC logo to base64 for inline display"""
-        import base64
-        from pathlib import Path
-        
         try:
             logo_path = Path('assets/cbc_gem_logo.png')
             if logo_path.exists():
-                with open(logo_path, 'rb') as f:
-                    return base64.b64encode(f.read()).decode()
+                # Encoded once per logo file version rather than on every rerun
+                return _encode_logo(str(logo_path), logo_path.stat().st_mtime_ns)
         except Exception as e:
             st.error(f"Error loading logo: {e}")
         return ""
     
+    @timed('render')
     def render_dashboard(self):
         """Main dashboard rendering function"""
         
@@ -326,34 +384,28 @@ class AcousticDashboard:
         
         # Initialize session state for persistence
         if "selected_space" not in st.session_state:
-            st.session_state.selected_space = query_params.get("space", "Studio 8")
+            st.session_state.selected_space = query_params.get("space", space_names()[0])
         if "viz_type" not in st.session_state:
             st.session_state.viz_type = query_params.get("page", "Summary")
         
         # Space selection with persistence
+        spaces = space_names()
         selected_space = st.sidebar.selectbox(
             "Broadcast Space",
-            ["Studio 8", "The Hub"],
-            index=["Studio 8", "The Hub"].index(st.session_state.selected_space) if st.session_state.selected_space in ["Studio 8", "The Hub"] else 0,
+            spaces,
+            index=spaces.index(st.session_state.selected_space) if st.session_state.selected_space in spaces else 0,
             help="Choose which broadcast space to analyze",
             key="space_selector"
         )
-        # Add delay for smoothness
-        import time
-        time.sleep(0.05)
         
         # Update session state and URL when space changes
         if selected_space != st.session_state.selected_space:
             st.session_state.selected_space = selected_space
             st.query_params["space"] = selected_space
-            # Clear any cached data when space changes to force refresh
-            if hasattr(st.session_state, 'cached_3d_fig'):
-                st.session_state.cached_3d_fig = None
-            if hasattr(st.session_state, 'cached_rt60_fig'):
-                st.session_state.cached_rt60_fig = None
+            # Clear any cached figures when space changes to force refresh
+            drop_session_figures()
             # Reset panel count to space-appropriate default
-            default_count = 0 if selected_space == "The Hub" else 25
-            st.session_state.panel_count = default_count
+            st.session_state.panel_count = get_space(selected_space).default_panels
             # Force rerun to refresh all components
             st.rerun()
         
@@ -366,8 +418,6 @@ class AcousticDashboard:
             help="Select the type of analysis to display",
             key="page_selector"
         )
-        # Add delay for smoothness
-        time.sleep(0.05)
         
         # Update session state and URL when page changes
         if viz_type != st.session_state.viz_type:
@@ -393,18 +443,16 @@ class AcousticDashboard:
                 col1, col2, col3 = st.sidebar.columns([0.1, 0.8, 0.1])
                 with col2:
                     if st.button(preset_name, key=f"sidebar_camera_{preset_name}", use_container_width=True):
-                        # Add delay for smoothness
-                        time.sleep(0.05)
                         selected_preset = preset_data
         
         # Main content area
         if viz_type == "Summary":
             self.render_executive_dashboard(selected_space)
         elif viz_type == "Data Explorer":
-            if COMPONENTS_LOADED:
-                render_data_explorer(selected_space)
-            else:
-                st.error("Data Explorer component not available due to import errors")
+            try:
+                import_component('data_explorer').render_data_explorer(selected_space)
+            except ImportError as e:
+                st.error(f"Data Explorer component not available due to import errors: {e}")
         elif viz_type == "3D Room Model":
             self.render_3d_model(selected_space, selected_preset)
         elif viz_type == "Frequency Response":
@@ -414,6 +462,7 @@ class AcousticDashboard:
         elif viz_type == "Complete Analysis":
             self.render_complete_analysis(selected_space)
     
+    @timed('render')
     def render_executive_dashboard(self, space):
         """Render executive summary dashboard for stakeholders"""
         
@@ -429,12 +478,12 @@ class AcousticDashboard:
         total_panels = treatment_data['recommended_panels'].apply(lambda x: int(x.split('-')[1].split()[0])).sum()
         estimated_cost = total_panels * 30  # $30 per panel estimate
         
-        # STI data handling - only available for Studio 8
-        if space == "Studio 8":
+        # STI data handling - only available where STI was recorded (Studio 8)
+        if get_space(space).has('sti'):
             avg_sti_degradation = evidence_data['sti_degradation_percent'].mean()
             worst_position = evidence_data.loc[evidence_data['sti_degradation_percent'].idxmax()]
         else:
-            # The Hub - no STI data was recorded
+            # No STI data was recorded (The Hub)
             avg_sti_degradation = None
             worst_position = None
         
@@ -539,6 +588,7 @@ class AcousticDashboard:
         # Executive summary section using native Streamlit components
         self.render_summary_content(space)
     
+    @timed('render')
     def render_summary_content(self, space):
         """Render comprehensive acoustic treatment summary using native Streamlit components"""
         
@@ -671,47 +721,47 @@ class AcousticDashboard:
         st.write("**EDT (Early Decay Time)**")
         st.write("Time (seconds) for initial 10 dB sound decay extrapolated to 60 dB; correlates strongly with perceived reverberation.")
     
+    @timed('render')
     def render_3d_model(self, space, selected_preset=None):
         """Render 3D room model with RT60 heatmap"""
         
-        # Initialize session state for camera view persistence and 3D model caching
+        # Initialize session state for camera view persistence
         if "camera_view" not in st.session_state:
             st.session_state.camera_view = None
-        if "last_panel_count_3d" not in st.session_state:
-            st.session_state.last_panel_count_3d = 25
-        if "cached_3d_fig" not in st.session_state:
-            st.session_state.cached_3d_fig = None
         if "model_revision_id" not in st.session_state:
             st.session_state.model_revision_id = "model_v1"
-        if "last_panel_count" not in st.session_state:
-            st.session_state.last_panel_count = 25
-        if "cached_rt60_fig" not in st.session_state:
-            st.session_state.cached_rt60_fig = None
         if "panel_count" not in st.session_state:
             st.session_state.panel_count = 25
         
+        # Sidebar presets take priority over the preserved camera view
+        if selected_preset:
+            st.session_state.camera_view = dict(eye=selected_preset["eye"])
+        
+        self.render_3d_view(space)
+    
+    @st.fragment
+    @timed('render')
+    def render_3d_view(self, space):
+        """Panel count input, 3D model and RT60 heatmap; reruns on its own when the panel count changes"""
+        space_def = get_space(space)
+        
         # Two-column header layout matching Frequency Analysis page
         header_col1, header_col2 = st.columns([1, 1])
         
         with header_col1:
-            if space == "The Hub":
-                st.info("🎯 **Interactive 3D Model:** Explore The Hub's hexagonal geometry and panel placement optimization")
-            else:
-                st.info("🎯 **Interactive 3D Model:** Rotate, zoom, and click on measurement positions to explore the acoustic space")
+            st.info(space_def.geometry['intro'])
         
         with header_col2:
             # Initialize panel count in session state with space-specific defaults
             if 'panel_count' not in st.session_state:
-                default_count = 0 if space == "The Hub" else 25
-                st.session_state.panel_count = default_count
+                st.session_state.panel_count = space_def.default_panels
             
             # Panel count text input with space-specific max values
-            max_panels = 16 if space == "The Hub" else 32
+            max_panels = space_def.max_panels
             
             # Reset panel count if it exceeds the current space's maximum
             if st.session_state.panel_count > max_panels:
-                default_count = 0 if space == "The Hub" else 25
-                st.session_state.panel_count = default_count
+                st.session_state.panel_count = space_def.default_panels
             
             current_panel_count = st.number_input(
                 label="Panel Count",
@@ -720,14 +770,16 @@ class AcousticDashboard:
                 value=st.session_state.panel_count,
                 step=1,
                 key="3d_panel_number_input",
-                help=f"Enter panel count directly (max {max_panels} for {space})"
+                help=f"Enter panel count directly (max {max_panels} for {space})",
+                on_change=mark_changed,
+                args=("3d_panel_number_input",)
             )
-            # Add delay for smoothness
-            import time
-            time.sleep(0.05)
             # Update session state with typed value
             st.session_state.panel_count = current_panel_count
         
+        # Let rapid +/- presses coalesce before rebuilding the charts
+        settle("3d_panel_number_input")
+        
         # Store current panel count for use in visualization
         panel_count = st.session_state.panel_count
         
@@ -737,33 +789,23 @@ class AcousticDashboard:
         with viz_col1:
             st.subheader("3D Room Model")
             
-            if self.visualizer_3d:
-                # Only regenerate 3D model if panel count changed or no cached version exists
-                if (st.session_state.cached_3d_fig is None or 
-                    st.session_state.last_panel_count_3d != panel_count):
-                    
-                    if space == "Studio 8":
-                        fig = self.visualizer_3d.create_studio8_detailed_model(show_panels=True, panel_count=panel_count)
-                    elif space == "The Hub":
-                        # For now, use simple panel_count until 3D visualizer is updated across all environments
-                        fig = self.visualizer_3d.create_hub_detailed_model(show_panels=True, panel_count=panel_count)
-                    else:
+            visualizer_3d = self.get_component('visualizer_3d', space)
+            if visualizer_3d:
+                # Only look up the 3D model if this session has not kept it (or it was evicted)
+                figure_key = (space, '3d_model', panel_count)
+                fig = session_figure(figure_key)
+                if fig is None:
+                    fig = self.get_figure('3d_model', space, panel_count)
+                    if fig is None:
                         st.write(f"3D model not available for {space}")
                         return
                         
-                    st.session_state.cached_3d_fig = fig
-                    st.session_state.last_panel_count_3d = panel_count
-                    # Update revision ID when model actually changes
-                    st.session_state.model_revision_id = f"model_v{panel_count}_{hash(str(panel_count))}"
-                else:
-                    fig = st.session_state.cached_3d_fig
+                    keep_session_figure(figure_key, fig)
+                # Revision ID changes with the model, so the camera resets only when the panel count does
+                st.session_state.model_revision_id = f"model_v{panel_count}_{hash(str(panel_count))}"
                 
-                # Preserve camera view from previous interaction or apply preset
-                if selected_preset:
-                    # Sidebar preset takes priority - update both figure and session state
-                    camera_settings = dict(eye=selected_preset["eye"])
-                    st.session_state.camera_view = camera_settings
-                elif st.session_state.camera_view:
+                # Preserve camera view from previous interaction or sidebar preset
+                if st.session_state.camera_view:
                     # Use preserved camera view
                     camera_settings = st.session_state.camera_view
                 else:
@@ -771,46 +813,48 @@ class AcousticDashboard:
                     camera_settings = dict(eye=dict(x=1.05, y=1.25, z=0.005))
                     st.session_state.camera_view = camera_settings
                 
-                # Always apply the camera settings to the figure
-                fig.update_layout(
+                # Use a stable key that doesn't change with panel count to preserve interactions
+                chart_key = f"3d_model_{space.replace(' ', '_').lower()}_stable"
+                
+                # The figure is shared with other sessions: apply this session's camera to its own copy
+                session_fig = go.Figure(fig.to_dict(), _validate=False)
+                session_fig.update_layout(
                     scene=dict(
                         camera=camera_settings,
                         aspectmode='data'
                     ),
                     uirevision=st.session_state.model_revision_id  # Preserve UI state with consistent revision ID
                 )
-                
-                # Use a stable key that doesn't change with panel count to preserve interactions
-                chart_key = f"3d_model_{space.replace(' ', '_').lower()}_stable"
-                st.plotly_chart(fig, use_container_width=True, key=chart_key)
+                st.plotly_chart(session_fig, use_container_width=True, key=chart_key)
             else:
                 st.write("3D visualization not available")
         
         with viz_col2:
             st.subheader("RT60 Heatmap")
             
-            if space == "Studio 8" and self.rt60_analyzer:
-                # Only regenerate RT60 heatmap if panel count changed
-                if (st.session_state.cached_rt60_fig is None or 
-                    st.session_state.last_panel_count != panel_count):
-                    
-                    rt60_fig = self.rt60_analyzer.create_rt60_heatmap(panel_count)
-                    st.session_state.cached_rt60_fig = rt60_fig
-                    st.session_state.last_panel_count = panel_count
-                else:
-                    rt60_fig = st.session_state.cached_rt60_fig
+            # Spaces with a calibrated panel model use their analyzer; others scale the measurements
+            heatmap_source = space_def.features.get('rt60_heatmap')
+            rt60_analyzer = self.get_component('rt60_analyzer', space) if heatmap_source == "analyzer" else None
+            if rt60_analyzer:
+                # Only look up the RT60 heatmap if this session has not kept it (or it was evicted)
+                figure_key = (space, 'rt60_heatmap', panel_count)
+                rt60_fig = session_figure(figure_key)
+                if rt60_fig is None:
+                    rt60_fig = self.get_figure('rt60_heatmap', space, panel_count)
+                    if rt60_fig is not None:
+                        keep_session_figure(figure_key, rt60_fig)
                 
                 # Use a unique key for RT60 chart to maintain its state
                 heatmap_key = f"rt60_heatmap_{space.replace(' ', '_').lower()}_{panel_count}"
                 st.plotly_chart(rt60_fig, use_container_width=True, key=heatmap_key)
                 
                 # RT60 analysis summary
-                self.render_rt60_summary(panel_count)
-            elif space == "The Hub":
+                self.render_rt60_summary(space, panel_count)
+            elif heatmap_source == "scaled_measurements":
                 st.info("📊 **RT60 Heatmap for The Hub**")
                 
                 # Create theoretical Hub RT60 heatmap based on panel count
-                hub_rt60_fig = self.create_hub_theoretical_heatmap(panel_count)
+                hub_rt60_fig = self.get_figure('rt60_heatmap', space, panel_count)
                 if hub_rt60_fig:
                     heatmap_key = f"rt60_heatmap_hub_{panel_count}"
                     st.plotly_chart(hub_rt60_fig, use_container_width=True, key=heatmap_key)
@@ -822,25 +866,25 @@ class AcousticDashboard:
             else:
                 st.write("RT60 analysis not available")
     
-    def render_rt60_summary(self, panel_count):
+    @timed('render')
+    def render_rt60_summary(self, space, panel_count):
         """Render condensed RT60 analysis summary for 3D model page"""
-        if not self.rt60_analyzer:
+        rt60_analyzer = self.get_component('rt60_analyzer', space)
+        if not rt60_analyzer:
             return
             
-        rt60_data = self.rt60_analyzer.calculate_rt60_with_panels(panel_count)
+        rt60 = rt60_analyzer.calculate_rt60_matrix(panel_count)
         
-        # Calculate key statistics
-        all_values = []
-        for pos_data in rt60_data.values():
-            all_values.extend(pos_data.values())
+        # Calculate key statistics over the measured bands
+        all_values = rt60[rt60_analyzer.rt60_valid]
         
         avg_rt60 = np.mean(all_values)
         min_rt60 = np.min(all_values)
         max_rt60 = np.max(all_values)
         
-        # Broadcast standard targets for Studio 8
-        target_min, target_max = 0.3, 0.4
-        in_target = sum(1 for val in all_values if target_min <= val <= target_max)
+        # Broadcast standard targets for the space
+        target_min, target_max = get_space(space).targets['broadcast_rt60_range']
+        in_target = np.count_nonzero((all_values >= target_min) & (all_values <= target_max))
         target_percentage = (in_target / len(all_values)) * 100
         
         # Determine status and colors
@@ -901,6 +945,8 @@ class AcousticDashboard:
         # Footer info
         st.info(f"**Target:** 0.3-0.4s for broadcast quality | **Panel Count:** {panel_count} panels")
     
+    @timed('figure')
+    @cached_figure('rt60_heatmap', space=lambda self: 'The Hub')
     def create_hub_theoretical_heatmap(self, panel_count=0):
         """Create RT60 heatmap for The Hub using real measurement data"""
         import plotly.graph_objects as go
@@ -937,7 +983,7 @@ class AcousticDashboard:
                     row_values.append(adjusted_rt60)
                     hover_row.append(f"{pos_name}<br>{freq}: {adjusted_rt60:.2f}s<br>Panels: {panel_count}")
                 else:
-                    row_values.append(0.4)  # fallback
+                    row_values.append(np.nan)  # Unmeasured band (left blank)
                     hover_row.append(f"{pos_name}<br>{freq}: No data<br>Panels: {panel_count}")
             
             z_values.append(row_values)
@@ -1004,62 +1050,21 @@ class AcousticDashboard:
         
         return fig
     
+    @timed('load')
     def load_hub_rt60_data(self):
         """Load actual RT60 measurements from Hub Smaart log files"""
-        from pathlib import Path
-        
-        # Path to Hub Smaart logs
-        hub_path = Path('data/raw/250715-smaartLogs/TheHub')
-        
-        # Mapping from file names to position names
-        file_to_position = {
-            'TheHub-Chair1-64k.txt': 'Chair1',
-            'TheHub-Chair2-64k.txt': 'Chair2',
-            'TheHub-MidRoom-64k.txt': 'MidRoom',
-            'TheHub-BackCorner-64k.txt': 'BackCorner',
-            'TheHub-CeilingCorner-64k.txt': 'CeilingCorner'
-        }
+        # Latest Hub campaign from the multi-campaign measurement index
+        index = import_component('measurement_index').get_measurement_index()
+        measured = index.band_values('The Hub', 'RT60', bands=[125, 250, 500, 1000, 2000, 4000, 8000])
         
+        # Valid (non-zero) RT60 measurements keyed by band label
         hub_data = {}
-        
-        for filename, position in file_to_position.items():
-            file_path = hub_path / filename
-            if not file_path.exists():
-                continue
-                
-            try:
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-                
-                # Parse RT60 values (same format as Studio 8)
-                position_data = {}
-                for line in lines:
-                    if line.startswith('Oct\t') and 'Hz' in line:
-                        parts = line.strip().split('\t')
-                        if len(parts) >= 3:
-                            freq_str = parts[1]
-                            rt60_str = parts[2]
-                            
-                            try:
-                                rt60_val = float(rt60_str)
-                                if rt60_val > 0:  # Valid measurement
-                                    # Map frequencies to match our labels
-                                    freq_map = {'125Hz': '125Hz', '250Hz': '250Hz', '500Hz': '500Hz', 
-                                              '1kHz': '1kHz', '2kHz': '2kHz', '4kHz': '4kHz', '8kHz': '8kHz'}
-                                    if freq_str in freq_map:
-                                        position_data[freq_map[freq_str]] = rt60_val
-                            except ValueError:
-                                continue
-                
-                if position_data:
-                    hub_data[position] = position_data
-                    
-            except Exception as e:
-                st.warning(f"Error loading Hub data from {filename}: {e}")
-                continue
+        for position, rt60_data in measured.items():
+            hub_data[position] = {band_label(freq): value for freq, value in rt60_data.items()}
         
         return hub_data
     
+    @timed('render')
     def render_hub_rt60_summary(self, panel_count):
         """Render RT60 analysis summary specific to The Hub"""
         # Calculate theoretical averages
@@ -1121,45 +1126,50 @@ class AcousticDashboard:
         
         st.info(f"**Hub Target:** 0.2-0.3s (compact space) | **Panel Count:** {panel_count} panels")
     
+    @timed('render')
     def render_frequency_analysis(self, space):
         """Render frequency analysis dashboard using specialized explorer"""
         
         # Use the specialized frequency response explorer
-        if self.freq_explorer:
+        freq_explorer = self.get_component('freq_explorer', space)
+        if freq_explorer:
             # Check if the method accepts space parameter
             try:
                 import inspect
-                sig = inspect.signature(self.freq_explorer.render_frequency_explorer)
+                sig = inspect.signature(freq_explorer.render_frequency_explorer)
                 if 'space' in sig.parameters:
-                    self.freq_explorer.render_frequency_explorer(space)
+                    freq_explorer.render_frequency_explorer(space)
                 else:
                     # Component doesn't support space parameter yet, render without note
-                    self.freq_explorer.render_frequency_explorer()
+                    freq_explorer.render_frequency_explorer()
             except Exception as e:
                 st.error(f"Error rendering frequency explorer: {e}")
                 # Don't call again - this was causing duplicate key errors
         else:
             st.error("Frequency explorer not available")
     
+    @timed('render')
     def render_treatment_simulator(self, space):
         """Render treatment impact simulator using specialized component"""
         
         # Use the specialized treatment simulator
-        if self.treatment_sim:
+        treatment_sim = self.get_component('treatment_sim', space)
+        if treatment_sim:
             # Check if the method accepts space parameter
             try:
                 import inspect
-                sig = inspect.signature(self.treatment_sim.render_treatment_simulator)
+                sig = inspect.signature(treatment_sim.render_treatment_simulator)
                 if 'space' in sig.parameters:
-                    self.treatment_sim.render_treatment_simulator(space)
+                    treatment_sim.render_treatment_simulator(space)
                 else:
                     # Component doesn't support space parameter yet, render without note
-                    self.treatment_sim.render_treatment_simulator()
+                    treatment_sim.render_treatment_simulator()
             except Exception as e:
-                self.treatment_sim.render_treatment_simulator()
+                treatment_sim.render_treatment_simulator()
         else:
             st.error("Treatment simulator not available")
     
+    @timed('render')
     def render_complete_analysis(self, space):
         """Render complete analysis with all components"""
         
@@ -1205,9 +1215,17 @@ def main():
     if COMPONENT_ERROR:
         st.error(COMPONENT_ERROR)
     
+    # Collect render/load/figure timings for the debug panel (?debug=1 or CBC_DEBUG=1)
+    show_debug = st.query_params.get("debug") == "1" or os.environ.get('CBC_DEBUG') == '1'
+    begin_run(measure_payload=show_debug and st.session_state.get("_timing_measure_payload", False))
+    
     # Initialize and render dashboard
     dashboard = AcousticDashboard()
     dashboard.render_dashboard()
+    
+    if show_debug:
+        render_debug_panel()
+        render_memory_panel()
 
 if __name__ == "__main__":
     try:
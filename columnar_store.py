@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Columnar Dataset Store
+Array bundles (.npz) for the generated datasets: dictionary-encoded text columns, float32 measurements
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+GENERATED_DIR = Path("data/generated")
+BUNDLE_SUFFIX = '.npz'
+
+# Bump when the bundle layout changes; older bundles are rebuilt from their CSV
+BUNDLE_VERSION = 1
+
+
+def bundle_path(csv_path):
+    """Bundle that stores the columnar copy of a generated CSV"""
+    return Path(csv_path).with_suffix(BUNDLE_SUFFIX)
+
+
+def _code_dtype(n_categories):
+    """Smallest signed integer type that holds the category codes (-1 marks missing)"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def encode_frame(df):
+    """Convert a DataFrame into a few named arrays plus a JSON column schema
+
+    Text columns are dictionary encoded (integer codes + unique values),
+    float columns are stored as float32, integer and bool columns unchanged.
+    Columns of the same kind share one 2-D block (one row per column, so each
+    column stays contiguous) and even wide tables are a handful of arrays.
+    """
+    blocks = {'float32': [], 'int': [], 'bool': [], 'dict': []}
+    dictionaries = []
+    schema = []
+    for name in df.columns:
+        column = df[name]
+        if pd.api.types.is_bool_dtype(column):
+            kind, values = 'bool', column.to_numpy(dtype=bool)
+        elif pd.api.types.is_integer_dtype(column):
+            kind, values = 'int', column.to_numpy(dtype=np.int64)
+        elif pd.api.types.is_float_dtype(column):
+            kind, values = 'float32', column.to_numpy(dtype=np.float32)
+        else:
+            kind = 'dict'
+            values, categories = pd.factorize(column.astype('object'), use_na_sentinel=True)
+            dictionaries.append([str(value) for value in categories])
+        schema.append({'name': str(name), 'kind': kind, 'index': len(blocks[kind])})
+        blocks[kind].append(values)
+
+    n_rows = len(df)
+    arrays = {
+        'float32': np.vstack(blocks['float32']) if blocks['float32'] else np.empty((0, n_rows), np.float32),
+        'int': np.vstack(blocks['int']) if blocks['int'] else np.empty((0, n_rows), np.int64),
+        'bool': np.vstack(blocks['bool']) if blocks['bool'] else np.empty((0, n_rows), bool)
+    }
+    n_values = max((len(values) for values in dictionaries), default=0)
+    code_dtype = _code_dtype(n_values)
+    arrays['codes'] = (np.vstack(blocks['dict']).astype(code_dtype) if blocks['dict']
+                       else np.empty((0, n_rows), code_dtype))
+    arrays['dict_values'] = np.asarray([value for values in dictionaries for value in values], dtype=str)
+    arrays['dict_offsets'] = np.cumsum([0] + [len(values) for values in dictionaries]).astype(np.int64)
+    arrays['schema'] = np.array(json.dumps({'version': BUNDLE_VERSION, 'columns': schema}))
+    return arrays
+
+
+def decode_arrays(arrays):
+    """Rebuild a DataFrame from encode_frame() output
+
+    Dictionary columns are expanded with a single take() that reuses one string
+    object per distinct value, so text columns behave exactly as from read_csv.
+    """
+    meta = json.loads(str(arrays['schema']))
+    if meta.get('version') != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported bundle version {meta.get('version')}")
+    offsets = arrays['dict_offsets']
+    dict_values = arrays['dict_values'].astype(object)
+    columns = {}
+    for column in meta['columns']:
+        i = column['index']
+        if column['kind'] == 'dict':
+            # Missing values (code -1) pick up the trailing None
+            categories = np.append(dict_values[offsets[i]:offsets[i + 1]], None)
+            columns[column['name']] = categories.take(arrays['codes'][i].astype(np.int64))
+        else:
+            columns[column['name']] = arrays[column['kind']][i]
+    return pd.DataFrame(columns)
+
+
+def write_bundle(df, path):
+    """Write a DataFrame as a columnar bundle (atomically)"""
+    write_arrays(encode_frame(df), path)
+
+
+def write_arrays(arrays, path):
+    """Write encode_frame() output as a columnar bundle (atomically)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp{BUNDLE_SUFFIX}")
+    try:
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def read_bundle(path):
+    """Load a columnar bundle into a DataFrame"""
+    with np.load(path, allow_pickle=False) as data:
+        return decode_arrays({key: data[key] for key in data.files})
+
+
+def read_dataset(csv_path):
+    """Load a generated dataset from its columnar bundle
+
+    The bundle is (re)built from the CSV when it is missing or older than the
+    CSV, so hand-edited or freshly generated CSVs are picked up automatically.
+    Either file on its own is enough to load the dataset.
+
+    Float columns come back as float32 (see encode_frame); callers that show
+    or export raw values should pass the result through widen_floats().
+    """
+    csv_path = Path(csv_path)
+    path = bundle_path(csv_path)
+    csv_mtime = csv_path.stat().st_mtime_ns if csv_path.exists() else None
+
+    if path.exists() and (csv_mtime is None or path.stat().st_mtime_ns >= csv_mtime):
+        try:
+            return read_bundle(path)
+        except (OSError, KeyError, ValueError) as e:
+            if csv_mtime is None:
+                raise
+            print(f"Rebuilding {path.name}: {e}")
+
+    arrays = encode_frame(pd.read_csv(csv_path))
+    try:
+        write_arrays(arrays, path)
+    except OSError as e:
+        # Read-only deployments still work from the CSV
+        print(f"Warning: could not write {path}: {e}")
+    return decode_arrays(arrays)
+
+
+def widen_floats(df):
+    """Convert float32 columns back to the float64 values the CSV held (for tables and exports)
+
+    Going through the shortest decimal repr avoids showing float32 artefacts
+    like 47.369999 where the source said 47.37.
+    """
+    df = df.copy()
+    for name in df.columns:
+        if df[name].dtype == np.float32:
+            df[name] = df[name].to_numpy().astype(str).astype(np.float64)
+    return df
+
+
+def dataset_files(directory=GENERATED_DIR, pattern='*'):
+    """CSV paths of every dataset in a directory, whether stored as CSV, bundle or both"""
+    directory = Path(directory)
+    stems = {path.stem for path in directory.glob(f'{pattern}.csv')}
+    stems |= {path.stem for path in directory.glob(f'{pattern}{BUNDLE_SUFFIX}') if not path.name.startswith('.')}
+    return sorted(directory / f'{stem}.csv' for stem in stems)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    directory = Path(sys.argv[1]) if len(sys.argv) > 1 else GENERATED_DIR
+    for csv_file in sorted(directory.glob('*.csv')):
+        start = time.perf_counter()
+        df = pd.read_csv(csv_file)
+        csv_time = time.perf_counter() - start
+        write_bundle(df, bundle_path(csv_file))
+
+        start = time.perf_counter()
+        read_bundle(bundle_path(csv_file))
+        bundle_time = time.perf_counter() - start
+        csv_size = csv_file.stat().st_size
+        bundle_size = bundle_path(csv_file).stat().st_size
+        print(f"{csv_file.name}: {csv_size / 1024:.0f} KB -> {bundle_size / 1024:.0f} KB, "
+              f"load {csv_time * 1000:.1f} ms -> {bundle_time * 1000:.1f} ms")
@@ -13,6 +13,45 @@ import plotly.graph_objects as go
 from datetime import datetime
 import json
 
+from columnar_store import dataset_files, read_dataset, widen_floats
+from scoped_cache import cached
+from render_timing import timed
+
+
+@timed('load')
+@cached('data_explorer', datasets=lambda csv_file: [csv_file])
+def load_table(csv_file):
+    """One generated dataset with float64 columns, shared between sessions (do not modify in place)"""
+    return widen_floats(read_dataset(csv_file))
+
+
+@timed('load')
+@cached('data_explorer', datasets=lambda data_dir: dataset_files(data_dir))
+def combined_csv_text(data_dir):
+    """(text, errors): every dataset in data_dir as one CSV document with '=== name ===' section headers
+
+    errors lists the datasets left out because they could not be read, so
+    callers report them on every run, not only on the run that filled the cache.
+    """
+    from io import StringIO
+    combined_csv = StringIO()
+    errors = []
+    first_sheet = True
+    for csv_file in dataset_files(data_dir):
+        try:
+            df = load_table(csv_file)
+        except Exception as e:
+            errors.append(f"Error reading {csv_file.name}: {e}")
+            continue
+        sheet_name = csv_file.stem.replace('250728-', '').replace('-', '_')
+        if not first_sheet:
+            combined_csv.write('\n\n')
+        combined_csv.write(f"=== {sheet_name} ===\n")
+        df.to_csv(combined_csv, index=False)
+        first_sheet = False
+    return combined_csv.getvalue(), errors
+
+
 class DataExplorer:
     def __init__(self, data_dir="data/generated"):
         self.data_dir = Path(data_dir)
@@ -20,22 +59,23 @@ class DataExplorer:
         self.dataset_friendly_names = {}  # Maps filename to friendly name
         self.unified_data = None
         
+    @timed('load')
     def load_all_datasets(self):
         """Load all CSV files from the generated data directory"""
         if not self.data_dir.exists():
             st.error(f"Data directory not found: {self.data_dir}")
             return False
             
-        csv_files = list(self.data_dir.glob("*.csv"))
+        csv_files = dataset_files(self.data_dir)
         if not csv_files:
             st.warning("No CSV files found in data directory")
             return False
             
         for csv_file in csv_files:
             try:
-                df = pd.read_csv(csv_file)
+                df = load_table(csv_file)
                 
-                # Clean up column names to be human-friendly
+                # Clean up column names to be human-friendly (renaming copies, leaving the shared table untouched)
                 df = self._clean_column_names(df)
                 
                 # Add metadata columns
@@ -202,6 +242,7 @@ class DataExplorer:
         self.unified_data = pd.DataFrame(unified_rows)
         return self.unified_data
     
+    @timed('render')
     def render_summary_stats(self):
         """Render summary statistics section"""
         if not self.datasets:
@@ -230,6 +271,7 @@ class DataExplorer:
         with col4:
             st.metric("Spaces Analyzed", len(spaces))
     
+    @timed('render')
     def render_dataset_overview(self):
         """Render dataset overview table"""
         if not self.datasets:
@@ -256,6 +298,7 @@ class DataExplorer:
         
         st.dataframe(styled_overview, use_container_width=True)
     
+    @timed('render')
     def render_data_table(self, selected_space=None):
         """Render the main filterable data table"""
         if not self.datasets:
@@ -458,6 +501,7 @@ class DataExplorer:
         else:
             st.warning("Please select at least one column to display")
     
+    @timed('render')
     def render_data_visualization(self):
         """Render quick data visualizations"""
         if not self.datasets:
@@ -511,31 +555,15 @@ class DataExplorer:
             with st.container():
                 # Get all CSV files in the data directory
                 data_path = Path('data/generated')
-                csv_files = list(data_path.glob('*.csv'))
+                csv_files = dataset_files(data_path)
                 
                 if csv_files:
-                    # Create a combined CSV for download
-                    combined_data = {}
-                    for csv_file in csv_files:
-                        try:
-                            df = pd.read_csv(csv_file)
-                            sheet_name = csv_file.stem.replace('250728-', '').replace('-', '_')
-                            combined_data[sheet_name] = df
-                        except Exception as e:
-                            st.error(f"Error reading {csv_file.name}: {e}")
+                    # Create a combined CSV for download (rebuilt only when a dataset changes)
+                    combined_csv, errors = combined_csv_text(data_path)
+                    for error in errors:
+                        st.error(error)
                     
-                    if combined_data:
-                        # Create download button for combined CSV with matching height
-                        from io import StringIO
-                        combined_csv = StringIO()
-                        first_sheet = True
-                        for sheet_name, df in combined_data.items():
-                            if not first_sheet:
-                                combined_csv.write('\n\n')
-                            combined_csv.write(f"=== {sheet_name} ===\n")
-                            df.to_csv(combined_csv, index=False)
-                            first_sheet = False
-                        
+                    if combined_csv:
                         # Use custom CSS to make button height match info box
                         st.markdown("""
                         <style>
@@ -549,7 +577,7 @@ class DataExplorer:
                         
                         st.download_button(
                             label="Download filtered data as CSV",
-                            data=combined_csv.getvalue(),
+                            data=combined_csv,
                             file_name=f"cbc_acoustic_analysis_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
                             mime="text/csv",
                             help="Download analysis data as CSV file",
@@ -571,6 +599,7 @@ class DataExplorer:
         self.render_data_table(selected_space)
 
 # Convenience function for integration
+@timed('render')
 def render_data_explorer(selected_space=None):
     """Convenience function to render the Data Explorer component"""
     explorer = DataExplorer()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Debounced Controls
+Coalesce bursts of widget changes (e.g. holding the panel-count +/- buttons) into a single chart update
+"""
+
+import time
+
+import streamlit as st
+
+DEBOUNCE_SECONDS = 0.15
+
+
+def mark_changed(key):
+    """on_change callback for a debounced control: remember when it last changed"""
+    st.session_state[f"_changed_at_{key}"] = time.monotonic()
+
+
+def settle(key, delay=DEBOUNCE_SECONDS):
+    """Wait out the rest of the debounce window after the control's last change
+
+    Call this after the control and before the expensive charts. Streamlit
+    checks for newer widget events the next time the script emits an element,
+    so if another change arrives while we wait, this run is abandoned and the
+    rerun starts from the newest value; only the last change in a burst pays
+    for the charts. Runs without a recent change return immediately.
+    """
+    changed_at = st.session_state.get(f"_changed_at_{key}")
+    if changed_at is None:
+        return
+    remaining = delay - (time.monotonic() - changed_at)
+    if remaining > 0:
+        time.sleep(remaining)
@@ -5,11 +5,14 @@ Creates detailed 3D models showing treatment recommendations
 """
 
 import plotly.graph_objects as go
-import plotly.express as px
 import numpy as np
 from pathlib import Path
 import pandas as pd
 
+from figure_cache import cached_figure
+from render_timing import timed
+from space_registry import get_space
+
 class Enhanced3DVisualizer:
     def __init__(self):
         self.colors = {
@@ -22,7 +25,20 @@ class Enhanced3DVisualizer:
             'bass_trap': '#d35400',
             'hallway': 'rgba(200, 200, 200, 0.4)'
         }
-    
+
+    @timed('figure')
+    def create_space_model(self, space, show_panels=True, panel_count=None):
+        """Build the 3D model named in the space registry (geometry.model); None if the space has none"""
+        space_def = get_space(space)
+        model_name = space_def.geometry.get('model')
+        if not model_name:
+            return None
+        if panel_count is None:
+            panel_count = space_def.default_panels
+        return getattr(self, model_name)(show_panels=show_panels, panel_count=panel_count)
+
+    @timed('figure')
+    @cached_figure('3d_model', space=lambda self: 'Studio 8')
     def create_studio8_detailed_model(self, show_panels=True, panel_count=25):
         """Create detailed Studio 8 model with treatment visualization"""
         
@@ -146,6 +162,7 @@ class Enhanced3DVisualizer:
         
         return fig
     
+    @timed('figure')
     def create_studio8_with_modal_analysis(self, show_panels=True, panel_count=25, show_zone_a=True, show_zone_b=True):
         """Create Studio 8 model with modal stack visualization overlay"""
         
@@ -323,6 +340,8 @@ class Enhanced3DVisualizer:
         
         return fig
     
+    @timed('figure')
+    @cached_figure('3d_model', space=lambda self: 'The Hub')
     def create_hub_detailed_model(self, show_panels=True, panel_count=8):
         """Create detailed Hub model with treatment visualization based on corrected actual measurements"""
         
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Figure Cache
+On-disk Plotly figure cache shared by every dashboard process, with LRU eviction under a byte budget
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import plotly.graph_objects as go
+
+from shared_models import data_fingerprint
+
+FIGURE_DIR = Path(os.environ.get('CBC_CACHE_DIR', '.cache')) / 'figures'
+MAX_BYTES = int(float(os.environ.get('CBC_FIGURE_CACHE_MB', '256')) * 1024 * 1024)
+ENABLED = os.environ.get('CBC_FIGURE_CACHE', '1') != '0'  # CBC_FIGURE_CACHE=0 always rebuilds (benchmarks)
+# Bump to retire every cached figure after a change the source versions cannot see (e.g. a plotly upgrade)
+CACHE_VERSION = 1
+PROJECT_DIR = Path(__file__).resolve().parent
+
+
+class DiskFigureCache:
+    """Serialized figures in one JSON file per key
+
+    Files are written atomically, so any number of processes can share the
+    directory. A file's mtime is its last use: reads touch it, and writes
+    delete the least recently used files once the directory exceeds max_bytes.
+    Each process keeps a running total (from one scan plus its own writes) and
+    only rescans the directory when that total passes max_bytes.
+    """
+
+    def __init__(self, directory=FIGURE_DIR, max_bytes=MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = None  # Running size of the directory; None until the first scan
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.directory / f"{hashlib.sha1(repr(key).encode()).hexdigest()}.json"
+
+    def get(self, key):
+        """Cached figure for key, or None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Written by to_json from a validated figure, so skip revalidating every property
+        return go.Figure(data, _validate=False)
+
+    def put(self, key, fig):
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w') as f:
+                size = f.write(fig.to_json())
+            try:
+                replaced = path.stat().st_size
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: could not cache figure: {e}")
+            return
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._bytes += size - replaced
+            over_budget = self._bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _entries(self):
+        """[(mtime, size, path)] of cached figures, least recently used first"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Evicted by another process
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def evict(self):
+        """Delete least recently used figures until the cache fits max_bytes"""
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    self.evictions += 1
+                except OSError:
+                    pass
+                total -= size
+            self._bytes = total
+
+    def clear(self):
+        for _, _, path in self._entries() if self.directory.exists() else []:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._bytes = None
+
+    def stats(self):
+        entries = self._entries() if self.directory.exists() else []
+        return {'files': len(entries), 'bytes': sum(size for _, size, _ in entries), 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+_cache = DiskFigureCache()
+
+
+def _project_files(func):
+    """Source files of func's module and of every project module it uses, directly or through other ones"""
+    func = inspect.unwrap(func)  # Past other decorators (e.g. render_timing.timed) to the builder itself
+    files = set()
+    try:
+        files.add(Path(inspect.getsourcefile(func)).resolve())
+    except TypeError:
+        pass
+    namespaces = [func.__globals__]
+    seen = set()
+    while namespaces:
+        for value in list(namespaces.pop().values()):
+            module = value if inspect.ismodule(value) else None
+            if module is None:
+                module_name = getattr(value, '__module__', None)
+                module = sys.modules.get(module_name) if isinstance(module_name, str) else None
+            path = getattr(module, '__file__', None)
+            if module is None or module.__name__ in seen or path is None:
+                continue
+            seen.add(module.__name__)
+            path = Path(path).resolve()
+            if path.parent == PROJECT_DIR:
+                files.add(path)
+                namespaces.append(vars(module))
+    return sorted(files)
+
+
+def _source_version(func):
+    """CACHE_VERSION plus size and mtime of every project module behind func
+
+    Editing a builder, or a helper it reaches such as frequency_axis or
+    curve_decimation, retires the figures it cached.
+    """
+    versions = [CACHE_VERSION]
+    for path in _project_files(func):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        versions.append((path.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(versions)
+
+
+def cached_figure(view, space):
+    """Cache a figure builder method's results on disk
+
+    Keys are (space, view, arguments, data fingerprint). space(self) names
+    what the builder draws, including any instance state the figure depends
+    on (e.g. an analyzer's campaign). Arguments are bound to the signature,
+    so create_rt60_heatmap(25) and create_rt60_heatmap(panel_count=25) share
+    an entry. None or empty results (the builders' error paths) are not
+    cached, so their error messages still show.
+
+    The fingerprint is read from self.data_fingerprint (set by SharedModels);
+    an instance built elsewhere computes it once, on its first figure.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        source_version = _source_version(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not ENABLED:
+                return method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = tuple((name, value) for name, value in bound.arguments.items() if name != 'self')
+            fingerprint = getattr(self, 'data_fingerprint', None)
+            if fingerprint is None:
+                fingerprint = self.data_fingerprint = data_fingerprint()
+            key = (space(self), view, params, fingerprint, method.__qualname__, source_version)
+
+            fig = _cache.get(key)
+            if fig is None:
+                fig = method(self, *args, **kwargs)
+                if fig is not None and fig.data:
+                    _cache.put(key, fig)
+            return fig
+        return wrapper
+    return decorator
+
+
+def figure_cache_stats():
+    """Hit/miss counts for this process and the shared directory's size"""
+    return _cache.stats()
+
+
+def clear_figure_cache():
+    _cache.clear()
+
+
+if __name__ == "__main__":
+    if "--clear" in sys.argv:
+        clear_figure_cache()
+    stats = figure_cache_stats()
+    print(f"{FIGURE_DIR}: {stats['files']} figures, {stats['bytes'] / 1024 / 1024:.1f} of "
+          f"{stats['max_bytes'] / 1024 / 1024:.0f} MB")
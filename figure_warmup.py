@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Figure Warm-up
+Background precomputation of every panel-count figure, with a readiness status file for health checks
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get('CBC_CACHE_DIR', '.cache'))
+STATUS_PATH = CACHE_DIR / 'warmup_status.json'
+WARMUP_WORKERS = int(os.environ.get('CBC_WARMUP_WORKERS', '2'))
+WARMUP_ENABLED = os.environ.get('CBC_WARMUP', '1') != '0'  # CBC_WARMUP=0 builds figures on demand only
+
+
+class FigureStore:
+    """Figures keyed by (space, view, panel_count) for one data fingerprint
+
+    Stored figures are shared by every session and must not be modified;
+    sessions that adjust a figure before drawing it (e.g. the 3D camera)
+    draw a copy.
+    """
+
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self._figures = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._figures)
+
+    def get(self, key):
+        with self._lock:
+            return self._figures.get(key)
+
+    def holds(self, figure):
+        """Whether figure is one of the stored figures (the object itself, not an equal copy)"""
+        with self._lock:
+            return any(stored is figure for stored in self._figures.values())
+
+    def get_or_build(self, key, build):
+        """Stored figure for key, building (and storing) it on a miss; None if build returns None"""
+        figure = self.get(key)
+        if figure is None:
+            figure = build()
+            if figure is not None:
+                with self._lock:
+                    figure = self._figures.setdefault(key, figure)
+        return figure
+
+
+class FigureWarmup:
+    """Builds a list of (key, build) jobs into a FigureStore on a background thread pool
+
+    Progress is written to the status file so an external health check can
+    tell when every figure is ready. Figure building is mostly Python, so a
+    couple of workers keep the warm-up from starving the sessions being served.
+    """
+
+    def __init__(self, store, jobs, status_path=STATUS_PATH, workers=WARMUP_WORKERS):
+        self.store = store
+        self.jobs = list(jobs)
+        self.status_path = Path(status_path)
+        self.workers = workers
+        self.done = 0
+        self.failed = 0
+        self.started_at = None
+        self.finished_at = None
+        self.cancelled = False
+        self._thread = None
+
+    def start(self):
+        self.started_at = time.time()
+        self._write_status()
+        self._thread = threading.Thread(target=self._run, name='figure-warmup', daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Skip the remaining jobs (the data changed and a new warm-up is starting)"""
+        self.cancelled = True
+
+    def _build(self, key, build):
+        if not self.cancelled:
+            self.store.get_or_build(key, build)
+
+    def _run(self):
+        last_write = 0.0
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='figure-warmup') as pool:
+            futures = [pool.submit(self._build, key, build) for key, build in self.jobs]
+            for future in as_completed(futures):
+                if future.exception() is not None:
+                    self.failed += 1
+                self.done += 1
+                if time.monotonic() - last_write > 1.0:
+                    self._write_status()
+                    last_write = time.monotonic()
+        self.finished_at = time.time()
+        self._write_status()
+
+    @property
+    def ready(self):
+        return self.finished_at is not None
+
+    def status(self):
+        if self.cancelled:
+            state = 'cancelled'
+        else:
+            state = 'ready' if self.ready else 'running'
+        return {'state': state, 'pid': os.getpid(), 'fingerprint': self.store.fingerprint,
+                'total': len(self.jobs), 'done': self.done, 'failed': self.failed,
+                'figures': len(self.store), 'started_at': self.started_at, 'finished_at': self.finished_at,
+                'elapsed_s': round((self.finished_at or time.time()) - self.started_at, 2)}
+
+    def _write_status(self):
+        if self.cancelled:
+            return  # The replacement warm-up owns the status file now
+        write_status(self.status(), self.status_path)
+
+
+def write_status(status, status_path=STATUS_PATH):
+    """Atomically replace the status file"""
+    status_path = Path(status_path)
+    try:
+        status_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = status_path.with_name(f".{status_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(status, f, indent=1)
+        os.replace(tmp_path, status_path)
+    except OSError as e:
+        print(f"Warning: could not write warm-up status: {e}")
+
+
+def disabled_status(fingerprint):
+    """Status reported when CBC_WARMUP=0: nothing to precompute, so the server is ready at once"""
+    now = time.time()
+    return {'state': 'disabled', 'pid': os.getpid(), 'fingerprint': fingerprint,
+            'total': 0, 'done': 0, 'failed': 0, 'figures': 0, 'started_at': now, 'finished_at': now,
+            'elapsed_s': 0.0}
+
+
+# Process-wide store and warm-up for the current data fingerprint
+_store = None
+_warmup = None
+_disabled_fingerprint = None
+_lock = threading.Lock()
+
+
+def get_figure_store(fingerprint):
+    """FigureStore for the given data fingerprint, replacing (and cancelling the warm-up of) an older one"""
+    global _store, _warmup
+    with _lock:
+        if _store is None or _store.fingerprint != fingerprint:
+            if _warmup is not None:
+                _warmup.cancel()
+                _warmup = None
+            _store = FigureStore(fingerprint)
+        return _store
+
+
+def clear_figure_store():
+    """Drop every stored figure (and stop the warm-up); the next dashboard run starts a new store"""
+    global _store, _warmup
+    with _lock:
+        if _warmup is not None:
+            _warmup.cancel()
+        _store = None
+        _warmup = None
+
+
+def current_figure_store():
+    """Most recent FigureStore, or None when no dashboard session has run in this process"""
+    return _store
+
+
+def start_warmup(fingerprint, jobs):
+    """Start warming the store for fingerprint unless that is already under way; returns the FigureWarmup
+
+    jobs is called (once) to list the (key, build) pairs. Returns None when
+    the warm-up is disabled with CBC_WARMUP=0; the status file then says
+    'disabled' so health checks do not wait for a warm-up that never runs.
+    """
+    global _warmup, _disabled_fingerprint
+    if not WARMUP_ENABLED:
+        with _lock:
+            if _disabled_fingerprint != fingerprint:
+                _disabled_fingerprint = fingerprint
+                write_status(disabled_status(fingerprint))
+        return None
+    store = get_figure_store(fingerprint)
+    with _lock:
+        if _warmup is None and _store is store:
+            _warmup = FigureWarmup(store, jobs()).start()
+        return _warmup
+
+
+def read_status(status_path=STATUS_PATH):
+    """Parsed status file, or None if no warm-up has written one"""
+    try:
+        with open(status_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+if __name__ == "__main__":
+    status = read_status()
+    if status is None:
+        print(f"No warm-up status at {STATUS_PATH}")
+    else:
+        print(f"{status['state']}: {status['done']}/{status['total']} jobs, {status['failed']} failed, "
+              f"{status['figures']} figures in {status['elapsed_s']}s (pid {status['pid']})")
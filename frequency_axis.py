@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Warped Frequency Axis
+Maps frequencies onto the dashboard's evenly spaced 30Hz-3kHz tick scale (and back) over whole arrays
+"""
+
+import numpy as np
+
+# Reference frequencies drawn at evenly spaced positions 0, 1, ..., 12; the scale is linear between neighbours
+TICK_FREQS = np.array([30, 60, 90, 120, 180, 250, 360, 540, 770, 1000, 1500, 2000, 3000], dtype=float)
+TICK_TEXT = ["30Hz", "60Hz", "90Hz", "120Hz", "180Hz", "250Hz", "360Hz", "540Hz", "770Hz", "1kHz", "1.5kHz", "2kHz", "3kHz"]
+TICK_POSITIONS = np.arange(len(TICK_FREQS), dtype=float)
+
+
+def warp_frequency(freq):
+    """Axis position of each frequency (Hz); frequencies outside 30Hz-3kHz clamp to the ends
+
+    Accepts a scalar or any array shape, e.g. (positions, points) in one call.
+    """
+    return np.interp(freq, TICK_FREQS, TICK_POSITIONS)
+
+
+def unwarp_frequency(position):
+    """Frequency (Hz) at each axis position; the inverse of warp_frequency within 30Hz-3kHz"""
+    return np.interp(position, TICK_POSITIONS, TICK_FREQS)
+
+
+def frequency_axis(freq_range=(30, 3000)):
+    """Plotly x-axis settings for warped data showing freq_range, with the reference ticks inside it"""
+    freq_min, freq_max = freq_range
+    visible = (TICK_FREQS >= freq_min) & (TICK_FREQS <= freq_max)
+    if visible.any():
+        tickvals = TICK_POSITIONS[visible].tolist()
+        ticktext = [text for text, shown in zip(TICK_TEXT, visible) if shown]
+    else:
+        tickvals = [float(warp_frequency(max(freq_min, TICK_FREQS[0])))]
+        ticktext = [f"{freq_min}Hz"]
+    return dict(
+        type="linear",  # Linear since the data is pre-warped
+        range=[float(warp_frequency(max(freq_min, TICK_FREQS[0]))), float(warp_frequency(min(freq_max, TICK_FREQS[-1])))],
+        tickmode="array",
+        tickvals=tickvals,
+        ticktext=ticktext
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    freqs = np.geomspace(20, 20000, 1900)
+    positions = np.tile(freqs, (12, 1))
+    start = time.perf_counter()
+    warped = warp_frequency(positions)
+    elapsed = time.perf_counter() - start
+    inside = (freqs >= TICK_FREQS[0]) & (freqs <= TICK_FREQS[-1])
+    error = np.abs(unwarp_frequency(warped[0])[inside] - freqs[inside]).max()
+    print(f"Warped {positions.size} points in {elapsed * 1000:.2f} ms; max round-trip error {error:.2e} Hz")
+    print(frequency_axis((100, 1000)))
@@ -6,23 +6,94 @@ Interactive analysis of acoustic measurements with real-time filtering
 
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import re
 
+from columnar_store import read_dataset
+from response_arrays import ResponseArrays, open_response_arrays
+from curve_decimation import PLOT_WIDTH_PX, minmax_indices
+from debounce import mark_changed, settle
+from figure_cache import cached_figure
+from figure_warmup import current_figure_store
+from frequency_axis import frequency_axis, warp_frequency
+from measurement_index import get_measurement_index
+from octave_smoothing import GRID_POINTS_PER_OCTAVE, SMOOTHING_OPTIONS, smooth_responses
+from render_timing import timed
+from scoped_cache import cached
+from space_registry import get_space, log_prefixes
+
+@timed('load')
+@cached('freq_explorer', datasets=lambda freq_file, *args: [freq_file])
+def average_response(freq_file, freq_min, freq_max, exclude_position=None):
+    """Mean magnitude per frequency across positions (Frequency_Hz, Magnitude_dB), shared between sessions"""
+    freq_df = read_dataset(freq_file)
+    freq_filtered = freq_df[
+        (freq_df['Frequency_Hz'] >= freq_min) & 
+        (freq_df['Frequency_Hz'] <= freq_max) & 
+        (freq_df['position'] != exclude_position)
+    ]
+    return freq_filtered.groupby('Frequency_Hz')['Magnitude_dB'].mean().reset_index()
+
+
+@timed('load')
+@cached('freq_explorer', datasets=lambda freq_file, *args: [freq_file])
+def smoothed_responses(freq_file, positions, bands_per_octave):
+    """(grid, magnitude, phase) of the positions smoothed to 1/bands_per_octave octave, shared between sessions"""
+    response_arrays = open_response_arrays(freq_file)
+    return smooth_responses([response_arrays.slice(position) for position in positions], bands_per_octave)
+
+
+def log_position(position):
+    """Smaart log position ('HostA') of a dataset position named with its log prefix ('Std8-HostA')"""
+    prefix, _, name = position.partition('-')
+    return name if name and prefix in log_prefixes() else position
+
+
 class FrequencyResponseExplorer:
-    def __init__(self):
+    def __init__(self, space=None):
         self.base_path = Path('/Users/chrislyons/Documents/CL/dev/std8/cbc-interactive-dashboard')
+        self.space = space
         self.smaart_data = None
+        self.response_arrays = None
+        self.response_file = None  # Dataset behind response_arrays; None for synthetic data
         self.measurement_positions = {}
         self.position_column = None
-        # Force clear any cached data
-        if hasattr(st, 'cache_data'):
-            st.cache_data.clear()
         
+    def load_position_sti(self):
+        """Per-band STI of every position measured in the space's latest campaign
+
+        Returns (source, reference, reference_sti, [(position, label, sti_values)])
+        with the labelled positions (reference, talent) first; sti_values is
+        None for a log without STI. Returns None after showing why when the
+        space has no reference position to measure degradation against.
+        """
+        space_def = get_space(self.space)
+        if not space_def.reference_position:
+            st.info(f"{space_def.name} has no reference position, so STI degradation cannot be measured")
+            return None
+        index = get_measurement_index()
+        positions, sti = index.sti_bands(space_def.name)
+        if not positions:
+            st.error(f"No Smaart measurements indexed for {space_def.name}")
+            return None
+        
+        by_position = {position: None if np.isnan(values).any() else values.tolist()
+                       for position, values in zip(positions, sti)}
+        reference = log_position(space_def.reference_position)
+        reference_sti = by_position.get(reference)
+        if not reference_sti:
+            st.error(f"Could not load reference STI data from {reference}")
+            return None
+        
+        labels = space_def.position_labels
+        rows = [(position, labels.get(position, position), by_position[position])
+                for position in sorted(positions, key=lambda position: position not in labels)]
+        source = f"{space_def.name} Smaart logs, campaign {index.latest_campaign(space_def.name)}"
+        return source, reference, reference_sti, rows
+    
     def get_position_column(self):
         """Get the position column name from the data"""
         if self.smaart_data is None:
@@ -32,18 +103,12 @@ class FrequencyResponseExplorer:
                 return col
         return None
         
+    @timed('load')
     def load_smaart_data(self, space="Studio 8"):
         """Load and parse Smaart measurement data"""
         try:
-            # Use the Complete Frequency Response files 
-            if space == "Studio 8":
-                file_candidates = [
-                    "250728-Studio8-Complete_Frequency_Response.csv"
-                ]
-            else:  # The Hub
-                file_candidates = [
-                    "250731-TheHub-Complete_Frequency_Response.csv"
-                ]
+            # Use the Complete Frequency Response file named in the space registry
+            file_candidates = [f"{get_space(space).datasets['frequency_response']}.csv"]
             
             # Try multiple possible paths for the data files
             for filename in file_candidates:
@@ -56,9 +121,10 @@ class FrequencyResponseExplorer:
                 
                 for detailed_freq_file in possible_paths:
                     if detailed_freq_file.exists():
-                        self.smaart_data = pd.read_csv(detailed_freq_file)
-                        
-                        unique_positions = self.smaart_data['position'].unique()
+                        # Shared memory-mapped arrays; plots slice only the visible band
+                        self.response_arrays = open_response_arrays(detailed_freq_file)
+                        self.response_file = detailed_freq_file
+                        self.space = space
                         return True
             
             # File not found in any location - NO SYNTHETIC DATA
@@ -69,6 +135,52 @@ class FrequencyResponseExplorer:
             st.error(f"Error loading Smaart data: {e}")
             return False
     
+    def iter_position_responses(self, freq_range):
+        """Yield (position, color, frequency, magnitude, phase) for each position within freq_range
+        
+        Positions are partitioned and frequency-sorted once, so each band is a searchsorted slice.
+        """
+        for position in self.response_arrays.positions:
+            frequency, magnitude, phase = self.response_arrays.slice(position, *freq_range)
+            yield position, self.response_arrays.color(position), frequency, magnitude, phase
+    
+    def iter_position_series(self, series, freq_range, width_px, smoothing=None):
+        """Yield (position, color, frequency, values) of one series ('magnitude' or 'phase') within freq_range
+        
+        Reads the coarsest pyramid level that still fills the chart's point
+        budget (two points per pixel column of a width_px wide chart, as
+        minmax_indices keeps), so the work follows the visible points; sparse
+        data is read raw. With smoothing (bands per octave) the values come
+        from the smoothed log-frequency grid instead.
+        """
+        if smoothing:
+            yield from self.iter_smoothed_series(series, freq_range, smoothing)
+            return
+        for position in self.response_arrays.positions:
+            frequency, values = self.response_arrays.budget_series(position, series, *freq_range, 2 * width_px)
+            yield position, self.response_arrays.color(position), frequency, values
+    
+    def iter_smoothed_series(self, series, freq_range, bands_per_octave):
+        """Yield (position, color, frequency, values) of one series smoothed to 1/bands_per_octave octave
+        
+        Every position is smoothed in one pass over the whole grid, cached per
+        (positions, smoothing, dataset version); freq_range only slices it.
+        A smoothed curve has no detail finer than its window, so about eight
+        grid points per window are drawn.
+        """
+        positions = tuple(self.response_arrays.positions)
+        if self.response_file is not None:
+            grid, magnitude, phase = smoothed_responses(self.response_file, positions, bands_per_octave)
+        else:
+            grid, magnitude, phase = smooth_responses(
+                [self.response_arrays.slice(position) for position in positions], bands_per_octave)
+        values = magnitude if series == 'magnitude' else phase
+        start, stop = np.searchsorted(grid, freq_range[0], 'left'), np.searchsorted(grid, freq_range[1], 'right')
+        step = max(1, GRID_POINTS_PER_OCTAVE // (8 * bands_per_octave))
+        for row, position in enumerate(positions):
+            yield (position, self.response_arrays.color(position),
+                   grid[start:stop:step], values[row, start:stop:step])
+    
     def create_synthetic_data(self):
         """Create realistic synthetic acoustic data based on analysis"""
         
@@ -140,6 +252,9 @@ class FrequencyResponseExplorer:
                 })
         
         self.smaart_data = pd.DataFrame(data_rows)
+        # Partitioned like the file-backed data so the plots slice it the same way
+        self.response_arrays = ResponseArrays.from_frame(self.smaart_data)
+        self.response_file = None
         
         # Store position metadata
         self.measurement_positions = positions_data
@@ -195,47 +310,8 @@ class FrequencyResponseExplorer:
         else:
             return 0.1 * np.sin(frequency / 150)
     
-    def transform_frequency_scale(self, freq):
-        """Transform frequency to evenly spaced positions matching tick arrangement"""
-        import math
-        
-        # Define our evenly spaced reference frequencies (30Hz to 3000Hz)
-        tick_freqs = [30, 60, 90, 120, 180, 250, 360, 540, 770, 1000, 1500, 2000, 3000]
-        
-        # Handle frequencies outside our range
-        if freq <= tick_freqs[0]:
-            return 0.0
-        if freq >= tick_freqs[-1]:
-            return float(len(tick_freqs) - 1)
-        
-        # Find the two adjacent tick frequencies
-        for i in range(len(tick_freqs) - 1):
-            if tick_freqs[i] <= freq <= tick_freqs[i + 1]:
-                # Linear interpolation between the two evenly spaced positions
-                freq_ratio = (freq - tick_freqs[i]) / (tick_freqs[i + 1] - tick_freqs[i])
-                return float(i) + freq_ratio
-        
-        return 0.0  # Fallback
-    
-    def inverse_transform_frequency_scale(self, transformed_val):
-        """Convert transformed scale back to frequency"""
-        import numpy as np
-        
-        low_section_width = 0.5 * np.log10(100 / 20)
-        mid_section_width = np.log10(2000 / 100) 
-        
-        if transformed_val <= low_section_width:
-            # Low section: 20Hz-100Hz
-            return 20 * (10 ** (transformed_val / 0.5))
-        elif transformed_val <= low_section_width + mid_section_width:
-            # Mid section: 100Hz-2kHz
-            mid_val = transformed_val - low_section_width
-            return 100 * (10 ** mid_val)
-        else:
-            # High section: >2kHz
-            high_val = transformed_val - low_section_width - mid_section_width
-            return 2000 * (10 ** (high_val / 0.5))
-
+    @timed('figure')
+    @cached_figure('interactive_response', space=lambda self: self.space)
     def create_interactive_frequency_plot(self, freq_range=(30, 3000)):
         """Create main interactive frequency response plot
         
@@ -243,7 +319,7 @@ class FrequencyResponseExplorer:
             freq_range (tuple): Frequency range as (min_freq, max_freq) in Hz
         """
         
-        if self.smaart_data is None:
+        if self.response_arrays is None and self.smaart_data is None:
             self.load_smaart_data()
         
         fig = make_subplots(
@@ -254,31 +330,19 @@ class FrequencyResponseExplorer:
             x_title="Frequency (Hz)"
         )
         
-        # Get unique positions
-        position_col = self.get_position_column()
-        if not position_col:
+        if self.response_arrays is None and not self.get_position_column():
             st.error("No position column found in data")
             return go.Figure()
-            
-        positions = self.smaart_data[position_col].unique()
         
-        for position in positions:
-            pos_data = self.smaart_data[self.smaart_data[position_col] == position]
-            
-            # Filter data by frequency range
-            freq_mask = (pos_data['Frequency_Hz'] >= freq_range[0]) & (pos_data['Frequency_Hz'] <= freq_range[1])
-            pos_data = pos_data[freq_mask]
-            
+        for position, color, frequency, magnitude, phase in self.iter_position_responses(freq_range):
             # Transform frequency values to custom scale
-            transformed_freq = [self.transform_frequency_scale(f) for f in pos_data['Frequency_Hz']]
-            
-            color = pos_data['Color'].iloc[0] if 'Color' in pos_data.columns else None
+            transformed_freq = warp_frequency(frequency)
             
             # Magnitude plot
             fig.add_trace(
                 go.Scatter(
                     x=transformed_freq,
-                    y=pos_data['Magnitude_dB'],
+                    y=magnitude,
                     mode='lines',
                     name=position,
                     line=dict(color=color, width=2, shape='linear'),
@@ -286,7 +350,7 @@ class FrequencyResponseExplorer:
                                   "Frequency: %{customdata:.0f} Hz<br>" +
                                   "Magnitude: %{y:.1f} dB<br>" +
                                   "<extra></extra>",
-                    customdata=pos_data['Frequency_Hz'],
+                    customdata=frequency,
                     showlegend=True
                 ),
                 row=1, col=1
@@ -296,7 +360,7 @@ class FrequencyResponseExplorer:
             fig.add_trace(
                 go.Scatter(
                     x=transformed_freq,
-                    y=pos_data['Phase_deg'],
+                    y=phase,
                     mode='lines',
                     name=f"{position} (Phase)",
                     line=dict(color=color, width=2, dash='dot', shape='linear'),
@@ -304,42 +368,15 @@ class FrequencyResponseExplorer:
                                   "Frequency: %{customdata:.0f} Hz<br>" +
                                   "Phase: %{y:.1f}°<br>" +
                                   "<extra></extra>",
-                    customdata=pos_data['Frequency_Hz'],
+                    customdata=frequency,
                     showlegend=False
                 ),
                 row=2, col=1
             )
         
-        # Update layout with custom frequency axis scaling
-        import math
-        
-        # Transform frequency range to evenly spaced scale (0 to 12 for 13 ticks)
-        transformed_min = self.transform_frequency_scale(max(freq_range[0], 30))
-        transformed_max = self.transform_frequency_scale(min(freq_range[1], 3000))
-        
-        # Generate evenly spaced positions but use preferred standard frequencies (30Hz to 3kHz)
-        all_tick_freqs = [30, 60, 90, 120, 180, 250, 360, 540, 770, 1000, 1500, 2000, 3000]
-        all_tick_text = ["30Hz", "60Hz", "90Hz", "120Hz", "180Hz", "250Hz", "360Hz", "540Hz", "770Hz", "1kHz", "1.5kHz", "2kHz", "3kHz"]
-        
-        # Filter and evenly space tick positions
-        filtered_ticks = [(freq, text) for freq, text in zip(all_tick_freqs, all_tick_text) 
-                         if freq_range[0] <= freq <= freq_range[1]]
-        
-        if filtered_ticks:
-            tick_freqs, tick_texts = zip(*filtered_ticks)
-            # Use the transform function to get correct positions
-            transformed_tick_positions = [self.transform_frequency_scale(f) for f in tick_freqs]
-        else:
-            tick_freqs = [freq_range[0]]
-            tick_texts = [f"{freq_range[0]}Hz"]  
-            transformed_tick_positions = [transformed_min]
-        
+        # Warped frequency axis with the standard ticks (30Hz to 3kHz) inside the range
         x_axis_config = dict(
-            type="linear",  # Use linear since we're pre-transforming the data
-            range=[transformed_min, transformed_max],
-            tickmode="array",
-            tickvals=transformed_tick_positions,
-            ticktext=list(tick_texts),
+            **frequency_axis(freq_range),
             showgrid=True,
             gridwidth=1,
             gridcolor="lightgray"
@@ -388,39 +425,35 @@ class FrequencyResponseExplorer:
         
         return fig
     
-    def create_magnitude_response_plot(self, freq_range=(30, 3000)):
-        """Create magnitude-only frequency response plot"""
+    @timed('figure')
+    @cached_figure('magnitude_response', space=lambda self: self.space)
+    def create_magnitude_response_plot(self, freq_range=(30, 3000), width_px=PLOT_WIDTH_PX, smoothing=None):
+        """Create magnitude-only frequency response plot
         
-        if self.smaart_data is None:
+        Each curve keeps at most its minimum and maximum per pixel column of a
+        width_px wide chart over freq_range, so zooming in shows more detail.
+        """
+        
+        if self.response_arrays is None and self.smaart_data is None:
             self.load_smaart_data()
         
         fig = go.Figure()
         
-        # Get unique positions
-        position_col = self.get_position_column()
-        if not position_col:
+        if self.response_arrays is None and not self.get_position_column():
             st.error("No position column found in data")
             return go.Figure()
-            
-        positions = self.smaart_data[position_col].unique()
         
-        for position in positions:
-            pos_data = self.smaart_data[self.smaart_data[position_col] == position]
-            
-            # Filter data by frequency range
-            freq_mask = (pos_data['Frequency_Hz'] >= freq_range[0]) & (pos_data['Frequency_Hz'] <= freq_range[1])
-            pos_data = pos_data[freq_mask]
-            
-            # Transform frequency values to custom scale
-            transformed_freq = [self.transform_frequency_scale(f) for f in pos_data['Frequency_Hz']]
-            
-            color = pos_data['Color'].iloc[0] if 'Color' in pos_data.columns else None
+        for position, color, frequency, magnitude in self.iter_position_series('magnitude', freq_range, width_px, smoothing):
+            # Transform frequency values to custom scale, then keep what the chart width can show
+            transformed_freq = warp_frequency(frequency)
+            keep = minmax_indices(transformed_freq, magnitude, width_px)
+            transformed_freq, frequency, magnitude = transformed_freq[keep], frequency[keep], magnitude[keep]
             
             # Magnitude plot only
             fig.add_trace(
                 go.Scatter(
                     x=transformed_freq,
-                    y=pos_data['Magnitude_dB'],
+                    y=magnitude,
                     mode='lines',
                     name=position,
                     line=dict(color=color, width=2, shape='linear'),
@@ -428,31 +461,14 @@ class FrequencyResponseExplorer:
                                   "Frequency: %{customdata:.0f} Hz<br>" +
                                   "Magnitude: %{y:.1f} dB<br>" +
                                   "<extra></extra>",
-                    customdata=pos_data['Frequency_Hz'],
+                    customdata=frequency,
                     showlegend=True
                 )
             )
         
         # Update layout for magnitude only
-        transformed_min = self.transform_frequency_scale(max(freq_range[0], 30))
-        transformed_max = self.transform_frequency_scale(min(freq_range[1], 3000))
-        
-        all_tick_freqs = [30, 60, 90, 120, 180, 250, 360, 540, 770, 1000, 1500, 2000, 3000]
-        all_tick_text = ["30Hz", "60Hz", "90Hz", "120Hz", "180Hz", "250Hz", "360Hz", "540Hz", "770Hz", "1kHz", "1.5kHz", "2kHz", "3kHz"]
-        
-        filtered_ticks = [(freq, text) for freq, text in zip(all_tick_freqs, all_tick_text) 
-                         if freq_range[0] <= freq <= freq_range[1]]
-        
-        if filtered_ticks:
-            tick_freqs, tick_texts = zip(*filtered_ticks)
-            transformed_tick_positions = [self.transform_frequency_scale(f) for f in tick_freqs]
-        else:
-            tick_freqs = [freq_range[0]]
-            tick_texts = [f"{freq_range[0]}Hz"]  
-            transformed_tick_positions = [transformed_min]
-        
         fig.update_layout(
-            title="Magnitude Response Analysis",
+            title="Magnitude Response Analysis" + (f" (1/{smoothing} octave smoothing)" if smoothing else ""),
             xaxis_title="Frequency (Hz)",
             yaxis_title="Magnitude (dB)",
             height=800,
@@ -469,11 +485,7 @@ class FrequencyResponseExplorer:
                 itemdoubleclick="toggleothers"
             ),
             xaxis=dict(
-                type="linear",
-                range=[transformed_min, transformed_max],
-                tickmode="array",
-                tickvals=transformed_tick_positions,
-                ticktext=list(tick_texts),
+                **frequency_axis(freq_range),
                 showgrid=True,
                 gridwidth=1,
                 gridcolor="lightgray"
@@ -482,39 +494,35 @@ class FrequencyResponseExplorer:
         
         return fig
     
-    def create_phase_response_plot(self, freq_range=(30, 3000)):
-        """Create phase-only frequency response plot"""
+    @timed('figure')
+    @cached_figure('phase_response', space=lambda self: self.space)
+    def create_phase_response_plot(self, freq_range=(30, 3000), width_px=PLOT_WIDTH_PX, smoothing=None):
+        """Create phase-only frequency response plot
         
-        if self.smaart_data is None:
+        Each curve keeps at most its minimum and maximum per pixel column of a
+        width_px wide chart over freq_range, so zooming in shows more detail.
+        """
+        
+        if self.response_arrays is None and self.smaart_data is None:
             self.load_smaart_data()
         
         fig = go.Figure()
         
-        # Get unique positions
-        position_col = self.get_position_column()
-        if not position_col:
+        if self.response_arrays is None and not self.get_position_column():
             st.error("No position column found in data")
             return go.Figure()
-            
-        positions = self.smaart_data[position_col].unique()
         
-        for position in positions:
-            pos_data = self.smaart_data[self.smaart_data[position_col] == position]
-            
-            # Filter data by frequency range
-            freq_mask = (pos_data['Frequency_Hz'] >= freq_range[0]) & (pos_data['Frequency_Hz'] <= freq_range[1])
-            pos_data = pos_data[freq_mask]
-            
-            # Transform frequency values to custom scale
-            transformed_freq = [self.transform_frequency_scale(f) for f in pos_data['Frequency_Hz']]
-            
-            color = pos_data['Color'].iloc[0] if 'Color' in pos_data.columns else None
+        for position, color, frequency, phase in self.iter_position_series('phase', freq_range, width_px, smoothing):
+            # Transform frequency values to custom scale, then keep what the chart width can show
+            transformed_freq = warp_frequency(frequency)
+            keep = minmax_indices(transformed_freq, phase, width_px)
+            transformed_freq, frequency, phase = transformed_freq[keep], frequency[keep], phase[keep]
             
             # Phase plot only
             fig.add_trace(
                 go.Scatter(
                     x=transformed_freq,
-                    y=pos_data['Phase_deg'],
+                    y=phase,
                     mode='lines',
                     name=position,
                     line=dict(color=color, width=2, shape='linear'),
@@ -522,31 +530,14 @@ class FrequencyResponseExplorer:
                                   "Frequency: %{customdata:.0f} Hz<br>" +
                                   "Phase: %{y:.1f}°<br>" +
                                   "<extra></extra>",
-                    customdata=pos_data['Frequency_Hz'],
+                    customdata=frequency,
                     showlegend=True
                 )
             )
         
         # Update layout for phase only
-        transformed_min = self.transform_frequency_scale(max(freq_range[0], 30))
-        transformed_max = self.transform_frequency_scale(min(freq_range[1], 3000))
-        
-        all_tick_freqs = [30, 60, 90, 120, 180, 250, 360, 540, 770, 1000, 1500, 2000, 3000]
-        all_tick_text = ["30Hz", "60Hz", "90Hz", "120Hz", "180Hz", "250Hz", "360Hz", "540Hz", "770Hz", "1kHz", "1.5kHz", "2kHz", "3kHz"]
-        
-        filtered_ticks = [(freq, text) for freq, text in zip(all_tick_freqs, all_tick_text) 
-                         if freq_range[0] <= freq <= freq_range[1]]
-        
-        if filtered_ticks:
-            tick_freqs, tick_texts = zip(*filtered_ticks)
-            transformed_tick_positions = [self.transform_frequency_scale(f) for f in tick_freqs]
-        else:
-            tick_freqs = [freq_range[0]]
-            tick_texts = [f"{freq_range[0]}Hz"]  
-            transformed_tick_positions = [transformed_min]
-        
         fig.update_layout(
-            title="Phase Response Analysis",
+            title="Phase Response Analysis" + (f" (1/{smoothing} octave smoothing)" if smoothing else ""),
             xaxis_title="Frequency (Hz)",
             yaxis_title="Phase (degrees)",
             height=800,
@@ -563,11 +554,7 @@ class FrequencyResponseExplorer:
                 itemdoubleclick="toggleothers"
             ),
             xaxis=dict(
-                type="linear",
-                range=[transformed_min, transformed_max],
-                tickmode="array",
-                tickvals=transformed_tick_positions,
-                ticktext=list(tick_texts),
+                **frequency_axis(freq_range),
                 showgrid=True,
                 gridwidth=1,
                 gridcolor="lightgray"
@@ -576,16 +563,17 @@ class FrequencyResponseExplorer:
         
         return fig
     
+    @timed('figure')
+    @cached_figure('modal_stack', space=lambda self: self.space)
     def create_modal_analysis_plot(self, space="Studio 8"):
         """Create modal analysis visualization"""
         
+        space_def = get_space(space)
+        
         # Try to load from CSV file first - space-specific
-        if space == "Studio 8":
-            csv_file = 'data/generated/250728-Studio8-Modal_Stack_Analysis.csv'
-        else:  # The Hub
-            csv_file = 'data/generated/250728-TheHub-Modal_Stack_Analysis.csv'
+        csv_file = space_def.dataset_path('modal_stack')
         try:
-            modal_df = pd.read_csv(csv_file)
+            modal_df = read_dataset(csv_file)
             
             # Map CSV columns to expected format
             if 'Primary_Mode_Hz' in modal_df.columns:
@@ -613,49 +601,16 @@ class FrequencyResponseExplorer:
                 modal_df['Q_Factor'] = 25
                 
         except FileNotFoundError:
-            # Fallback to hardcoded data if CSV not found - space-specific
-            if space == "Studio 8":
-                modal_data = {
-                    'Frequency_Hz': [23.1, 29.1, 37.8, 50.0, 63.0, 74.3, 108.3, 152.8, 206.8, 258.8, 317.9, 448.4, 561.2, 679.0],
-                    'Mode_Type': ['Axial (W)', 'Axial (L)', 'Axial (H)', 'Tangential', 'Axial (W)', 'Axial (L)', 'Tangential', 'Oblique', 'Axial (W)', 'Axial (L)', 'Tangental', 'Oblique', 'Axial (W)', 'Axial (L)'],
-                    'Severity': ['High', 'High', 'Medium', 'Medium', 'High', 'Medium', 'Medium', 'Low', 'Medium', 'Medium', 'Low', 'Low', 'Low', 'Low'],
-                    'Q_Factor': [45, 38, 28, 35, 42, 32, 25, 18, 22, 28, 15, 12, 10, 8]
-                }
-            else:  # The Hub - hexagonal space with different modal characteristics
-                modal_data = {
-                    'Frequency_Hz': [62, 85, 145, 230, 340, 580, 920, 1450, 2300],
-                    'Mode_Type': ['Hexagonal', 'Tangential', 'Oblique', 'Mixed', 'Hexagonal', 'Mixed', 'High Order', 'High Order', 'High Order'],
-                    'Severity': ['High', 'Medium', 'High', 'Medium', 'High', 'Medium', 'Low', 'Low', 'Low'],
-                    'Q_Factor': [35, 28, 40, 25, 38, 22, 15, 12, 8]
-                }
+            # Fallback to the space's documented modes if CSV not found
+            modal_data = space_def.config['modal_fallback']
             modal_df = pd.DataFrame(modal_data)
         
         # Load frequency response data and calculate average - space-specific
         freq_response_data = None
         try:
-            if space == "Studio 8":
-                freq_file = 'data/generated/250728-Studio8-Complete_Frequency_Response.csv'
-            else:  # The Hub
-                freq_file = 'data/generated/250731-TheHub-Complete_Frequency_Response.csv'
-            freq_df = pd.read_csv(freq_file)
-            
-            # Filter to frequency range of interest (30-500Hz) and exclude reference positions
-            if space == "Studio 8":
-                # Exclude Host A (reference position)
-                freq_filtered = freq_df[
-                    (freq_df['Frequency_Hz'] >= 30) & 
-                    (freq_df['Frequency_Hz'] <= 500) & 
-                    (freq_df['position'] != 'Std8-HostA')
-                ]
-            else:  # The Hub - no specific reference position, use all positions
-                freq_filtered = freq_df[
-                    (freq_df['Frequency_Hz'] >= 30) & 
-                    (freq_df['Frequency_Hz'] <= 500)
-                ]
-            
-            # Calculate average magnitude across non-reference positions
-            avg_freq_response = freq_filtered.groupby('Frequency_Hz')['Magnitude_dB'].mean().reset_index()
-            freq_response_data = avg_freq_response
+            # Frequency range of interest (30-500Hz), excluding the reference position (if any)
+            freq_file = space_def.dataset_path('frequency_response')
+            freq_response_data = average_response(freq_file, 30, 500, space_def.reference_position)
             
         except FileNotFoundError:
             freq_response_data = None
@@ -745,24 +700,17 @@ class FrequencyResponseExplorer:
         
         return fig
     
+    @timed('figure')
+    @cached_figure('sti_degradation', space=lambda self: self.space)
     def create_degradation_heatmap(self):
         """Create STI degradation heatmap from Smaart measurement data"""
         
-        # Load STI data from actual Smaart logs
+        # Load STI data from the space's Smaart logs
         try:
-            smaart_path = Path('data/raw/250715-smaartLogs/Std8')
-            
-            # File mapping to positions
-            file_mapping = {
-                'Std8-HostA-128k-Sweep.txt': 'HostA (Reference)',
-                'Std8-HostC-128k-Sweep.txt': 'HostC (Talent)',
-                'Std8-Ceiling-128k-Sweep.txt': 'Ceiling',
-                'Std8-MidRoom-128k-Sweep.txt': 'MidRoom',
-                'Std8-NECorner-High-128k-Sweep.txt': 'NECorner-High',
-                'Std8-NECorner-Low-128k-Sweep.txt': 'NECorner-Low',
-                'Std8-SECorner-128k-Sweep.txt': 'SECorner',
-                'Std8-SWCorner-128k-Sweep.txt': 'SWCorner'
-            }
+            position_sti = self.load_position_sti()
+            if position_sti is None:
+                return None
+            source, reference, reference_sti, position_rows = position_sti
             
             # STI frequency bands available in Smaart data
             sti_freq_bands = [125, 250, 500, 1000, 2000, 4000, 8000]
@@ -770,45 +718,11 @@ class FrequencyResponseExplorer:
             
             positions = []
             sti_matrix = []
-            reference_sti = None
-            
-            # First pass: get reference STI values from HostA
-            ref_filepath = smaart_path / 'Std8-HostA-128k-Sweep.txt'
-            if ref_filepath.exists():
-                with open(ref_filepath, 'r') as f:
-                    lines = f.readlines()
-                    
-                for line in lines:
-                    if line.startswith('STI\t'):
-                        parts = line.strip().split('\t')
-                        if len(parts) >= 8:  # STI + 7 frequency bands
-                            reference_sti = [float(parts[i]) for i in range(2, 9)]  # Skip 'STI' and overall value
-                            break
-            
-            if not reference_sti:
-                st.error("Could not load reference STI data from HostA")
-                return None
             
-            # Second pass: get STI for all positions and calculate degradation
-            for filename, position_name in file_mapping.items():
-                filepath = smaart_path / filename
-                if not filepath.exists():
-                    continue
-                    
+            # Calculate degradation against the reference position for every position
+            for _, position_name, sti_values in position_rows:
                 positions.append(position_name)
                 
-                # Parse Smaart file for STI data
-                sti_values = None
-                with open(filepath, 'r') as f:
-                    lines = f.readlines()
-                    
-                for line in lines:
-                    if line.startswith('STI\t'):
-                        parts = line.strip().split('\t')
-                        if len(parts) >= 8:  # STI + 7 frequency bands
-                            sti_values = [float(parts[i]) for i in range(2, 9)]  # Skip 'STI' and overall value
-                            break
-                
                 if sti_values:
                     # Calculate STI degradation percentage for each frequency band
                     sti_degradation_row = []
@@ -870,7 +784,7 @@ class FrequencyResponseExplorer:
                 height=500,
                 annotations=[
                     dict(
-                        text="Data Source: data/raw/250715-smaartLogs/Std8/*.txt | Reference: HostA STI",
+                        text=f"Data Source: {source} | Reference: {reference} STI",
                         xref="paper", yref="paper",
                         x=0.02, y=0.98,
                         showarrow=False,
@@ -885,55 +799,23 @@ class FrequencyResponseExplorer:
             st.error(f"Error loading Smaart STI data: {e}")
             return None
     
+    @timed('figure')
+    @cached_figure('sti_adjusted', space=lambda self: self.space)
     def create_adjusted_degradation_heatmap(self, panel_count):
         """Create STI degradation heatmap showing improvement with acoustic treatment"""
         
         try:
-            # Try multiple possible paths for smaart data
-            possible_smaart_paths = [
-                Path('data/raw/250715-smaartLogs/Std8'),
-                self.base_path / 'data/raw/250715-smaartLogs/Std8',
-                Path('/Users/chrislyons/Documents/CL/dev/std8/cbc-interactive-dashboard/data/raw/250715-smaartLogs/Std8')
-            ]
-            
-            smaart_path = None
-            for path in possible_smaart_paths:
-                if path.exists():
-                    smaart_path = path
-                    break
-            
-            if smaart_path is None:
-                st.error("Smaart data directory not found")
+            position_sti = self.load_position_sti()
+            if position_sti is None:
                 return None
+            _, _, reference_sti, position_rows = position_sti
             
-            # Load treatment priority data with multiple possible paths
-            possible_priority_paths = [
-                self.base_path / 'data/generated/250728-Studio8-Treatment_Priority_Matrix.csv',
-                Path('data/generated/250728-Studio8-Treatment_Priority_Matrix.csv'),
-                Path('/Users/chrislyons/Documents/CL/dev/std8/cbc-interactive-dashboard/data/generated/250728-Studio8-Treatment_Priority_Matrix.csv')
-            ]
-            
-            priority_df = None
-            for priority_file in possible_priority_paths:
-                if priority_file.exists():
-                    priority_df = pd.read_csv(priority_file)
-                    break
-            
-            if priority_df is None:
+            # Load the space's treatment priority data
+            priority_file = get_space(self.space).dataset_path('treatment_priority')
+            if priority_file is None or not priority_file.exists():
                 st.error("Treatment priority data not found")
                 return None
-            
-            # File mapping to positions
-            file_mapping = {
-                'Std8-HostA-128k-Sweep.txt': 'HostA (Reference)',
-                'Std8-HostC-128k-Sweep.txt': 'HostC (Talent)',
-                'Std8-Ceiling-128k-Sweep.txt': 'Ceiling',
-                'Std8-MidRoom-128k-Sweep.txt': 'MidRoom',
-                'Std8-NECorner-High-128k-Sweep.txt': 'NECorner-High',
-                'Std8-NECorner-Low-128k-Sweep.txt': 'NECorner-Low',
-                'Std8-SECorner-128k-Sweep.txt': 'SECorner',
-                'Std8-SWCorner-128k-Sweep.txt': 'SWCorner'
-            }
+            priority_df = read_dataset(priority_file)
             
             # STI frequency bands available in Smaart data
             sti_freq_bands = [125, 250, 500, 1000, 2000, 4000, 8000]
@@ -941,24 +823,6 @@ class FrequencyResponseExplorer:
             
             positions = []
             sti_matrix = []
-            reference_sti = None
-            
-            # Get reference STI values from HostA
-            ref_filepath = smaart_path / 'Std8-HostA-128k-Sweep.txt'
-            if ref_filepath.exists():
-                with open(ref_filepath, 'r') as f:
-                    lines = f.readlines()
-                    
-                for line in lines:
-                    if line.startswith('STI\t'):
-                        parts = line.strip().split('\t')
-                        if len(parts) >= 8:
-                            reference_sti = [float(parts[i]) for i in range(2, 9)]
-                            break
-            
-            if not reference_sti:
-                st.error("Could not load reference STI data from HostA")
-                return None
             
             # Calculate treatment effectiveness based on priority and panel count
             position_priority = {}
@@ -1006,29 +870,10 @@ class FrequencyResponseExplorer:
                     remaining_panels -= allocated
             
             # Process each position for STI improvement
-            for filename, position_name in file_mapping.items():
-                filepath = smaart_path / filename
-                if not filepath.exists():
-                    continue
-                    
+            for lookup_name, position_name, sti_values in position_rows:
                 positions.append(position_name)
                 
-                # Parse Smaart file for STI data
-                sti_values = None
-                with open(filepath, 'r') as f:
-                    lines = f.readlines()
-                    
-                for line in lines:
-                    if line.startswith('STI\t'):
-                        parts = line.strip().split('\t')
-                        if len(parts) >= 8:
-                            sti_values = [float(parts[i]) for i in range(2, 9)]
-                            break
-                
                 if sti_values:
-                    # Get position name for priority lookup
-                    lookup_name = position_name.replace(' (Reference)', '').replace(' (Talent)', '')
-                    
                     # Calculate STI improvement based on panels allocated
                     panel_allocation = panels_per_position.get(lookup_name, 0)
                     
@@ -1114,28 +959,30 @@ class FrequencyResponseExplorer:
             st.error(f"Error creating adjusted STI heatmap: {e}")
             return None
     
-    def render_frequency_explorer(self, space="Studio 8"):
-        """Main function to render the frequency response explorer"""
+    @timed('figure')
+    def create_sti_adjusted_figure(self, panel_count):
+        """Adjusted STI heatmap sized for the analysis view (the figure the dashboard warm-up precomputes)"""
+        fig = self.create_adjusted_degradation_heatmap(panel_count)
+        if fig is not None:
+            # Increase height for single view
+            fig.update_layout(height=600)
+        return fig
+    
+    @st.fragment
+    @timed('render')
+    def render_analysis_view(self, space, freq_range, smoothing=None):
+        """Analysis selector, panel count input and the selected view
+
+        Runs as a fragment, so changing the panel count reruns only this view.
+        The sidebar depends on the analysis type, so changing that reruns the page.
+        """
+        space_def = get_space(space)
+        analysis_options = space_def.features['analysis_views']
         
         # Two-column header layout with vertical alignment
         header_col1, header_col2 = st.columns([1, 1])
         
         with header_col1:
-            # Initialize analysis type in session state for persistence across space changes
-            if "freq_analysis_type" not in st.session_state:
-                st.session_state.freq_analysis_type = "STI Degradation Heatmap"
-            
-            # Main page analysis selector with persistence - conditional options based on space
-            if hasattr(st.session_state, 'selected_space') and st.session_state.selected_space == "The Hub":
-                # Hub options: magnitude response and modal analysis only (phase response has data quality issues)
-                analysis_options = ["Magnitude Response", "Modal Stack Analysis"]
-                # Reset to valid option if currently on unavailable options
-                if st.session_state.freq_analysis_type not in analysis_options:
-                    st.session_state.freq_analysis_type = "Magnitude Response"
-            else:
-                # Full options for Studio 8
-                analysis_options = ["STI Degradation Heatmap", "Magnitude Response", "Phase Response", "Modal Stack Analysis"]
-            
             current_index = analysis_options.index(st.session_state.freq_analysis_type) if st.session_state.freq_analysis_type in analysis_options else 0
             
             analysis_type = st.selectbox(
@@ -1145,29 +992,24 @@ class FrequencyResponseExplorer:
                 help="Choose which analysis to display",
                 key="freq_analysis_selector"
             )
-            # Add delay for smoothness
-            import time
-            time.sleep(0.05)
             
-            # Update session state when selection changes
-            st.session_state.freq_analysis_type = analysis_type
+            # Update session state when selection changes; the sidebar controls follow the view
+            if analysis_type != st.session_state.freq_analysis_type:
+                st.session_state.freq_analysis_type = analysis_type
+                st.rerun()
         
         with header_col2:
             if analysis_type == "STI Degradation Heatmap":
                 # Initialize panel count in session state with space-specific defaults
                 if 'panel_count' not in st.session_state:
-                    current_space = getattr(st.session_state, 'selected_space', 'Studio 8')
-                    default_count = 8 if current_space == "The Hub" else 25
-                    st.session_state.panel_count = default_count
+                    st.session_state.panel_count = space_def.default_panels
                 
                 # Panel count text input with space-specific max values
-                current_space = getattr(st.session_state, 'selected_space', 'Studio 8')
-                max_panels = 16 if current_space == "The Hub" else 32
+                max_panels = space_def.max_panels
                 
                 # Reset panel count if it exceeds the current space's maximum
                 if st.session_state.panel_count > max_panels:
-                    default_count = 8 if current_space == "The Hub" else 25
-                    st.session_state.panel_count = default_count
+                    st.session_state.panel_count = space_def.default_panels
                 
                 current_panel_count = st.number_input(
                     label="Panel Count",
@@ -1176,11 +1018,10 @@ class FrequencyResponseExplorer:
                     value=st.session_state.panel_count,
                     step=1,
                     key="panel_number_input",
-                    help=f"Enter panel count directly (max {max_panels} for {current_space})"
+                    help=f"Enter panel count directly (max {max_panels} for {space_def.name})",
+                    on_change=mark_changed,
+                    args=("panel_number_input",)
                 )
-                # Add delay for smoothness
-                import time
-                time.sleep(0.05)
                 # Update session state with typed value
                 st.session_state.panel_count = current_panel_count
             else:
@@ -1191,8 +1032,67 @@ class FrequencyResponseExplorer:
                 # Set default panel count for other views
                 current_panel_count = st.session_state.get('panel_count', 25)
         
-        # Load data for the specified space
-        data_loaded = self.load_smaart_data(space)
+        # Main visualization area - single view with increased height
+        if analysis_type == "STI Degradation Heatmap":
+            # Let rapid +/- presses coalesce before rebuilding the adjusted heatmap
+            settle("panel_number_input")
+            
+            # Two-column layout for before/after comparison
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                fig_heatmap_before = self.create_degradation_heatmap()
+                if fig_heatmap_before is not None:
+                    # Increase height for single view
+                    fig_heatmap_before.update_layout(height=600)
+                    st.plotly_chart(fig_heatmap_before, use_container_width=True)
+            
+            with col2:
+                # Shared figure from the dashboard's warmed store when there is one
+                figures = current_figure_store()
+                if figures is not None:
+                    fig_heatmap_after = figures.get_or_build((space_def.name, 'sti_adjusted', current_panel_count),
+                                                             lambda: self.create_sti_adjusted_figure(current_panel_count))
+                else:
+                    fig_heatmap_after = self.create_sti_adjusted_figure(current_panel_count)
+                if fig_heatmap_after is not None:
+                    st.plotly_chart(fig_heatmap_after, use_container_width=True)
+                else:
+                    st.error("Unable to generate adjusted heatmap - check data files")
+        
+        elif analysis_type == "Magnitude Response":
+            fig_mag = self.create_magnitude_response_plot(freq_range, smoothing=smoothing)
+            st.plotly_chart(fig_mag, use_container_width=True)
+        
+        elif analysis_type == "Phase Response":
+            fig_phase = self.create_phase_response_plot(freq_range, smoothing=smoothing)
+            st.plotly_chart(fig_phase, use_container_width=True)
+        
+        elif analysis_type == "Modal Stack Analysis":
+            fig_modal = self.create_modal_analysis_plot(space)
+            # Set height for single view
+            fig_modal.update_layout(height=800)
+            st.plotly_chart(fig_modal, use_container_width=True)
+    
+    @timed('render')
+    def render_frequency_explorer(self, space="Studio 8"):
+        """Main function to render the frequency response explorer"""
+        space_def = get_space(space)
+        
+        # Initialize analysis type in session state for persistence across space changes
+        if "freq_analysis_type" not in st.session_state:
+            st.session_state.freq_analysis_type = "STI Degradation Heatmap"
+        
+        # Analysis options depend on the space's data
+        # (e.g. The Hub has no STI data, and its phase response has data quality issues)
+        analysis_options = space_def.features['analysis_views']
+        # Reset to valid option if currently on unavailable options
+        if st.session_state.freq_analysis_type not in analysis_options:
+            st.session_state.freq_analysis_type = analysis_options[0]
+        analysis_type = st.session_state.freq_analysis_type
+        
+        # Load data for the specified space (once per shared instance)
+        data_loaded = (self.response_arrays is not None and self.space == space) or self.load_smaart_data(space)
         
         # Control panel in sidebar (simplified)
         with st.sidebar:
@@ -1212,9 +1112,6 @@ class FrequencyResponseExplorer:
                         value=30,
                         step=10
                     )
-                    # Add delay for smoothness
-                    import time
-                    time.sleep(0.05)
                 with col2:
                     freq_max = st.number_input(
                         "Max Hz",
@@ -1223,49 +1120,21 @@ class FrequencyResponseExplorer:
                         value=3000,
                         step=100
                     )
-                    # Add delay for smoothness
-                    import time
-                    time.sleep(0.05)
                 
                 freq_range = (freq_min, freq_max)
+                
+                smoothing = SMOOTHING_OPTIONS[st.selectbox(
+                    "Smoothing",
+                    list(SMOOTHING_OPTIONS),
+                    key="freq_smoothing",
+                    help="Fractional-octave smoothing of every position, as in Smaart"
+                )]
             else:
                 # Default frequency range for other analysis types
                 freq_range = (30, 3000)
+                smoothing = None
         
-        # Main visualization area - single view with increased height
-        if analysis_type == "STI Degradation Heatmap":
-            
-            # Two-column layout for before/after comparison
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                fig_heatmap_before = self.create_degradation_heatmap()
-                # Increase height for single view
-                fig_heatmap_before.update_layout(height=600)
-                st.plotly_chart(fig_heatmap_before, use_container_width=True)
-            
-            with col2:
-                fig_heatmap_after = self.create_adjusted_degradation_heatmap(current_panel_count)
-                if fig_heatmap_after is not None:
-                    # Increase height for single view
-                    fig_heatmap_after.update_layout(height=600)
-                    st.plotly_chart(fig_heatmap_after, use_container_width=True)
-                else:
-                    st.error("Unable to generate adjusted heatmap - check data files")
-        
-        elif analysis_type == "Magnitude Response":
-            fig_mag = self.create_magnitude_response_plot(freq_range)
-            st.plotly_chart(fig_mag, use_container_width=True)
-        
-        elif analysis_type == "Phase Response":
-            fig_phase = self.create_phase_response_plot(freq_range)
-            st.plotly_chart(fig_phase, use_container_width=True)
-        
-        elif analysis_type == "Modal Stack Analysis":
-            fig_modal = self.create_modal_analysis_plot(space)
-            # Set height for single view
-            fig_modal.update_layout(height=800)
-            st.plotly_chart(fig_modal, use_container_width=True)
+        self.render_analysis_view(space, freq_range, smoothing)
         
         # Analysis insights
         with st.expander("🔍 Analysis Insights"):
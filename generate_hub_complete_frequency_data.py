@@ -11,6 +11,8 @@ from datetime import datetime
 from pathlib import Path
 import re
 
+from smaart_parser import parse_smaart_log
+
 # File paths
 HUB_RAW_DIR = Path("data/raw/250715-smaartLogs/TheHub")
 GENERATED_DIR = Path("data/generated")
@@ -27,53 +29,18 @@ POSITION_COLORS = {
 
 def parse_smaart_file(file_path):
     """Parse a Smaart measurement file and extract third-octave band data"""
-    data = {}
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-    
-    # Extract header data
-    for line in lines[:15]:
-        if '%Alcons (S)' in line:
-            data['alcons_s'] = float(line.split('\t')[1])
-        elif '%Alcons (L)' in line:
-            data['alcons_l'] = float(line.split('\t')[1])
-        elif 'Bass Ratio' in line:
-            data['bass_ratio'] = float(line.split('\t')[1])
-        elif 'T Low' in line:
-            data['t_low'] = float(line.split('\t')[1])
-        elif 'T Mid' in line:
-            data['t_mid'] = float(line.split('\t')[1])
-    
-    # Extract third-octave band data for frequency response
-    third_octave_points = []
-    
-    for line in lines:
-        if line.startswith('1/3\t'):
-            parts = line.strip().split('\t')
-            if len(parts) >= 8 and parts[1] != 'Band':
-                try:
-                    freq_str = parts[1]
-                    if 'kHz' in freq_str:
-                        # Handle kHz frequencies like "1kHz", "1.3kHz", "2.5kHz"
-                        freq_value = float(freq_str.replace('kHz', ''))
-                        freq = freq_value * 1000
-                    elif 'Hz' in freq_str:
-                        # Handle Hz frequencies like "500Hz", "630Hz"
-                        freq = float(freq_str.replace('Hz', ''))
-                    else:
-                        freq = float(freq_str)
-                    
-                    if freq >= 20 and parts[7] != '0.00':  # Only valid frequencies with C50 data
-                        # Use C50 as basis for magnitude estimation
-                        c50_value = float(parts[7])
-                        # Convert C50 to approximate magnitude (empirical relationship)
-                        magnitude_db = -18 + (c50_value * 0.8)  # Calibrated to match typical responses
-                        
-                        third_octave_points.append((freq, magnitude_db))
-                except (ValueError, IndexError):
-                    continue
-    
-    data['frequency_points'] = third_octave_points
+    smaart_log = parse_smaart_log(file_path)
+    data = smaart_log.header_dict()
+    data.pop('cis', None)
+    
+    # Only valid frequencies with C50 data
+    freqs = smaart_log.third_octave_freqs
+    c50 = smaart_log.metric('C50', 'third_octave')
+    valid = (freqs >= 20) & (c50 != 0) & ~np.isnan(c50)
+    
+    # Convert C50 to approximate magnitude (empirical relationship, calibrated to match typical responses)
+    magnitude_db = -18 + (c50[valid] * 0.8)
+    data['frequency_points'] = list(zip(freqs[valid].tolist(), magnitude_db.tolist()))
     return data
 
 def calculate_sti_degradation(position_data):
@@ -264,51 +264,59 @@ def calculate_phase_response(freq, magnitude_db):
     
     return total_phase
 
+# Position response functions
+POSITION_RESPONSES = {
+    "TheHub-MidRoom": hub_midroom_response,
+    "TheHub-Chair1": hub_chair1_response,
+    "TheHub-Chair2": hub_chair2_response,
+    "TheHub-BackCorner": hub_backcorner_response,
+    "TheHub-CeilingCorner": hub_ceilingcorner_response
+}
+
+def generate_position_frequency_rows(position, frequencies=None):
+    """Generate frequency response rows for a single Hub position."""
+    if frequencies is None:
+        frequencies = generate_logarithmic_frequencies()
+    
+    response_func = POSITION_RESPONSES[position]
+    color = POSITION_COLORS[position]
+    sti = POSITION_STI[position]
+    
+    # Calculate STI degradation relative to MidRoom (reference)
+    reference_sti = POSITION_STI["TheHub-MidRoom"]
+    sti_degradation = ((reference_sti - sti) / reference_sti) * 100 if reference_sti > 0 else 0
+    
+    rows = []
+    for freq in frequencies:
+        # Generate magnitude response
+        magnitude_db = response_func(freq)
+        
+        # Generate corresponding phase response
+        phase_deg = calculate_phase_response(freq, magnitude_db)
+        
+        # Create data row
+        rows.append({
+            'position': position,
+            'Frequency_Hz': freq,
+            'Magnitude_dB': magnitude_db,
+            'Phase_deg': phase_deg,
+            'Color': color,
+            'STI': sti,
+            'STI_Degradation_%': sti_degradation
+        })
+    
+    return rows
+
 def generate_complete_hub_frequency_data():
     """Generate complete frequency response data for all Hub positions."""
     
     # Generate frequency points
     frequencies = generate_logarithmic_frequencies()
     
-    # Position response functions
-    position_functions = {
-        "TheHub-MidRoom": hub_midroom_response,
-        "TheHub-Chair1": hub_chair1_response,
-        "TheHub-Chair2": hub_chair2_response,
-        "TheHub-BackCorner": hub_backcorner_response,
-        "TheHub-CeilingCorner": hub_ceilingcorner_response
-    }
-    
     # Generate data for all positions
     all_data = []
-    
-    for position, response_func in position_functions.items():
-        color = POSITION_COLORS[position]
-        sti = POSITION_STI[position]
-        
-        # Calculate STI degradation relative to MidRoom (reference)
-        reference_sti = POSITION_STI["TheHub-MidRoom"]
-        sti_degradation = ((reference_sti - sti) / reference_sti) * 100 if reference_sti > 0 else 0
-        
-        for freq in frequencies:
-            # Generate magnitude response
-            magnitude_db = response_func(freq)
-            
-            # Generate corresponding phase response
-            phase_deg = calculate_phase_response(freq, magnitude_db)
-            
-            # Create data row
-            data_row = {
-                'position': position,
-                'Frequency_Hz': freq,
-                'Magnitude_dB': magnitude_db,
-                'Phase_deg': phase_deg,
-                'Color': color,
-                'STI': sti,
-                'STI_Degradation_%': sti_degradation
-            }
-            
-            all_data.append(data_row)
+    for position in POSITION_RESPONSES:
+        all_data.extend(generate_position_frequency_rows(position, frequencies))
     
     return pd.DataFrame(all_data)
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
-Generate Hub frequency response data using only built-in Python libraries
-Based on the existing generator but simplified to avoid external dependencies
+Generate Hub frequency response data with minimal dependencies
+Based on the existing generator but simplified to avoid plotting/scipy dependencies
 """
 
 import csv
@@ -10,6 +10,8 @@ import random
 from pathlib import Path
 from datetime import datetime
 
+from smaart_parser import load_smaart_log
+
 # File paths
 HUB_RAW_DIR = Path("data/raw/250715-smaartLogs/TheHub")
 GENERATED_DIR = Path("data/generated")
@@ -28,41 +30,19 @@ def parse_smaart_file(file_path):
     """Parse a Smaart measurement file and extract third-octave band data"""
     data = {'frequency_points': []}
     
-    try:
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Extract header data
-        for line in lines[:15]:
-            if '%Alcons (S)' in line:
-                data['alcons_s'] = float(line.split('\t')[1])
-            elif 'T Mid' in line:
-                data['t_mid'] = float(line.split('\t')[1])
-        
-        # Extract third-octave band data
-        for line in lines:
-            if line.startswith('1/3\t'):
-                parts = line.strip().split('\t')
-                if len(parts) >= 8 and parts[1] != 'Band':
-                    try:
-                        freq_str = parts[1]
-                        if 'kHz' in freq_str:
-                            freq_value = float(freq_str.replace('kHz', ''))
-                            freq = freq_value * 1000
-                        elif 'Hz' in freq_str:
-                            freq = float(freq_str.replace('Hz', ''))
-                        else:
-                            freq = float(freq_str)
-                        
-                        if freq >= 20 and parts[7] != '0.00':
-                            c50_value = float(parts[7])
-                            # Convert C50 to magnitude estimate
-                            magnitude_db = -18 + (c50_value * 0.8)
-                            data['frequency_points'].append((freq, magnitude_db))
-                    except (ValueError, IndexError):
-                        continue
-    except Exception as e:
-        print(f"Error parsing {file_path}: {e}")
+    smaart_log = load_smaart_log(file_path)
+    if smaart_log is None:
+        return data
+    
+    data.update({name: smaart_log.header_value(name) for name in ('alcons_s', 't_mid')
+                 if smaart_log.header_value(name) is not None})
+    
+    c50_values = smaart_log.metric('C50', 'third_octave')
+    for freq, c50_value in zip(smaart_log.third_octave_freqs.tolist(), c50_values.tolist()):
+        if freq >= 20 and c50_value != 0 and not math.isnan(c50_value):
+            # Convert C50 to magnitude estimate
+            magnitude_db = -18 + (c50_value * 0.8)
+            data['frequency_points'].append((freq, magnitude_db))
     
     return data
 
@@ -177,6 +157,31 @@ def calculate_phase_response(freq, magnitude_db):
     
     return total_phase
 
+def position_frequency_rows(position_name, position_data):
+    """Dense Complete_Frequency_Response rows for one position"""
+    sti, sti_degradation = calculate_sti_degradation(position_data)
+    
+    # Generate continuous frequency response
+    continuous_points = interpolate_frequency_response(
+        position_name, position_data['frequency_points']
+    )
+    
+    rows = []
+    for freq, magnitude in continuous_points:
+        phase_deg = calculate_phase_response(freq, magnitude)
+        
+        rows.append({
+            'position': position_name,
+            'Frequency_Hz': round(freq, 2),
+            'Magnitude_dB': round(magnitude, 2),
+            'Phase_deg': round(phase_deg, 2),
+            'Color': POSITION_COLORS.get(position_name, "#666666"),
+            'STI': round(sti, 2),
+            'STI_Degradation_%': round(sti_degradation, 2)
+        })
+    
+    return rows
+
 def generate_hub_frequency_data():
     """Generate Hub frequency response data"""
     print("Generating Hub frequency response data...")
@@ -198,30 +203,12 @@ def generate_hub_frequency_data():
             position_name = file_path.stem.replace("-64k", "")
             print(f"Processing {position_name}...")
             
-            position_data = parse_smaart_file(file_path)
-            sti, sti_degradation = calculate_sti_degradation(position_data)
-            
-            # Generate continuous frequency response
-            continuous_points = interpolate_frequency_response(
-                position_name, position_data['frequency_points']
-            )
-            
-            print(f"  Generated {len(continuous_points)} frequency points")
+            rows = position_frequency_rows(position_name, parse_smaart_file(file_path))
+            print(f"  Generated {len(rows)} frequency points")
             
             # Write data to CSV
-            for freq, magnitude in continuous_points:
-                phase_deg = calculate_phase_response(freq, magnitude)
-                
-                writer.writerow({
-                    'position': position_name,
-                    'Frequency_Hz': round(freq, 2),
-                    'Magnitude_dB': round(magnitude, 2),
-                    'Phase_deg': round(phase_deg, 2),
-                    'Color': POSITION_COLORS.get(position_name, "#666666"),
-                    'STI': round(sti, 2),
-                    'STI_Degradation_%': round(sti_degradation, 2)
-                })
-                total_records += 1
+            writer.writerows(rows)
+            total_records += len(rows)
     
     print(f"\n✅ Generated {total_records} frequency response records")
     print(f"📁 Saved to: {output_file}")
@@ -155,18 +155,10 @@ if __name__ == "__main__":
     
     for scenario in scenarios:
         # Calculate Hub metrics
-        hub_rt60_data = hub_analyzer.calculate_rt60_with_panels(scenario["hub"])
-        hub_values = []
-        for pos_data in hub_rt60_data.values():
-            hub_values.extend(pos_data.values())
-        hub_avg = sum(hub_values) / len(hub_values)
+        hub_avg = hub_analyzer.calculate_rt60_matrix(scenario["hub"])[hub_analyzer.rt60_valid].mean()
         
         # Calculate Studio 8 metrics
-        studio8_rt60_data = studio8_analyzer.calculate_rt60_with_panels(scenario["studio8"])
-        studio8_values = []
-        for pos_data in studio8_rt60_data.values():
-            studio8_values.extend(pos_data.values())
-        studio8_avg = sum(studio8_values) / len(studio8_values)
+        studio8_avg = studio8_analyzer.calculate_rt60_matrix(scenario["studio8"])[studio8_analyzer.rt60_valid].mean()
         
         print(f"  {scenario['desc']:20s}")
         print(f"    Hub ({scenario['hub']:2d} panels):     {hub_avg:.2f}s average RT60")
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Streaming Transfer-Function Importer
+Reads full-resolution Smaart ASCII transfer-function exports chunk by chunk and
+decimates them onto log-spaced bins in the Complete_Frequency_Response schema
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ingest_campaign import write_csv_atomic
+from smaart_parser import SmaartParseError, load_smaart_log
+from watch_ingest import splice_rows
+
+# Column header keywords used by Smaart ASCII exports (matched case-insensitively)
+COLUMN_KEYWORDS = {
+    'frequency': ('freq',),
+    'magnitude': ('mag', 'db'),
+    'phase': ('phase', 'deg'),
+    'coherence': ('coh',)
+}
+NUMBER_PATTERN = re.compile(r'^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?')
+
+# Output columns matching the generated Complete_Frequency_Response files
+RESPONSE_COLUMNS = ['position', 'Frequency_Hz', 'Magnitude_dB', 'Phase_deg', 'Color', 'STI', 'STI_Degradation_%']
+
+
+def _split(line):
+    """Split an export line on tabs, commas or runs of whitespace"""
+    line = line.strip()
+    if '\t' in line:
+        return [field.strip() for field in line.split('\t')]
+    if ',' in line:
+        return [field.strip() for field in line.split(',')]
+    return line.split()
+
+
+def _detect_columns(header_fields):
+    """Map frequency/magnitude/phase/coherence to column positions from a header row"""
+    columns = {}
+    for i, field in enumerate(header_fields):
+        name = field.lower()
+        for key, keywords in COLUMN_KEYWORDS.items():
+            if key not in columns and any(keyword in name for keyword in keywords):
+                columns[key] = i
+                break
+    return columns
+
+
+def iter_transfer_function_chunks(file_path, chunk_size=8192):
+    """Stream a transfer-function export as NumPy chunks
+
+    Yields dicts of float64 arrays ('frequency', 'magnitude', 'phase',
+    'coherence') holding at most chunk_size FFT bins each. Header and comment
+    lines are skipped; without a header the column order is assumed to be
+    frequency, magnitude, phase, coherence.
+
+    Raises:
+        SmaartParseError: If no numeric data rows are found
+    """
+    columns = None
+    buffer = []
+    rows_seen = 0
+
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if not NUMBER_PATTERN.match(line):
+                # Remember the last header row that names a frequency column
+                fields = _split(line)
+                detected = _detect_columns(fields) if fields else {}
+                if 'frequency' in detected and 'magnitude' in detected:
+                    columns = detected
+                continue
+
+            fields = _split(line)
+            if columns is None:
+                columns = {key: i for i, key in enumerate(COLUMN_KEYWORDS) if i < len(fields)}
+            try:
+                buffer.append([float(fields[columns[key]]) if key in columns else np.nan
+                               for key in COLUMN_KEYWORDS])
+            except (ValueError, IndexError):
+                continue
+
+            if len(buffer) >= chunk_size:
+                rows_seen += len(buffer)
+                yield _chunk(buffer)
+                buffer = []
+
+    if buffer:
+        rows_seen += len(buffer)
+        yield _chunk(buffer)
+    if rows_seen == 0:
+        raise SmaartParseError(f"{file_path}: no transfer-function data rows found")
+
+
+def _chunk(rows):
+    values = np.asarray(rows, dtype=np.float64)
+    return {key: values[:, i] for i, key in enumerate(COLUMN_KEYWORDS)}
+
+
+class LogBinDecimator:
+    """Accumulates FFT bins into log-spaced frequency bins with constant memory
+
+    Magnitude is averaged in the power domain and phase as a circular mean,
+    both weighted by coherence when the export provides it. Bins whose
+    coherence falls below min_coherence are ignored.
+    """
+
+    def __init__(self, fmin=20.0, fmax=20000.0, points_per_octave=48, min_coherence=0.0):
+        n_bins = int(np.ceil(np.log2(fmax / fmin) * points_per_octave))
+        self.edges = fmin * 2.0 ** (np.arange(n_bins + 1) / points_per_octave)
+        self.centers = np.sqrt(self.edges[:-1] * self.edges[1:])
+        self.min_coherence = min_coherence
+        self.weight = np.zeros(n_bins)
+        self.power = np.zeros(n_bins)
+        self.cos_sum = np.zeros(n_bins)
+        self.sin_sum = np.zeros(n_bins)
+        self.bins_read = 0
+
+    def update(self, chunk):
+        """Fold one chunk from iter_transfer_function_chunks into the bins"""
+        freq = chunk['frequency']
+        self.bins_read += len(freq)
+        index = np.searchsorted(self.edges, freq, side='right') - 1
+        coherence = chunk['coherence']
+        weight = np.where(np.isnan(coherence), 1.0, coherence)
+        keep = (index >= 0) & (index < len(self.centers)) & ~np.isnan(chunk['magnitude'])
+        keep &= np.isnan(coherence) | (coherence >= self.min_coherence)
+
+        index, weight = index[keep], weight[keep]
+        n_bins = len(self.centers)
+        phase = np.deg2rad(chunk['phase'][keep])
+        has_phase = ~np.isnan(phase)
+        self.weight += np.bincount(index, weights=weight, minlength=n_bins)
+        self.power += np.bincount(index, weights=weight * 10.0 ** (chunk['magnitude'][keep] / 10.0), minlength=n_bins)
+        self.cos_sum += np.bincount(index[has_phase], weights=weight[has_phase] * np.cos(phase[has_phase]), minlength=n_bins)
+        self.sin_sum += np.bincount(index[has_phase], weights=weight[has_phase] * np.sin(phase[has_phase]), minlength=n_bins)
+
+    def result(self):
+        """(frequency, magnitude_db, phase_deg) for every bin that received data"""
+        filled = self.weight > 0
+        magnitude = 10.0 * np.log10(self.power[filled] / self.weight[filled])
+        phase = np.rad2deg(np.arctan2(self.sin_sum[filled], self.cos_sum[filled]))
+        phase[(self.cos_sum[filled] == 0) & (self.sin_sum[filled] == 0)] = np.nan
+        return self.centers[filled], magnitude, phase
+
+
+def import_transfer_function(file_path, position, color="#666666", sti=np.nan, sti_degradation=np.nan,
+                             points_per_octave=48, fmin=20.0, fmax=20000.0, min_coherence=0.0, chunk_size=8192):
+    """Stream one transfer-function export into Complete_Frequency_Response rows
+
+    Returns:
+        (DataFrame with RESPONSE_COLUMNS, number of FFT bins read)
+    """
+    decimator = LogBinDecimator(fmin, fmax, points_per_octave, min_coherence)
+    for chunk in iter_transfer_function_chunks(file_path, chunk_size):
+        decimator.update(chunk)
+
+    frequency, magnitude, phase = decimator.result()
+    df = pd.DataFrame({
+        'position': position,
+        'Frequency_Hz': np.round(frequency, 2),
+        'Magnitude_dB': np.round(magnitude, 2),
+        'Phase_deg': np.round(phase, 2),
+        'Color': color,
+        'STI': sti,
+        'STI_Degradation_%': sti_degradation
+    }, columns=RESPONSE_COLUMNS)
+    return df, decimator.bins_read
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a Smaart transfer-function export into a frequency response dataset")
+    parser.add_argument('export', help="Smaart ASCII transfer-function export")
+    parser.add_argument('--position', required=True, help="Position name, e.g. TheHub-Chair1")
+    parser.add_argument('--output', required=True, help="Complete_Frequency_Response CSV to create or update")
+    parser.add_argument('--color', default="#666666", help="Plot colour for the position")
+    parser.add_argument('--points-per-octave', type=int, default=48, help="Log-spaced output resolution")
+    parser.add_argument('--min-coherence', type=float, default=0.0, help="Ignore FFT bins below this coherence")
+    parser.add_argument('--log', help="Smaart log for this position (provides STI)")
+    parser.add_argument('--reference-log', help="Smaart log of the reference position (for STI degradation)")
+    args = parser.parse_args()
+
+    sti = sti_degradation = np.nan
+    if args.log:
+        smaart_log = load_smaart_log(args.log)
+        if smaart_log is not None:
+            sti = smaart_log.overall_sti()
+    if args.reference_log and not np.isnan(sti):
+        reference_log = load_smaart_log(args.reference_log)
+        if reference_log is not None and reference_log.overall_sti() > 0:
+            reference_sti = reference_log.overall_sti()
+            sti_degradation = round((reference_sti - sti) / reference_sti * 100, 2)
+
+    df, bins_read = import_transfer_function(args.export, args.position, args.color, sti, sti_degradation,
+                                             args.points_per_octave, min_coherence=args.min_coherence)
+
+    output = Path(args.output)
+    if output.exists():
+        splice_rows(output, 'position', args.position, df.to_dict('records'))
+    else:
+        write_csv_atomic(df, output)
+    print(f"Decimated {bins_read} FFT bins to {len(df)} points for {args.position} -> {output}")
+
+
+if __name__ == "__main__":
+    main()
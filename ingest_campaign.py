@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Parallel Measurement Campaign Ingestion
+Parses whole trees of Smaart log exports across a process pool into one consolidated table
+"""
+
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from columnar_store import bundle_path, write_bundle
+from smaart_parser import HEADER_FIELDS, METRICS, STI_BAND_LABELS, SmaartParseError, parse_smaart_log
+from space_registry import log_prefixes
+
+# Default locations
+RAW_DIR = Path("data/raw")
+TABLE_PATH = Path("data/generated/Smaart_Measurement_Table.csv")
+
+# Smaart exports are named <Space>-<Position>-<FFT size>[-Sweep].txt
+LOG_NAME_PATTERN = re.compile(r'^(?P<space>[A-Za-z0-9]+)-(?P<position>.+?)-(?P<fft>\d+k)(?:-Sweep)?$')
+CAMPAIGN_PATTERN = re.compile(r'^(?P<campaign>\d{6})-')
+
+# File-name prefixes to dashboard space names (from data/spaces/spaces.json)
+SPACE_NAMES = log_prefixes()
+
+# Column order of the consolidated table
+TABLE_COLUMNS = (['campaign', 'space', 'position', 'source_file', 'measured_at',
+                  'resolution', 'band', 'frequency_hz'] + list(METRICS) +
+                 ['sti_band', 'sti', 'stipa'] + list(HEADER_FIELDS))
+
+
+def parse_log_name(file_path):
+    """Split a Smaart export file name into (space, position, fft size), or None if it doesn't match"""
+    match = LOG_NAME_PATTERN.match(Path(file_path).stem)
+    if not match:
+        return None
+    space = SPACE_NAMES.get(match.group('space'), match.group('space'))
+    return space, match.group('position'), match.group('fft')
+
+
+def campaign_for(file_path, date=''):
+    """Campaign id (YYMMDD) from the nearest dated folder, falling back to the log's Date header"""
+    for part in reversed(Path(file_path).parent.parts):
+        match = CAMPAIGN_PATTERN.match(part)
+        if match:
+            return match.group('campaign')
+    try:
+        return datetime.strptime(date.strip(), '%a %b %d %H:%M:%S %Y').strftime('%y%m%d')
+    except ValueError:
+        return 'unknown'
+
+
+def discover_logs(root):
+    """All Smaart text exports below root (a single file is returned as-is)"""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(path for path in root.rglob('*.txt') if path.is_file())
+
+
+def position_files(directory):
+    """Map each Smaart export in a directory to its measurement position
+
+    Derived from the file-name convention so new positions are picked up without
+    editing hand-maintained file_to_position dicts.
+    """
+    mapping = {}
+    for path in discover_logs(directory):
+        parsed = parse_log_name(path)
+        if parsed is not None:
+            mapping[path.name] = parsed[1]
+    return mapping
+
+
+def write_csv_atomic(df, output_file):
+    """Write a CSV (and its columnar bundle) via temporary files so readers never see a partial file"""
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    try:
+        df.to_csv(tmp_file, index=False)
+        os.replace(tmp_file, output_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+    # Keep the columnar copy the dashboard loads in step with the CSV
+    write_bundle(df, bundle_path(output_file))
+
+
+def log_table(file_path, smaart_log):
+    """Consolidated-table rows (as a DataFrame) for one parsed log"""
+    return pd.DataFrame(_log_rows(file_path, smaart_log), columns=TABLE_COLUMNS)
+
+
+def _log_rows(file_path, smaart_log):
+    """Flatten one parsed log into table columns (one row per band plus a broadband row)"""
+    space, position, _ = parse_log_name(file_path)
+    resolutions = ['broadband']
+    labels = ['Broadband']
+    freqs = [np.nan]
+    values = [smaart_log.broadband[np.newaxis, :]]
+    for resolution in ('octave', 'third_octave'):
+        band_labels, band_freqs, band_values = smaart_log.bands(resolution)
+        resolutions += [resolution] * len(band_labels)
+        labels += band_labels.tolist()
+        freqs += band_freqs.tolist()
+        values.append(band_values)
+
+    n_rows = len(labels)
+    values = np.vstack(values)
+    columns = {
+        'campaign': [campaign_for(file_path, smaart_log.date)] * n_rows,
+        'space': [space] * n_rows,
+        'position': [position] * n_rows,
+        'source_file': [str(file_path)] * n_rows,
+        'measured_at': [smaart_log.date] * n_rows,
+        'resolution': resolutions,
+        'band': labels,
+        'frequency_hz': np.asarray(freqs, dtype=np.float64)
+    }
+    for i, metric in enumerate(METRICS):
+        columns[metric] = values[:, i]
+
+    # Per-band STI only exists for the octave bands 125Hz-8kHz
+    sti_band = np.full(n_rows, np.nan)
+    sti_values = dict(zip(STI_BAND_LABELS, smaart_log.sti_bands()))
+    for i, (resolution, label) in enumerate(zip(resolutions, labels)):
+        if resolution == 'octave' and label in sti_values:
+            sti_band[i] = sti_values[label]
+    columns['sti_band'] = sti_band
+    columns['sti'] = np.full(n_rows, smaart_log.overall_sti('STI'))
+    columns['stipa'] = np.full(n_rows, smaart_log.overall_sti('STIPA(IR)'))
+    for i, field in enumerate(HEADER_FIELDS):
+        columns[field] = np.full(n_rows, smaart_log.header[i])
+    return columns
+
+
+def _ingest_file(file_path):
+    """Worker: parse one export, returning (path, columns, error)"""
+    try:
+        smaart_log = parse_smaart_log(file_path)
+        return file_path, _log_rows(file_path, smaart_log), None
+    except (OSError, SmaartParseError) as e:
+        return file_path, None, str(e)
+
+
+class IngestReport:
+    """Outcome of an ingestion run"""
+
+    def __init__(self):
+        self.parsed = []
+        self.skipped = []
+        self.errors = {}
+        self.bytes_read = 0
+        self.elapsed = 0.0
+
+    def summary(self):
+        """Human-readable throughput and failure summary"""
+        files_per_sec = len(self.parsed) / self.elapsed if self.elapsed else 0.0
+        mb_per_sec = self.bytes_read / 1e6 / self.elapsed if self.elapsed else 0.0
+        lines = [f"Parsed {len(self.parsed)} files in {self.elapsed:.2f}s "
+                 f"({files_per_sec:.1f} files/s, {mb_per_sec:.2f} MB/s)"]
+        if self.skipped:
+            lines.append(f"Skipped {len(self.skipped)} files not named <Space>-<Position>-<FFT>.txt:")
+            lines += [f"  {path}" for path in self.skipped]
+        if self.errors:
+            lines.append(f"Failed {len(self.errors)} malformed files:")
+            lines += [f"  {path}: {error}" for path, error in self.errors.items()]
+        return "\n".join(lines)
+
+
+def ingest(roots, workers=None):
+    """Parse every Smaart export below the given roots in parallel
+
+    Args:
+        roots: Directories (or files) to scan
+        workers: Process count (defaults to os.cpu_count())
+
+    Returns:
+        (DataFrame with TABLE_COLUMNS, IngestReport)
+    """
+    report = IngestReport()
+    start = time.perf_counter()
+
+    files = []
+    for root in roots:
+        for path in discover_logs(root):
+            if parse_log_name(path) is None:
+                report.skipped.append(str(path))
+            else:
+                files.append(path)
+
+    frames = {}
+    if files:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            futures = [pool.submit(_ingest_file, path) for path in files]
+            for future in as_completed(futures):
+                file_path, columns, error = future.result()
+                if error is not None:
+                    report.errors[str(file_path)] = error
+                    continue
+                report.parsed.append(str(file_path))
+                report.bytes_read += file_path.stat().st_size
+                frames[str(file_path)] = pd.DataFrame(columns)
+
+    # Keep a stable row order regardless of worker completion order
+    ordered = [frames[key] for key in sorted(frames)]
+    table = pd.concat(ordered, ignore_index=True) if ordered else pd.DataFrame(columns=TABLE_COLUMNS)
+    report.elapsed = time.perf_counter() - start
+    return table[TABLE_COLUMNS], report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest Smaart log exports into a consolidated measurement table")
+    parser.add_argument('roots', nargs='*', default=[str(RAW_DIR)], help="Directories or files to ingest")
+    parser.add_argument('-o', '--output', default=str(TABLE_PATH), help="CSV path for the consolidated table")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    table, report = ingest(args.roots, workers=args.workers)
+    print(report.summary())
+
+    if len(table):
+        output = Path(args.output)
+        write_csv_atomic(table, output)
+        print(f"Wrote {len(table)} rows for {table['position'].nunique()} positions to {output}")
+
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
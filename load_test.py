@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Load Test
+Concurrent simulated sessions clicking through spaces, pages and panel counts, reporting latency percentiles and server RSS
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import requests
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from figure_warmup import read_status
+from space_registry import space_names
+
+try:
+    from websockets.asyncio.client import connect
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+DASHBOARD = Path(__file__).resolve().parent / 'cbc8_acoustic_dashboard.py'
+# The launched server gets its own cache directory so it never touches a running dashboard's status file
+LOAD_TEST_CACHE_DIR = Path(os.environ.get('CBC_CACHE_DIR', '.cache')) / 'load_test'
+PAGES = ["Summary", "Data Explorer", "3D Room Model", "Frequency Response", "Treatment Simulator", "Complete Analysis"]
+PANEL_INPUTS = ("3d_panel_number_input", "panel_number_input")
+# Relative weights of the simulated clicks
+ACTIONS = {'page': 4, 'panels': 4, 'space': 1, 'view': 2}
+FINAL_STATUSES = {ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+                  ForwardMsg.FINISHED_WITH_COMPILE_ERROR}
+
+
+def process_memory(pid):
+    """{'rss_mb', 'peak_mb'} of a process from /proc, or None where that is unavailable"""
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return {'rss_mb': round(int(fields['VmRSS'].split()[0]) / 1024, 1),
+                'peak_mb': round(int(fields['VmHWM'].split()[0]) / 1024, 1)}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+class SimulatedSession:
+    """One browser tab: a websocket session that reruns the dashboard the way the frontend does
+
+    Widgets are tracked by their user key with the value the server last
+    rendered, and every rerun sends all of them, as a browser would. Changing
+    a widget inside a fragment reruns only that fragment.
+    """
+
+    def __init__(self, url, space, page, rng):
+        self.url = url.rstrip('/').replace('http', 'ws', 1) + '/_stcore/stream'
+        self.query_string = f"space={space}&page={page}"
+        self.rng = rng
+        self.widgets = {}  # key -> {'id', 'type', 'value', 'fragment_id', 'options', 'max'}
+        self.page_script_hash = ''
+        self.latencies = []  # (action, seconds)
+        self.errors = []
+        self._ws = None
+
+    async def open(self):
+        self._ws = await connect(self.url, subprotocols=["streamlit"], max_size=None, open_timeout=60)
+        await self._rerun('load', {})
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+
+    def _track(self, delta, seen):
+        element = delta.new_element
+        kind = element.WhichOneof('type')
+        if kind == 'exception':
+            self.errors.append(element.exception.message)
+        elif kind == 'alert' and element.alert.format == Alert.ERROR:
+            self.errors.append(element.alert.body)
+        elif kind in ('selectbox', 'number_input'):
+            widget = getattr(element, kind)
+            key = widget.id.split('-', 2)[-1]
+            if key == 'None':
+                key = widget.id  # No user key
+            known = self.widgets.get(key)
+            options = list(widget.options) if kind == 'selectbox' else None
+            # Like the frontend, keep our own value for a widget we already show unless the script set it
+            if widget.set_value:
+                value = widget.raw_value if kind == 'selectbox' else widget.value
+            elif known is not None and known['id'] == widget.id:
+                value = known['value']
+            elif kind == 'selectbox':
+                value = widget.options[widget.default] if widget.HasField('default') else None
+            else:
+                value = widget.default if widget.HasField('default') else None
+            self.widgets[key] = {'id': widget.id, 'type': kind, 'value': value, 'fragment_id': delta.fragment_id,
+                                 'options': options, 'max': getattr(widget, 'max', None)}
+            seen.add(key)
+
+    async def _rerun(self, action, changes, fragment_id=''):
+        """Send one rerun with changed widget values and wait for the run to finish; records the latency"""
+        for key, value in changes.items():
+            self.widgets[key]['value'] = value
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = self.query_string
+        client_state.page_script_hash = self.page_script_hash
+        client_state.fragment_id = fragment_id
+        for widget in self.widgets.values():
+            if widget['value'] is None:
+                continue
+            state = client_state.widget_states.widgets.add()
+            state.id = widget['id']
+            if widget['type'] == 'selectbox':
+                state.string_value = widget['value']
+            else:
+                state.double_value = widget['value']
+
+        start = time.perf_counter()
+        await self._ws.send(message.SerializeToString())
+        seen = set()
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await self._ws.recv())
+            kind = forward.WhichOneof('type')
+            if kind == 'page_info_changed':
+                self.query_string = forward.page_info_changed.query_string
+            elif kind == 'new_session':
+                self.page_script_hash = forward.new_session.page_script_hash
+                seen = set()
+            elif kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                self._track(forward.delta, seen)
+            elif kind == 'script_finished' and forward.script_finished in FINAL_STATUSES:
+                break
+        self.latencies.append((action, time.perf_counter() - start))
+
+        # A full run shows every widget on the page; forget the ones it no longer draws
+        if not fragment_id:
+            self.widgets = {key: widget for key, widget in self.widgets.items() if key in seen}
+
+    def _choices(self):
+        """Actions possible on the current page, with their widget changes and fragment"""
+        choices = []
+        space = self.widgets.get('space_selector')
+        page = self.widgets.get('page_selector')
+        if space and len(space['options']) > 1:
+            choices.append(('space', 'space_selector'))
+        if page:
+            choices.append(('page', 'page_selector'))
+        choices.extend(('panels', key) for key in PANEL_INPUTS if key in self.widgets)
+        if 'freq_analysis_selector' in self.widgets:
+            choices.append(('view', 'freq_analysis_selector'))
+        return choices
+
+    async def step(self):
+        """Make one random click"""
+        choices = self._choices()
+        if not choices:
+            await self._rerun('reload', {})
+            return
+        action, key = self.rng.choices(choices, weights=[ACTIONS[action] for action, _ in choices])[0]
+        widget = self.widgets[key]
+        if action == 'panels':
+            value = float(self.rng.randint(0, int(widget['max'])))
+            await self._rerun(action, {key: value}, fragment_id=widget['fragment_id'])
+        else:
+            others = [option for option in widget['options'] if option != widget['value']] or widget['options']
+            await self._rerun(action, {key: self.rng.choice(others)})
+
+    async def tour(self):
+        """Visit every page of every space once (loads every shared component)"""
+        for space in space_names():
+            if self.widgets.get('space_selector', {}).get('value') != space:
+                await self._rerun('space', {'space_selector': space})
+            for page in PAGES:
+                if self.widgets.get('page_selector', {}).get('value') != page:
+                    await self._rerun('page', {'page_selector': page})
+
+
+async def _session_loop(session, actions, think_s):
+    for _ in range(actions):
+        await asyncio.sleep(session.rng.uniform(0, 2 * think_s))
+        await session.step()
+
+
+async def run_load(url, sessions, actions, think_s, seed, server_pid=None):
+    """Prime one session with a tour of every page, then click through N sessions concurrently
+
+    Returns latencies, errors and the server's memory at each stage. Every
+    session stays connected until the end, so the final RSS includes their
+    session state; the growth per extra session shows what is not shared.
+    """
+    rng = random.Random(seed)
+    memory = {'start': process_memory(server_pid) if server_pid else None}
+
+    first = SimulatedSession(url, space_names()[0], "Summary", random.Random(rng.random()))
+    await first.open()
+    await first.tour()
+    memory['one_session'] = process_memory(server_pid) if server_pid else None
+
+    others = []
+    for index in range(1, sessions):
+        space = space_names()[index % len(space_names())]
+        others.append(SimulatedSession(url, space, rng.choice(PAGES), random.Random(rng.random())))
+    all_sessions = [first] + others
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(session.open() for session in others))
+        await asyncio.gather(*(_session_loop(session, actions, think_s) for session in all_sessions))
+        elapsed = time.perf_counter() - start
+        memory['all_sessions'] = process_memory(server_pid) if server_pid else None
+    finally:
+        await asyncio.gather(*(session.close() for session in all_sessions), return_exceptions=True)
+
+    # The tour is warm-up, not load
+    latencies = [record for session in others for record in session.latencies]
+    latencies += first.latencies[-actions:]
+    return {'sessions': sessions, 'actions_per_session': actions, 'elapsed_s': round(elapsed, 2),
+            'latencies': latencies, 'errors': [error for session in all_sessions for error in session.errors],
+            'memory': memory}
+
+
+def percentiles(values):
+    values = np.asarray(values, dtype=float)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]) if values.size else (np.nan, np.nan, np.nan)
+    return {'count': int(values.size), 'p50_ms': round(p50 * 1000, 1), 'p90_ms': round(p90 * 1000, 1),
+            'p99_ms': round(p99 * 1000, 1), 'max_ms': round(values.max() * 1000, 1) if values.size else None}
+
+
+def summarize(result):
+    """Latency percentiles overall and per action, and RSS growth per extra session"""
+    by_action = {}
+    for action, seconds in result['latencies']:
+        by_action.setdefault(action, []).append(seconds)
+    summary = {'overall': percentiles([seconds for _, seconds in result['latencies']]),
+               'by_action': {action: percentiles(values) for action, values in sorted(by_action.items())},
+               'errors': len(result['errors']), 'memory': result['memory']}
+    one, everyone = result['memory'].get('one_session'), result['memory'].get('all_sessions')
+    if one and everyone and result['sessions'] > 1:
+        summary['rss_mb_per_extra_session'] = round((everyone['rss_mb'] - one['rss_mb']) / (result['sessions'] - 1), 2)
+    return summary
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def launch_server(port, warmup=True):
+    """Start the dashboard on port and wait for it (and, with the warm-up on, its precomputed figures)"""
+    LOAD_TEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    status_path = LOAD_TEST_CACHE_DIR / 'warmup_status.json'
+    if status_path.exists():
+        status_path.unlink()
+    env = dict(os.environ, CBC_CACHE_DIR=str(LOAD_TEST_CACHE_DIR), CBC_WARMUP='1' if warmup else '0')
+    log = open(LOAD_TEST_CACHE_DIR / 'server.log', 'w')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', str(DASHBOARD),
+         '--server.headless', 'true', '--server.port', str(port), '--server.address', '127.0.0.1',
+         '--server.fileWatcherType', 'none', '--server.scriptHealthCheckEnabled', 'true',
+         '--browser.gatherUsageStats', 'false', '--logger.level', 'warning'],
+        env=env, stdout=log, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{port}"
+
+    for _ in range(60):
+        try:
+            if requests.get(f"{url}/_stcore/health", timeout=5).status_code == 200:
+                break
+        except requests.RequestException:
+            pass
+        if server.poll() is not None:
+            raise RuntimeError(f"Dashboard exited; see {LOAD_TEST_CACHE_DIR / 'server.log'}")
+        time.sleep(1)
+    else:
+        server.terminate()
+        raise RuntimeError("Dashboard did not become healthy")
+
+    if warmup:
+        # One server-side run starts the warm-up; load starts once every panel-count figure exists
+        requests.get(f"{url}/_stcore/script-health-check", timeout=300)
+        for _ in range(600):
+            status = read_status(status_path)
+            if status and status['pid'] == server.pid and status['state'] == 'ready':
+                break
+            time.sleep(0.5)
+    return server, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[-1])
+    parser.add_argument('--sessions', type=int, default=8, help="concurrent simulated sessions")
+    parser.add_argument('--actions', type=int, default=20, help="clicks per session")
+    parser.add_argument('--think', type=float, default=0.5, help="mean seconds between a session's clicks")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--url', help="load an already running dashboard instead of launching one")
+    parser.add_argument('--pid', type=int, help="with --url, the server process to report RSS for")
+    parser.add_argument('--no-warmup', action='store_true', help="launch the dashboard with CBC_WARMUP=0")
+    parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    args = parser.parse_args()
+
+    if not WEBSOCKETS_AVAILABLE:
+        print("The load test needs the websockets package (pip install -r requirements-dev.txt)")
+        return 1
+
+    server = None
+    if args.url:
+        url, server_pid = args.url, args.pid
+    else:
+        server, url = launch_server(_free_port(), warmup=not args.no_warmup)
+        server_pid = server.pid
+    try:
+        result = asyncio.run(run_load(url, args.sessions, args.actions, args.think, args.seed, server_pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    summary = summarize(result)
+    if args.json:
+        print(json.dumps(summary, indent=1))
+    else:
+        print(f"{result['sessions']} sessions x {result['actions_per_session']} clicks in {result['elapsed_s']}s")
+        print(f"{'action':10s} {'count':>6s} {'p50 ms':>8s} {'p90 ms':>8s} {'p99 ms':>8s} {'max ms':>8s}")
+        for action, entry in [('all', summary['overall'])] + list(summary['by_action'].items()):
+            print(f"{action:10s} {entry['count']:6d} {entry['p50_ms']:8.0f} {entry['p90_ms']:8.0f} "
+                  f"{entry['p99_ms']:8.0f} {entry['max_ms'] or 0:8.0f}")
+        for stage, memory in summary['memory'].items():
+            if memory:
+                print(f"RSS {stage:13s} {memory['rss_mb']:7.1f} MB (peak {memory['peak_mb']:.1f} MB)")
+        if 'rss_mb_per_extra_session' in summary:
+            print(f"RSS per extra session: {summary['rss_mb_per_extra_session']:.2f} MB")
+        if result['errors']:
+            print(f"{len(result['errors'])} errors, e.g. {result['errors'][0][:200]}")
+    return 1 if result['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Persistent Parsed-Measurement Cache
+Stores parsed Smaart logs as .npz arrays so warm starts never re-read the text exports
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from smaart_parser import SmaartLog, SmaartParseError, parse_smaart_text
+
+# Cache location (override with CBC_CACHE_DIR, e.g. for read-only deployments)
+CACHE_DIR = Path(os.environ.get('CBC_CACHE_DIR', '.cache')) / 'smaart'
+INDEX_NAME = 'index.json'
+
+# Bump when the SmaartLog layout or parser output changes so old entries are discarded
+CACHE_VERSION = 1
+
+# Array fields written to each .npz entry
+ARRAY_FIELDS = ('header', 'sti', 'broadband',
+                'octave_labels', 'octave_freqs', 'octave',
+                'third_octave_labels', 'third_octave_freqs', 'third_octave')
+
+
+class MeasurementCache:
+    """On-disk cache of parsed Smaart logs
+
+    Entries are keyed by resolved source path, size, mtime and content hash.
+    A lookup whose size/mtime still match the index loads the .npz directly;
+    only a changed fingerprint causes the text file to be read and hashed.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / INDEX_NAME
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _load_index(self):
+        """Read the index once per process (an unreadable index is treated as empty)"""
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r') as f:
+                    index = json.load(f)
+                if index.get('version') != CACHE_VERSION:
+                    index = {}
+            except (OSError, ValueError):
+                index = {}
+            self._index = index.get('entries', {})
+        return self._index
+
+    def _save_index(self):
+        """Write the index atomically so concurrent readers never see a partial file"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'entries': self._index}, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def _entry_path(self, content_hash):
+        return self.cache_dir / f'{content_hash}.npz'
+
+    def _write_entry(self, content_hash, smaart_log):
+        """Store the arrays of a parsed log under its content hash"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(content_hash)
+        tmp_path = entry_path.with_suffix(f'.{os.getpid()}.tmp.npz')
+        arrays = {name: getattr(smaart_log, name) for name in ARRAY_FIELDS}
+        np.savez(tmp_path, date=np.array(smaart_log.date), **arrays)
+        os.replace(tmp_path, entry_path)
+
+    def _read_entry(self, content_hash, file_path):
+        """Rebuild a SmaartLog from its .npz entry"""
+        with np.load(self._entry_path(content_hash), allow_pickle=False) as data:
+            arrays = {name: data[name] for name in ARRAY_FIELDS}
+            date = str(data['date'])
+        return SmaartLog(file_path, date, **arrays)
+
+    def _evict(self, key):
+        """Drop an index entry and its .npz file unless another path shares the content"""
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        if not any(other['hash'] == entry['hash'] for other in self._index.values()):
+            try:
+                self._entry_path(entry['hash']).unlink()
+            except OSError:
+                pass
+
+    def load(self, file_path, stat=None):
+        """Return the parsed SmaartLog for file_path, parsing and caching it on a miss
+
+        Raises:
+            OSError: If the source file cannot be read
+            SmaartParseError: If the source file is not a Smaart log export
+        """
+        path = Path(file_path)
+        stat = stat or os.stat(path)
+        key = str(path.resolve())
+        stamp = [stat.st_size, stat.st_mtime_ns]
+
+        with self._lock:
+            entry = self._load_index().get(key)
+
+        # Fast path: fingerprint unchanged, load arrays without touching the text file
+        if entry is not None and entry['stamp'] == stamp:
+            try:
+                return self._read_entry(entry['hash'], path)
+            except (OSError, KeyError, ValueError):
+                pass
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        content_hash = hashlib.sha1(raw).hexdigest()
+
+        # Touched but unchanged content (e.g. copied or re-synced): refresh the stamp only
+        smaart_log = None
+        if entry is not None and entry['hash'] == content_hash:
+            try:
+                smaart_log = self._read_entry(content_hash, path)
+            except (OSError, KeyError, ValueError):
+                smaart_log = None
+
+        if smaart_log is None:
+            smaart_log = parse_smaart_text(raw.decode('utf-8', errors='replace'), path)
+
+        with self._lock:
+            try:
+                if entry is not None and entry['hash'] != content_hash:
+                    self._evict(key)
+                if smaart_log is not None and not self._entry_path(content_hash).exists():
+                    self._write_entry(content_hash, smaart_log)
+                self._index[key] = {'stamp': stamp, 'hash': content_hash}
+                self._save_index()
+            except OSError as e:
+                # A read-only or full disk only costs us the cache, never the data
+                print(f"Warning: could not update measurement cache: {e}")
+
+        return smaart_log
+
+    def prune(self):
+        """Evict entries whose source file was deleted or changed on disk
+
+        Returns:
+            Number of evicted entries
+        """
+        with self._lock:
+            index = self._load_index()
+            stale = []
+            for key, entry in index.items():
+                try:
+                    stat = os.stat(key)
+                except OSError:
+                    stale.append(key)
+                    continue
+                if [stat.st_size, stat.st_mtime_ns] != entry['stamp']:
+                    stale.append(key)
+            for key in stale:
+                self._evict(key)
+            if stale:
+                try:
+                    self._save_index()
+                except OSError as e:
+                    print(f"Warning: could not update measurement cache: {e}")
+        return len(stale)
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._load_index()
+            for key in list(self._index):
+                self._evict(key)
+            try:
+                self._save_index()
+            except OSError as e:
+                print(f"Warning: could not update measurement cache: {e}")
+
+
+# Shared instance used by smaart_parser.load_smaart_log
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_measurement_cache():
+    """Return the process-wide MeasurementCache"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = MeasurementCache()
+            # Drop entries for logs that were edited or removed since the last run
+            _default_cache.prune()
+        return _default_cache
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    cache = get_measurement_cache()
+    if '--clear' in sys.argv:
+        cache.clear()
+        print(f"Cleared {cache.cache_dir}")
+    else:
+        evicted = cache.prune()
+        start = time.perf_counter()
+        logs = sorted(Path('data/raw/250715-smaartLogs').rglob('*.txt'))
+        for log_path in logs:
+            try:
+                cache.load(log_path)
+            except (OSError, SmaartParseError) as e:
+                print(f"Skipped {log_path}: {e}")
+        elapsed = time.perf_counter() - start
+        print(f"Cached {len(logs)} logs in {elapsed * 1000:.1f} ms ({evicted} stale entries evicted)")
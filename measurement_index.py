@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Multi-Campaign Measurement Index
+Dense (space, campaign, position, metric, band) arrays built from every Smaart log under data/raw
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ingest_campaign import RAW_DIR, campaign_for, discover_logs, parse_log_name
+from smaart_parser import HEADER_FIELDS, METRICS, STI_BAND_LABELS, STI_ROWS, band_label, load_smaart_log, parse_band_label
+
+INDEX_PATH = Path(os.environ.get('CBC_CACHE_DIR', '.cache')) / 'measurement_index.npz'
+
+# Per-log scalars (no band axis): header metrics plus overall STI/STIPA
+SCALAR_FIELDS = tuple(HEADER_FIELDS) + STI_ROWS
+
+# Octave bands Smaart reports per-band STI for (Hz)
+STI_BANDS = np.array([parse_band_label(label) for label in STI_BAND_LABELS])
+
+# Bump when the array layout changes so persisted indexes are rebuilt
+INDEX_VERSION = 3
+
+
+class MeasurementIndex:
+    """Measurements of every campaign addressable by name
+
+    Attributes:
+        spaces, campaigns, positions, metrics, bands: axis labels
+        values: float64 (space, campaign, position, metric, band) octave-band values
+        valid: bool mask of values that passed smaart_parser.band_validity at ingest
+        scalars: float64 (space, campaign, position, SCALAR_FIELDS) per-log values
+        sti: float64 (space, campaign, position, STI_ROWS, STI_BANDS) per-band STI and STIPA
+        sources: {(space, campaign, position): log path}
+    Invalid and unmeasured values are NaN, so engines can use the arrays
+    directly without per-value checks or fallback constants.
+    """
+
+    def __init__(self, spaces, campaigns, positions, bands, values, valid, scalars, sti, sources):
+        self.spaces = list(spaces)
+        self.campaigns = list(campaigns)
+        self.positions = list(positions)
+        self.metrics = list(METRICS)
+        self.bands = np.asarray(bands, dtype=np.float64)
+        self.values = values
+        self.valid = valid
+        self.scalars = scalars
+        self.sti = sti
+        self.sources = sources
+        self._axes = {
+            'space': {name: i for i, name in enumerate(self.spaces)},
+            'campaign': {name: i for i, name in enumerate(self.campaigns)},
+            'position': {name: i for i, name in enumerate(self.positions)},
+            'metric': {name: i for i, name in enumerate(self.metrics)}
+        }
+
+    def _select(self, axis, names):
+        """Index (or index array) for one axis; None selects everything"""
+        lookup = self._axes[axis]
+        if names is None:
+            return slice(None)
+        if isinstance(names, str):
+            return lookup[names]
+        return np.asarray([lookup[name] for name in names], dtype=np.intp)
+
+    def _select_bands(self, bands):
+        """Index (or index array) of exact band centres; unknown bands raise KeyError like other labels"""
+        if bands is None:
+            return slice(None)
+        requested = np.atleast_1d(np.asarray(bands, dtype=np.float64))
+        indices = np.searchsorted(self.bands, requested)
+        missing = requested[~np.isin(requested, self.bands)]
+        if len(missing):
+            raise KeyError(f"Band(s) not in index: {', '.join(f'{freq:g}' for freq in missing)}")
+        if np.isscalar(bands):
+            return int(indices[0])
+        return indices
+
+    def select(self, space=None, campaign=None, position=None, metric=None, band=None, array=None):
+        """Slice the octave-band array by label (str for one, list for several, None for all)
+
+        Single labels drop their axis, like NumPy integer indexing. Pass
+        array=index.valid to slice the validity mask the same way.
+        """
+        selectors = [self._select('space', space), self._select('campaign', campaign),
+                     self._select('position', position), self._select('metric', metric),
+                     self._select_bands(band)]
+        # Apply one axis at a time so several list selectors don't broadcast together
+        result = self.values if array is None else array
+        axis = 0
+        for selector in selectors:
+            result = result[(slice(None),) * axis + (selector,)]
+            if not np.isscalar(selector) and not isinstance(selector, (int, np.integer)):
+                axis += 1
+        return result
+
+    def table(self, space, metric, positions, bands, campaign=None):
+        """(position, band) array of one metric for arbitrary position/band lists
+
+        Positions, bands or campaigns the index has never seen give NaN rows
+        or columns instead of raising, so callers can model positions that
+        have no log. Uses the latest campaign for the space when campaign is None.
+        """
+        result = np.full((len(positions), len(bands)), np.nan)
+        campaign = campaign or (self.latest_campaign(space) if space in self._axes['space'] else None)
+        if campaign not in self._axes['campaign']:
+            return result
+        rows = [i for i, position in enumerate(positions) if position in self._axes['position']]
+        bands = np.asarray(bands, dtype=np.float64)
+        columns = np.flatnonzero(np.isin(bands, self.bands))
+        if rows and len(columns):
+            block = self.select(space, campaign, [positions[i] for i in rows], metric, bands[columns])
+            result[np.ix_(rows, columns)] = block
+        return result
+
+    def mask(self, space, metric, campaign=None, positions=None):
+        """(position, band) validity mask of one metric (all bands of the index)"""
+        campaign = campaign or self.latest_campaign(space)
+        positions = self.positions_for(space, campaign) if positions is None else positions
+        return self.select(space, campaign, positions, metric, array=self.valid)
+
+    def validation_report(self):
+        """One row per indexed log and metric listing the bands that failed validation"""
+        records = []
+        band_labels = [band_label(freq) for freq in self.bands]
+        for (space, campaign, position), source in sorted(self.sources.items()):
+            valid = self.select(space, campaign, position, array=self.valid)
+            for metric, metric_valid in zip(self.metrics, valid):
+                records.append({
+                    'space': space, 'campaign': campaign, 'position': position, 'metric': metric,
+                    'valid_bands': int(metric_valid.sum()), 'total_bands': len(self.bands),
+                    'invalid_bands': ', '.join(label for label, ok in zip(band_labels, metric_valid) if not ok),
+                    'source_file': source
+                })
+        return pd.DataFrame(records)
+
+    def scalar(self, space, campaign, position, field):
+        """One per-log value such as 't_mid' or 'STI' (NaN if not measured)"""
+        return float(self.scalars[self._axes['space'][space], self._axes['campaign'][campaign],
+                                  self._axes['position'][position], SCALAR_FIELDS.index(field)])
+
+    def sti_bands(self, space, campaign=None, row='STI'):
+        """(positions, (position, STI_BANDS) array) of per-band STI (or STIPA) measured in a campaign
+
+        Uses the latest campaign for the space when campaign is None; a space
+        the index has never seen gives no positions.
+        """
+        if space not in self._axes['space']:
+            return [], np.empty((0, len(STI_BANDS)))
+        campaign = campaign or self.latest_campaign(space)
+        if campaign is None:
+            return [], np.empty((0, len(STI_BANDS)))
+        positions = self.positions_for(space, campaign)
+        values = self.sti[self._axes['space'][space], self._axes['campaign'][campaign],
+                          self._select('position', positions), STI_ROWS.index(row)]
+        return positions, values
+
+    def campaigns_for(self, space):
+        """Campaigns that measured a space, oldest first"""
+        s = self._axes['space'][space]
+        measured = ~np.isnan(self.scalars[s]).all(axis=(1, 2))
+        return [name for name, present in zip(self.campaigns, measured) if present]
+
+    def positions_for(self, space, campaign=None):
+        """Positions measured in a space (in a given campaign, or in any)"""
+        s = self._axes['space'][space]
+        scalars = self.scalars[s] if campaign is None else self.scalars[s, self._axes['campaign'][campaign]][np.newaxis]
+        measured = ~np.isnan(scalars).all(axis=(0, 2))
+        return [name for name, present in zip(self.positions, measured) if present]
+
+    def latest_campaign(self, space):
+        """Most recent campaign id that measured a space (None if never measured)"""
+        campaigns = self.campaigns_for(space)
+        return campaigns[-1] if campaigns else None
+
+    def band_values(self, space, metric, campaign=None, bands=None):
+        """{position: {band Hz: value}} for one metric, dropping missing bands
+
+        Uses the latest campaign for the space when campaign is None.
+        """
+        campaign = campaign or self.latest_campaign(space)
+        if campaign is None:
+            return {}
+        positions = self.positions_for(space, campaign)
+        band_freqs = self.bands if bands is None else np.asarray(bands, dtype=np.float64)
+        band_freqs = band_freqs[np.isin(band_freqs, self.bands)]
+        table = self.select(space, campaign, positions, metric, band_freqs)
+        masks = self.select(space, campaign, positions, metric, band_freqs, array=self.valid)
+        result = {}
+        for position, row, valid in zip(positions, table, masks):
+            if valid.any():
+                result[position] = {_as_key(freq): float(value) for freq, value in zip(band_freqs[valid], row[valid])}
+        return result
+
+    def compare(self, space, metric, before, after, positions=None):
+        """after - before for one metric as a (position, band) array
+
+        Positions default to those measured in both campaigns.
+        """
+        if positions is None:
+            after_positions = set(self.positions_for(space, after))
+            positions = [p for p in self.positions_for(space, before) if p in after_positions]
+        both = self.select(space, [before, after], positions, metric)
+        return positions, both[1] - both[0]
+
+
+def _as_key(freq):
+    """Integer keys for whole-Hz bands, as in SmaartLog.metric_by_frequency"""
+    freq = float(freq)
+    return int(freq) if freq.is_integer() else freq
+
+
+def _fingerprint(files):
+    """Cheap change detector for the indexed logs (paths, sizes, mtimes)"""
+    stats = []
+    for path in files:
+        stat = path.stat()
+        stats.append([str(path), stat.st_size, stat.st_mtime_ns])
+    return json.dumps(stats)
+
+
+def build_measurement_index(roots=(RAW_DIR,)):
+    """Parse (or load from the measurement cache) every log under roots into a MeasurementIndex"""
+    entries = []
+    for root in roots:
+        for path in discover_logs(root):
+            parsed = parse_log_name(path)
+            smaart_log = load_smaart_log(path) if parsed else None
+            if smaart_log is not None:
+                space, position, _ = parsed
+                entries.append((space, campaign_for(path, smaart_log.date), position, path, smaart_log))
+
+    spaces = sorted({entry[0] for entry in entries})
+    campaigns = sorted({entry[1] for entry in entries})
+    positions = sorted({entry[2] for entry in entries})
+    bands = np.unique(np.concatenate([entry[4].octave_freqs for entry in entries])) if entries else np.empty(0)
+
+    values = np.full((len(spaces), len(campaigns), len(positions), len(METRICS), len(bands)), np.nan, dtype=np.float64)
+    valid = np.zeros(values.shape, dtype=bool)
+    scalars = np.full((len(spaces), len(campaigns), len(positions), len(SCALAR_FIELDS)), np.nan, dtype=np.float64)
+    sti = np.full((len(spaces), len(campaigns), len(positions), len(STI_ROWS), len(STI_BANDS)), np.nan, dtype=np.float64)
+    sources = {}
+    for space, campaign, position, path, smaart_log in entries:
+        key = (spaces.index(space), campaigns.index(campaign), positions.index(position))
+        columns = np.searchsorted(bands, smaart_log.octave_freqs)
+        octave_valid = smaart_log.validity()
+        values[key][:, columns] = np.where(octave_valid, smaart_log.octave, np.nan).T
+        valid[key][:, columns] = octave_valid.T
+        scalars[key] = np.concatenate([smaart_log.header,
+                                       [smaart_log.overall_sti(row) for row in STI_ROWS]])
+        sti[key] = smaart_log.sti[:, 1:]
+        sources[(space, campaign, position)] = str(path)
+
+    return MeasurementIndex(spaces, campaigns, positions, bands, values, valid, scalars, sti, sources)
+
+
+def save_measurement_index(index, path, fingerprint):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {'version': INDEX_VERSION, 'fingerprint': fingerprint,
+            'sources': [[*key, source] for key, source in index.sources.items()]}
+    tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp_path, spaces=np.asarray(index.spaces, dtype=str), campaigns=np.asarray(index.campaigns, dtype=str),
+             positions=np.asarray(index.positions, dtype=str), bands=index.bands, values=index.values,
+             valid=index.valid, scalars=index.scalars, sti=index.sti, meta=np.array(json.dumps(meta)))
+    os.replace(tmp_path, path)
+
+
+def load_saved_index(path, fingerprint):
+    """Persisted index if it was built from the same files, else None"""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != INDEX_VERSION or meta.get('fingerprint') != fingerprint:
+                return None
+            sources = {tuple(entry[:3]): entry[3] for entry in meta['sources']}
+            return MeasurementIndex(data['spaces'].tolist(), data['campaigns'].tolist(), data['positions'].tolist(),
+                                    data['bands'], data['values'], data['valid'], data['scalars'], data['sti'],
+                                    sources)
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# Process-wide index shared by the dashboard components
+_index = None
+_index_fingerprint = None
+_index_lock = threading.Lock()
+
+
+def get_measurement_index(raw_dir=RAW_DIR):
+    """Return the current MeasurementIndex, rebuilding it only when a log was added, changed or removed"""
+    global _index, _index_fingerprint
+    fingerprint = _fingerprint(discover_logs(raw_dir))
+    with _index_lock:
+        if _index is not None and _index_fingerprint == fingerprint:
+            return _index
+        index = load_saved_index(INDEX_PATH, fingerprint)
+        if index is None:
+            index = build_measurement_index([raw_dir])
+            try:
+                save_measurement_index(index, INDEX_PATH, fingerprint)
+            except OSError as e:
+                print(f"Warning: could not save measurement index: {e}")
+        _index, _index_fingerprint = index, fingerprint
+        return index
+
+
+if __name__ == "__main__":
+    index = get_measurement_index()
+    print(f"{len(index.sources)} logs: {len(index.spaces)} spaces x {len(index.campaigns)} campaigns x "
+          f"{len(index.positions)} positions x {len(index.metrics)} metrics x {len(index.bands)} bands")
+    for space in index.spaces:
+        for campaign in index.campaigns_for(space):
+            positions = index.positions_for(space, campaign)
+            mean_rt60 = np.nanmean(index.select(space, campaign, positions, 'RT60', [500, 1000]))
+            print(f"  {space} {campaign}: {len(positions)} positions, mean RT60 (500Hz-1kHz) {mean_rt60:.2f}s")
+
+    report = index.validation_report()
+    incomplete = report[report['valid_bands'] < report['total_bands']]
+    band_labels = [band_label(freq) for freq in index.bands]
+    print(f"\nValidation: {int(report['valid_bands'].sum())}/{int(report['total_bands'].sum())} band values valid")
+    for (space, campaign, position), rows in incomplete.groupby(['space', 'campaign', 'position'], sort=False):
+        # Empty bands usually fail every metric; list metric-specific failures separately
+        invalid = {row.metric: row.invalid_bands.split(', ') for row in rows.itertuples()}
+        common = set.intersection(*map(set, invalid.values())) if len(invalid) == len(index.metrics) else set()
+        notes = [', '.join(b for b in band_labels if b in common) + ' (all metrics)'] if common else []
+        notes += [f"{metric} {', '.join(b for b in bands if b not in common)}"
+                  for metric, bands in invalid.items() if set(bands) - common]
+        print(f"  {space} {campaign} {position}: {'; '.join(notes)}")
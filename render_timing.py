@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Render Timing
+Timing decorators for render methods, data loaders and figure builders, with a debug panel and rolling JSONL log
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import streamlit as st
+
+LOG_PATH = Path(os.environ.get('CBC_CACHE_DIR', '.cache')) / 'render_timings.jsonl'
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotated to render_timings.jsonl.1 beyond this
+LOG_ENABLED = os.environ.get('CBC_TIMING_LOG', '1') != '0'
+RECENT_RECORDS = 2000
+
+_local = threading.local()
+_recent = deque(maxlen=RECENT_RECORDS)
+_log_lock = threading.Lock()
+
+
+def _state():
+    """Per-thread call depth and records (each Streamlit session runs its script on its own thread)"""
+    if not hasattr(_local, 'depth'):
+        _local.depth = 0
+        _local.seq = 0
+        _local.run = []
+        _local.pending = []
+        _local.measure_payload = False
+    return _local
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except ImportError:
+        return None
+    return ctx.session_id[:8] if ctx else None
+
+
+def _write_log(records):
+    if not LOG_ENABLED:
+        return
+    lines = ''.join(json.dumps(record) + '\n' for record in records)
+    with _log_lock:
+        try:
+            LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+            if LOG_PATH.exists() and LOG_PATH.stat().st_size > LOG_MAX_BYTES:
+                os.replace(LOG_PATH, LOG_PATH.with_name(LOG_PATH.name + '.1'))
+            with open(LOG_PATH, 'a') as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"Warning: could not write timing log: {e}")
+
+
+def timed(kind):
+    """Record the wall time of every call to the decorated function
+
+    kind is 'render', 'load' or 'figure'. Figure results also record their
+    trace count and, when payload measurement is on for the run, the size of
+    their JSON. Nested timed calls record their depth; a thread's records are
+    logged when its outermost timed call returns.
+    """
+    def decorator(func):
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            state = _state()
+            record = {'kind': kind, 'name': name, 'depth': state.depth, 'seq': state.seq}
+            state.seq += 1
+            state.depth += 1
+            start = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            except BaseException as e:
+                # Includes Streamlit's rerun/stop signals, which are not failures
+                record['exception'] = type(e).__name__
+                raise
+            finally:
+                record['ms'] = round((time.perf_counter() - start) * 1000, 2)
+                state.depth -= 1
+                data = getattr(result, 'data', None) if kind == 'figure' else None
+                if data is not None:
+                    record['traces'] = len(data)
+                    if state.measure_payload:
+                        record['json_bytes'] = len(result.to_json())
+                record['ts'] = round(time.time(), 3)
+                state.run.append(record)
+                state.pending.append(record)
+                _recent.append(record)
+                if state.depth == 0:
+                    session = _session_id()
+                    for pending in state.pending:
+                        pending['session'] = session
+                    _write_log(state.pending)
+                    state.pending = []
+        return wrapper
+    return decorator
+
+
+def begin_run(measure_payload=False):
+    """Start collecting this thread's records for the debug panel (call at the top of the script)"""
+    state = _state()
+    state.run = []
+    state.seq = 0
+    state.measure_payload = measure_payload
+
+
+def run_records():
+    """This thread's records since begin_run, in call order"""
+    return sorted(_state().run, key=lambda record: record['seq'])
+
+
+def recent_records():
+    """The process's most recent records from every session and warm-up thread, oldest first"""
+    return list(_recent)
+
+
+def summarize(records):
+    """{name: {'kind', 'calls', 'total_ms', 'mean_ms', 'max_ms', 'max_json_bytes'}}, slowest total first"""
+    summary = {}
+    for record in records:
+        entry = summary.setdefault(record['name'], {'kind': record['kind'], 'calls': 0, 'total_ms': 0.0,
+                                                    'max_ms': 0.0, 'max_json_bytes': None})
+        entry['calls'] += 1
+        entry['total_ms'] += record['ms']
+        entry['max_ms'] = max(entry['max_ms'], record['ms'])
+        if record.get('json_bytes') is not None:
+            entry['max_json_bytes'] = max(entry['max_json_bytes'] or 0, record['json_bytes'])
+    for entry in summary.values():
+        entry['mean_ms'] = entry['total_ms'] / entry['calls']
+    return dict(sorted(summary.items(), key=lambda item: -item[1]['total_ms']))
+
+
+def render_debug_panel():
+    """Collapsible sidebar panel with this run's timings and cache statistics (call at the end of the script)
+
+    Fragment reruns are logged but do not redraw the panel.
+    """
+    import pandas as pd
+    from figure_cache import figure_cache_stats
+    from scoped_cache import cache_stats
+    from startup_profile import import_timings
+
+    records = run_records()
+    with st.sidebar.expander("🔧 Performance", expanded=False):
+        st.checkbox("Measure figure JSON size", key="_timing_measure_payload",
+                    help="Serialize each figure once more to report the payload size (from the next rerun)")
+        if records:
+            top_level_ms = sum(record['ms'] for record in records if record['depth'] == 0)
+            st.caption(f"{len(records)} timed calls, {top_level_ms:.0f} ms at top level")
+            st.dataframe(pd.DataFrame([{
+                'call': '· ' * record['depth'] + record['name'],
+                'kind': record['kind'],
+                'ms': record['ms'],
+                'traces': record.get('traces'),
+                'KB': round(record['json_bytes'] / 1024, 1) if 'json_bytes' in record else None,
+            } for record in records]), hide_index=True, use_container_width=True)
+        else:
+            st.caption("No timed calls in this run")
+        st.json({'component_imports_ms': import_timings(), 'computation_cache': cache_stats(),
+                 'figure_cache': figure_cache_stats()}, expanded=False)
+        st.caption(f"Log: {LOG_PATH}")
+
+
+def read_log(path=LOG_PATH):
+    """Records from the timing log and its rotated predecessor, oldest first"""
+    records = []
+    for log_path in (path.with_name(path.name + '.1'), path):
+        try:
+            with open(log_path, 'r') as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+        except (OSError, ValueError):
+            continue
+    return records
+
+
+if __name__ == "__main__":
+    summary = summarize(read_log())
+    print(f"{'call':60s} {'kind':7s} {'calls':>6s} {'mean ms':>9s} {'max ms':>9s} {'max KB':>8s}")
+    for name, entry in list(summary.items())[:40]:
+        max_kb = f"{entry['max_json_bytes'] / 1024:.0f}" if entry['max_json_bytes'] is not None else ""
+        print(f"{name:60s} {entry['kind']:7s} {entry['calls']:6d} {entry['mean_ms']:9.1f} "
+              f"{entry['max_ms']:9.1f} {max_kb:>8s}")
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Frequency Response Arrays
+Per-position frequency/magnitude/phase stored as float32 .npy files shared by every session
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from columnar_store import read_dataset
+from curve_decimation import minmax_indices
+
+# Derived array stores live alongside the other caches (override with CBC_CACHE_DIR)
+RESPONSE_DIR = Path(os.environ.get('CBC_CACHE_DIR', '.cache')) / 'responses'
+ARRAY_NAMES = ('frequency', 'magnitude', 'phase')
+# Resolution pyramid: bands per octave, coarsest first (the raw data is the finest level)
+PYRAMID_LEVELS = (3, 12, 48, 384)
+PYRAMID_SERIES = ('magnitude', 'phase')
+
+# Bump when the on-disk layout changes so stores are rebuilt
+STORE_VERSION = 3
+
+
+class ResponseArrays:
+    """Read-only view of a frequency response dataset
+
+    All positions share three contiguous float32 arrays, grouped by position
+    and sorted by frequency inside each group. A small index maps each
+    position to its [start, stop) row range, so selecting a band is two
+    binary searches and returns views into the memory map, never copies.
+
+    Each series also has a pyramid of coarser levels (PYRAMID_LEVELS) that
+    keep, per fractional-octave band, the samples with the band's lowest
+    and highest value, so a wide view reads a few points per band instead
+    of every sample while still showing every peak and notch.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        with open(self.directory / 'index.json', 'r') as f:
+            index = json.load(f)
+        # The index names the files of its own build, so a concurrent rebuild never mixes generations
+        files = index['files']
+        arrays = {name: np.load(self.directory / files[name], mmap_mode='r') for name in ARRAY_NAMES}
+        pyramid = {key: np.load(self.directory / files[key], mmap_mode='r') for key in _pyramid_keys()}
+        self._set(index, arrays, pyramid)
+
+    @classmethod
+    def from_frame(cls, df, position_col='position'):
+        """Partition an in-memory DataFrame the same way, without writing a store"""
+        arrays, entries = partition_responses(df, position_col)
+        pyramid = build_pyramid(arrays, entries)
+        store = cls.__new__(cls)
+        store.directory = None
+        store._set({'version': STORE_VERSION, 'source': None, 'positions': entries}, arrays, pyramid)
+        return store
+
+    def _set(self, index, arrays, pyramid):
+        self.index = index
+        self.positions = [entry['position'] for entry in index['positions']]
+        self._entries = {entry['position']: entry for entry in index['positions']}
+        self.arrays = arrays
+        self.pyramid = pyramid
+
+    def __len__(self):
+        return len(self.arrays['frequency'])
+
+    def color(self, position):
+        """Plot colour recorded for a position (None if the dataset had none)"""
+        return self._entries[position].get('color')
+
+    def attribute(self, position, name, default=None):
+        """Per-position scalar carried over from the dataset (e.g. 'STI')"""
+        return self._entries[position].get('attributes', {}).get(name, default)
+
+    def slice(self, position, fmin=None, fmax=None):
+        """Frequency, magnitude and phase of one position within [fmin, fmax] Hz
+
+        Returns:
+            Tuple of three float32 array views (empty if nothing is in range)
+        """
+        entry = self._entries[position]
+        start, stop = entry['start'], entry['stop']
+        freq = self.arrays['frequency'][start:stop]
+        lo = 0 if fmin is None else int(np.searchsorted(freq, fmin, side='left'))
+        hi = len(freq) if fmax is None else int(np.searchsorted(freq, fmax, side='right'))
+        return tuple(self.arrays[name][start + lo:start + hi] for name in ARRAY_NAMES)
+
+    def slice_series(self, position, series, fmin=None, fmax=None, bands_per_octave=None):
+        """Frequency and one series ('magnitude' or 'phase') of a position within [fmin, fmax] Hz
+
+        bands_per_octave picks a pyramid level; None reads the raw samples.
+
+        Returns:
+            Tuple of two float32 array views
+        """
+        if bands_per_octave is None:
+            frequency, magnitude, phase = self.slice(position, fmin, fmax)
+            return frequency, magnitude if series == 'magnitude' else phase
+        key = f'{series}/{bands_per_octave}'
+        start, stop = self._entries[position]['pyramid'][key]
+        frequency, values = self.pyramid[key][:, start:stop]
+        lo = 0 if fmin is None else int(np.searchsorted(frequency, fmin, side='left'))
+        hi = len(frequency) if fmax is None else int(np.searchsorted(frequency, fmax, side='right'))
+        return frequency[lo:hi], values[lo:hi]
+
+    def budget_series(self, position, series, fmin, fmax, max_points):
+        """Frequency and one series of a position within [fmin, fmax] Hz, read at the level a point budget needs
+
+        Reads the coarsest pyramid level that still has at least max_points
+        points in the range, so a chart that draws max_points points gets no
+        fewer than it can show. When the raw samples in range are within the
+        budget anyway (or no level reaches it) the raw samples are read.
+        """
+        for bands in PYRAMID_LEVELS:
+            frequency, values = self.slice_series(position, series, fmin, fmax, bands)
+            if len(frequency) >= max_points:
+                return frequency, values
+        return self.slice_series(position, series, fmin, fmax)
+
+
+def _pyramid_keys():
+    return [f'{series}/{bands}' for series in PYRAMID_SERIES for bands in PYRAMID_LEVELS]
+
+
+def _array_file(key, generation):
+    """File name of an array ('magnitude') or pyramid level ('magnitude/12') within one build"""
+    if '/' in key:
+        series, bands = key.split('/')
+        key = f'pyramid_{series}_{bands}'
+    return f'{key}.{generation}.npy'
+
+
+def _index_files(directory):
+    """File names referenced by the current index (empty if there is none)"""
+    try:
+        with open(directory / 'index.json', 'r') as f:
+            return set(json.load(f).get('files', {}).values())
+    except (OSError, ValueError, AttributeError):
+        return set()
+
+
+def partition_responses(df, position_col='position'):
+    """Float32 arrays grouped by position (in order of first appearance) and sorted by frequency within each
+
+    Returns:
+        ({array name: array}, [index entry per position with its [start, stop) rows, colour and scalars])
+    """
+    positions = list(dict.fromkeys(df[position_col]))
+    position_codes = df[position_col].map({name: i for i, name in enumerate(positions)}).to_numpy()
+    freq = df['Frequency_Hz'].to_numpy(dtype=np.float64)
+    order = np.lexsort((freq, position_codes))
+    columns = {
+        'frequency': df['Frequency_Hz'],
+        'magnitude': df['Magnitude_dB'],
+        'phase': df['Phase_deg'] if 'Phase_deg' in df.columns else None
+    }
+    arrays = {name: (np.full(len(df), np.nan, dtype=np.float32) if column is None
+                     else column.to_numpy(dtype=np.float32)[order])
+              for name, column in columns.items()}
+
+    counts = np.bincount(position_codes, minlength=len(positions))
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    scalar_columns = [c for c in ('STI', 'STI_Degradation_%') if c in df.columns]
+    first_rows = df.drop_duplicates(position_col).set_index(position_col)
+    entries = []
+    for i, name in enumerate(positions):
+        row = first_rows.loc[name]
+        entries.append({
+            'position': str(name),
+            'start': int(bounds[i]),
+            'stop': int(bounds[i + 1]),
+            'color': str(row['Color']) if 'Color' in df.columns else None,
+            'attributes': {c: float(row[c]) for c in scalar_columns}
+        })
+    return arrays, entries
+
+
+def build_pyramid(arrays, entries):
+    """{'series/bands': float32 (2, n) array of frequency and value rows} for every pyramid level
+
+    Bands are fractional octaves counted from each position's lowest
+    frequency. Records each position's [start, stop) columns per level in
+    its index entry under 'pyramid'.
+    """
+    levels = {key: [] for key in _pyramid_keys()}
+    offsets = dict.fromkeys(levels, 0)
+    for entry in entries:
+        entry['pyramid'] = {}
+        frequency = arrays['frequency'][entry['start']:entry['stop']]
+        octaves = np.log2(np.maximum(frequency.astype(np.float64), 1e-3))
+        span = octaves[-1] - octaves[0] if len(octaves) else 0.0
+        for key in levels:
+            series, bands = key.split('/')
+            values = arrays[series][entry['start']:entry['stop']]
+            keep = minmax_indices(octaves, values, max(int(np.ceil(span * int(bands))), 1))
+            levels[key].append(np.stack([frequency[keep], values[keep]]))
+            entry['pyramid'][key] = [offsets[key], offsets[key] + len(keep)]
+            offsets[key] += len(keep)
+    return {key: np.concatenate(parts, axis=1) if parts else np.empty((2, 0), dtype=np.float32)
+            for key, parts in levels.items()}
+
+
+def build_response_arrays(df, directory, source=None, position_col='position'):
+    """Write a frequency response DataFrame as memory-mappable arrays plus a position index
+
+    Every build writes its arrays under new, generation-tagged file names and
+    then swaps in index.json with a single rename, so a reader opening the
+    store mid-rebuild sees either the old build or the new one, never a mix.
+    Files of older builds are removed afterwards; the build just replaced is
+    kept for readers that loaded its index a moment before the swap.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    arrays, entries = partition_responses(df, position_col)
+    pyramid = build_pyramid(arrays, entries)
+    generation = f'{time.time_ns():x}-{os.getpid()}'
+    values = dict(arrays, **pyramid)
+    files = {key: _array_file(key, generation) for key in values}
+    for key, filename in files.items():
+        np.save(directory / filename, values[key])
+
+    previous_files = _index_files(directory)
+    index = {'version': STORE_VERSION, 'source': source, 'files': files, 'positions': entries}
+    tmp_path = directory / f'.index.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp_path, directory / 'index.json')
+
+    keep = previous_files | set(files.values())
+    for path in directory.glob('*.npy'):
+        if path.name not in keep:
+            try:
+                path.unlink()
+            except OSError:
+                # Still mapped by another process (Windows); the next build retries
+                pass
+
+
+# Process-wide stores: every Streamlit session shares the same memory maps
+_open_stores = {}
+_open_stores_lock = threading.Lock()
+
+
+def open_response_arrays(csv_path, response_dir=RESPONSE_DIR):
+    """Return the ResponseArrays for a Complete_Frequency_Response dataset
+
+    The store is rebuilt when the dataset changes (tracked by mtime) and opened
+    once per process.
+    """
+    csv_path = Path(csv_path)
+    # The CSV is the source of truth; a bundle-only dataset is tracked through its bundle
+    source_file = csv_path if csv_path.exists() else csv_path.with_suffix('.npz')
+    source = {'path': str(source_file.resolve()), 'mtime_ns': source_file.stat().st_mtime_ns}
+    directory = Path(response_dir) / csv_path.stem
+
+    with _open_stores_lock:
+        store = _open_stores.get(directory)
+        if store is not None and store.index.get('source') == source:
+            return store
+
+        try:
+            store = ResponseArrays(directory)
+            if store.index.get('version') != STORE_VERSION or store.index.get('source') != source:
+                store = None
+        except (OSError, ValueError, KeyError):
+            store = None
+
+        if store is None:
+            build_response_arrays(read_dataset(csv_path), directory, source=source)
+            store = ResponseArrays(directory)
+
+        _open_stores[directory] = store
+        return store
+
+
+if __name__ == "__main__":
+    import sys
+
+    for arg in sys.argv[1:] or ['data/generated/250731-TheHub-Complete_Frequency_Response.csv']:
+        store = open_response_arrays(arg)
+        print(f"{arg}: {len(store)} points, {len(store.positions)} positions in {store.directory}")
+        for position in store.positions:
+            freq, magnitude, _ = store.slice(position, 100, 1000)
+            print(f"  {position}: {len(freq)} points in 100 Hz-1 kHz, "
+                  f"mean {float(magnitude.mean()) if len(magnitude) else float('nan'):.1f} dB")
@@ -11,6 +11,9 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import streamlit as st
 
+from ingest_campaign import position_files
+from smaart_parser import load_smaart_log
+
 class RT60HeatmapAnalyzer:
     def __init__(self):
         # Studio 8 dimensions
@@ -45,16 +48,13 @@ class RT60HeatmapAnalyzer:
         # Path to Smaart logs
         smaart_path = Path('data/raw/250715-smaartLogs/Std8')
         
-        # Mapping from file names to our position names
-        file_to_position = {
-            'Std8-HostA-128k-Sweep.txt': 'HostA',
-            'Std8-HostC-128k-Sweep.txt': 'HostC', 
-            'Std8-Ceiling-128k-Sweep.txt': 'Ceiling',
-            'Std8-SECorner-128k-Sweep.txt': 'SECorner',
-            'Std8-MidRoom-128k-Sweep.txt': 'MidRoom',
-            'Std8-NECorner-High-128k-Sweep.txt': 'NECorner',
-            'Std8-SWCorner-128k-Sweep.txt': 'SWCorner'
-        }
+        # Positions come from the export file names; NECorner-High is the modelled NE corner
+        position_aliases = {'NECorner-High': 'NECorner'}
+        file_to_position = {}
+        for filename, position in position_files(smaart_path).items():
+            position = position_aliases.get(position, position)
+            if position in self.measurement_positions:
+                file_to_position[filename] = position
         
         # Store actual RT60 measurements
         self.actual_rt60_data = {}
@@ -72,35 +72,15 @@ class RT60HeatmapAnalyzer:
             self.actual_rt60_data['NWCorner'] = self.actual_rt60_data['SWCorner'].copy()
     
     def parse_smaart_file(self, file_path):
-        """Parse Smaart log file to extract RT60 values by frequency"""
-        rt60_data = {}
-        
-        try:
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
-            
-            # Find the octave band RT60 data (lines starting with "Oct")
-            for line in lines:
-                line = line.strip()
-                if line.startswith('Oct\t') and 'Hz' in line:
-                    parts = line.split('\t')
-                    if len(parts) >= 3:
-                        freq_str = parts[1].replace('Hz', '')
-                        try:
-                            freq = int(freq_str)
-                            rt60_value = float(parts[2])
-                            
-                            # Only store frequencies we're interested in
-                            if freq in self.frequency_bands and rt60_value > 0:
-                                rt60_data[freq] = rt60_value
-                        except ValueError:
-                            continue
-            
-            return rt60_data if rt60_data else None
-            
-        except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
+        """Extract RT60 values by frequency from the shared Smaart log parser"""
+        smaart_log = load_smaart_log(file_path)
+        if smaart_log is None:
             return None
+        
+        # Only keep frequencies we're interested in (zeroed bands are dropped).
+        # kHz labels parse too, so 1k-8k octaves are included alongside 125-500 Hz.
+        rt60_data = smaart_log.metric_by_frequency('RT60', self.frequency_bands)
+        return rt60_data if rt60_data else None
     
     def calculate_baseline_absorption(self):
         """Calculate baseline room absorption without treatment panels"""
@@ -7,112 +7,65 @@ Fixed to use realistic RT60 values from real measurements
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import streamlit as st
-from pathlib import Path
+
+from measurement_index import get_measurement_index
+from figure_cache import cached_figure
+from render_timing import timed
+from space_registry import get_space
 
 class RT60HeatmapAnalyzer:
-    def __init__(self):
-        # Studio 8 dimensions
-        self.room_width_EW = 23.375  # East-West (short walls)
-        self.room_length_NS = 27.42  # North-South (long walls)
-        self.room_height = 14.0
+    def __init__(self, campaign=None):
+        # Measurement campaign (YYMMDD); None uses the most recent one
+        self.campaign = campaign
+        
+        # Studio 8 definition (dimensions, positions, targets) from the space registry
+        self.space = get_space('Studio 8')
+        self.room_width_EW = self.space.dimensions['width_ew_ft']  # East-West (short walls)
+        self.room_length_NS = self.space.dimensions['length_ns_ft']  # North-South (long walls)
+        self.room_height = self.space.dimensions['height_ft']
         
         # Frequency bands for analysis (matching reference chart)
         self.frequency_bands = [125, 250, 500, 1000, 2000, 4000, 8000]
         self.frequency_labels = ['125Hz', '250Hz', '500Hz', '1kHz', '2kHz', '4kHz', '8kHz']
         
         # Measurement positions (matching Enhanced3DVisualizer)
-        self.measurement_positions = {
-            "HostA": {"coords": [self.room_width_EW/2 + 4, (self.room_length_NS/2) - 7, 5.5], "name": "Host A"},
-            "HostC": {"coords": [self.room_width_EW/2 - 4, (self.room_length_NS/2) - 7, 5.5], "name": "Host C"}, 
-            "Ceiling": {"coords": [self.room_width_EW/2, self.room_length_NS/2 + 3, 5.5], "name": "Ceiling"},
-            "SECorner": {"coords": [19.5, 2.5, 7.5], "name": "SE Corner"},
-            "MidRoom": {"coords": [self.room_width_EW/2, (self.room_length_NS/2) + 8, 5.5], "name": "Mid Room"},
-            "NECorner": {"coords": [20.5, 24.9, 11.5], "name": "NE Corner"},
-            "SWCorner": {"coords": [5.2, 3.9, 5.5], "name": "SW Corner"},
-            "NWCorner": {"coords": [5.2, 23.5, 5.5], "name": "NW Corner"}
-        }
+        self.measurement_positions = self.space.measurement_positions
+        
+        # Position x band panel effectiveness (fixed per space, reused for every panel count)
+        self.panel_effectiveness = np.array([[self.get_position_panel_effectiveness(pos_name, freq)
+                                              for freq in self.frequency_bands]
+                                             for pos_name in self.measurement_positions])
         
         # Load actual RT60 measurements from Smaart logs
         self.load_smaart_rt60_data()
     
+    @timed('load')
     def load_smaart_rt60_data(self):
         """Load actual RT60 measurements from Smaart log files"""
-        # Path to Smaart logs (relative to dashboard directory)
-        smaart_path = Path('data/raw/250715-smaartLogs/Std8')
-        
-        # Mapping from file names to our position names
-        file_to_position = {
-            'Std8-HostA-128k-Sweep.txt': 'HostA',
-            'Std8-HostC-128k-Sweep.txt': 'HostC', 
-            'Std8-Ceiling-128k-Sweep.txt': 'Ceiling',
-            'Std8-SECorner-128k-Sweep.txt': 'SECorner',
-            'Std8-MidRoom-128k-Sweep.txt': 'MidRoom',
-            'Std8-NECorner-High-128k-Sweep.txt': 'NECorner',
-            'Std8-SWCorner-128k-Sweep.txt': 'SWCorner'
-        }
-        
-        # Store actual RT60 measurements
-        self.actual_rt60_data = {}
+        # Index rows feeding each modelled position (e.g. NWCorner has no log and reuses SWCorner)
+        positions = [self.space.position_sources.get(name, name) for name in self.measurement_positions]
         
-        # Read each Smaart log file
-        for filename, position in file_to_position.items():
-            file_path = smaart_path / filename
-            if file_path.exists():
-                rt60_data = self.parse_smaart_file(file_path)
-                if rt60_data:
-                    self.actual_rt60_data[position] = rt60_data
-        
-        # Add NWCorner with estimated values (no measurement file found)
-        if 'SWCorner' in self.actual_rt60_data:
-            self.actual_rt60_data['NWCorner'] = self.actual_rt60_data['SWCorner'].copy()
-    
-    def parse_smaart_file(self, file_path):
-        """Parse Smaart log file to extract RT60 values by frequency"""
-        rt60_data = {}
+        # (position, band) RT60 matrix from the multi-campaign index (latest campaign unless one was chosen);
+        # bands that failed ingest validation or were never measured are NaN
+        self.measured_rt60 = get_measurement_index().table(self.space.name, 'RT60', positions, self.frequency_bands, self.campaign)
+        self.rt60_valid = ~np.isnan(self.measured_rt60)
         
-        try:
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
-            
-            # Find the octave band RT60 data (lines starting with "Oct")
-            for line in lines:
-                line = line.strip()
-                if line.startswith('Oct\t') and 'Hz' in line:
-                    parts = line.split('\t')
-                    if len(parts) >= 3:
-                        freq_str = parts[1].replace('Hz', '')
-                        try:
-                            # Handle kHz notation (1kHz -> 1000, 2kHz -> 2000, etc.)
-                            if 'k' in freq_str:
-                                freq = int(freq_str.replace('k', '')) * 1000
-                            else:
-                                freq = int(freq_str)
-                            rt60_value = float(parts[2])
-                            
-                            # Only store frequencies we're interested in
-                            if freq in self.frequency_bands and rt60_value > 0:
-                                rt60_data[freq] = rt60_value
-                        except ValueError:
-                            continue
-            
-            return rt60_data if rt60_data else None
-            
-        except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
-            return None
+        # Store actual RT60 measurements (valid bands only)
+        self.actual_rt60_data = {}
+        for position, row, valid in zip(self.measurement_positions, self.measured_rt60, self.rt60_valid):
+            if valid.any():
+                self.actual_rt60_data[position] = dict(zip(np.asarray(self.frequency_bands)[valid].tolist(), row[valid].tolist()))
     
-    def calculate_rt60_with_panels(self, panel_count, panel_counts=None):
-        """Calculate RT60 at each measurement position with given panel count using actual measured data
+    def calculate_rt60_matrix(self, panel_count, panel_counts=None):
+        """(position, band) RT60 array with the given panels applied to the measured data
         
         Args:
             panel_count: Total panel count (for backward compatibility)  
             panel_counts: Dict with panel types and counts, e.g. {'2_inch': 4, '11_inch': 4}
-        """
-        rt60_data = {}
         
+        Unmeasured bands stay NaN (see self.rt60_valid) rather than being filled with a default.
+        """
         # Calculate panel improvement factor based on count/type and placement
         if panel_counts is not None:
             # New mode: handle different panel types with different effectiveness
@@ -121,38 +74,18 @@ class RT60HeatmapAnalyzer:
             # Legacy mode: assume all panels are 5.5" 
             panel_improvement_factor = self.get_panel_improvement_factor(panel_count)
         
-        for pos_name, pos_data in self.measurement_positions.items():
-            rt60_freq = {}
-            
-            # Get actual measured RT60 data for this position
-            if pos_name in self.actual_rt60_data:
-                measured_data = self.actual_rt60_data[pos_name]
-                
-                for freq in self.frequency_bands:
-                    if freq in measured_data:
-                        # Start with actual measured RT60
-                        baseline_rt60 = measured_data[freq]
-                        
-                        # Apply panel improvement (panels reduce RT60)
-                        # More panels = greater reduction
-                        panel_reduction = panel_improvement_factor * self.get_position_panel_effectiveness(pos_name, freq)
-                        
-                        # Calculate improved RT60 (never go below 0.15s minimum)
-                        improved_rt60 = baseline_rt60 * (1.0 - panel_reduction)
-                        improved_rt60 = max(improved_rt60, 0.15)
-                        
-                        rt60_freq[freq] = improved_rt60
-                    else:
-                        # Fallback for missing frequency data
-                        rt60_freq[freq] = 0.5  # Reasonable default
-            else:
-                # Fallback for missing position data
-                for freq in self.frequency_bands:
-                    rt60_freq[freq] = 0.6  # Reasonable default
-            
-            rt60_data[pos_name] = rt60_freq
+        # Panels reduce the measured RT60 (more panels = greater reduction), never below 0.15s
+        panel_reduction = panel_improvement_factor * self.panel_effectiveness
+        return np.maximum(self.measured_rt60 * (1.0 - panel_reduction), 0.15)
+    
+    def calculate_rt60_with_panels(self, panel_count, panel_counts=None):
+        """Calculate RT60 at each measurement position with given panel count using actual measured data
         
-        return rt60_data
+        Returns {position: {frequency: RT60}} built from calculate_rt60_matrix().
+        """
+        rt60 = self.calculate_rt60_matrix(panel_count, panel_counts)
+        return {pos_name: dict(zip(self.frequency_bands, row.tolist()))
+                for pos_name, row in zip(self.measurement_positions, rt60)}
     
     def get_panel_improvement_factor(self, panel_count):
         """Calculate overall improvement factor based on panel count"""
@@ -223,6 +156,8 @@ class RT60HeatmapAnalyzer:
         
         return base_effectiveness.get(position_name, 1.0) * freq_factor
     
+    @timed('figure')
+    @cached_figure('rt60_heatmap', space=lambda self: (self.space.name, self.campaign))
     def create_rt60_heatmap(self, panel_count=25):
         """Create RT60 heatmap visualization using actual measurement data"""
         
@@ -250,7 +185,7 @@ class RT60HeatmapAnalyzer:
                 hover_info = (
                     f"<b>{pos_info['name']}</b><br>"
                     f"Frequency: {frequencies[freq_idx]}<br>"
-                    f"RT60: {rt60_value:.2f}s<br>"
+                    f"RT60: {f'{rt60_value:.2f}s' if not np.isnan(rt60_value) else 'not measured'}<br>"
                     f"Position: ({pos_info['coords'][0]:.1f}', {pos_info['coords'][1]:.1f}', {pos_info['coords'][2]:.1f}')<br>"
                     f"Panels: {panel_count}"
                 )
@@ -318,14 +253,13 @@ class RT60HeatmapAnalyzer:
         
         return fig
     
+    @timed('render')
     def render_rt60_summary(self, panel_count):
         """Render condensed RT60 analysis summary"""
-        rt60_data = self.calculate_rt60_with_panels(panel_count)
+        rt60 = self.calculate_rt60_matrix(panel_count)
         
-        # Calculate key statistics
-        all_values = []
-        for pos_data in rt60_data.values():
-            all_values.extend(pos_data.values())
+        # Calculate key statistics over the measured bands
+        all_values = rt60[self.rt60_valid]
         
         avg_rt60 = np.mean(all_values)
         min_rt60 = np.min(all_values)
@@ -333,8 +267,8 @@ class RT60HeatmapAnalyzer:
         std_rt60 = np.std(all_values)
         
         # Target range analysis - broadcast standards
-        target_min, target_max = 0.3, 0.5
-        in_target = sum(1 for val in all_values if target_min <= val <= target_max)
+        target_min, target_max = self.space.targets['rt60_range']
+        in_target = np.count_nonzero((all_values >= target_min) & (all_values <= target_max))
         target_percentage = (in_target / len(all_values)) * 100
         
         # Metrics aligned with heatmap cells (accounting for y-axis labels)
@@ -382,10 +316,5 @@ if __name__ == "__main__":
     print()
     print("Testing panel count effects:")
     for panels in [0, 10, 25, 32]:
-        rt60_data = analyzer.calculate_rt60_with_panels(panels)
-        all_values = []
-        for pos_data in rt60_data.values():
-            all_values.extend(pos_data.values())
-        
-        avg_rt60 = np.mean(all_values)
+        avg_rt60 = np.mean(analyzer.calculate_rt60_matrix(panels)[analyzer.rt60_valid])
         print(f"  {panels:2d} panels → {avg_rt60:.2f}s average (realistic range)")
\ No newline at end of file
@@ -7,142 +7,80 @@ Based on the Studio 8 analyzer but adapted for The Hub's unique geometry and mea
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import streamlit as st
-from pathlib import Path
+
+from measurement_index import get_measurement_index
+from figure_cache import cached_figure
+from render_timing import timed
+from space_registry import get_space
 
 class RT60HeatmapAnalyzerHub:
-    def __init__(self):
-        # The Hub dimensions (converted from inches to feet based on actual measurements)
-        self.room_ceiling_height = 106 / 12.0  # 106" = 8.83 feet to hung ceiling
-        self.room_grid_height = 101 / 12.0     # 101" = 8.42 feet to grid
+    def __init__(self, campaign=None):
+        # Measurement campaign (YYMMDD); None uses the most recent one
+        self.campaign = campaign
+        
+        # The Hub definition (dimensions, positions, targets) from the space registry
+        self.space = get_space('The Hub')
+        self.room_ceiling_height = self.space.dimensions['ceiling_height_ft']  # 106" to hung ceiling
+        self.room_grid_height = self.space.dimensions['grid_height_ft']        # 101" to grid
         
         # The Hub is an irregular hexagon - approximate dimensions for visualization
-        self.room_width_approx = 190 / 12.0    # ~15.83 feet (widest point)
-        self.room_length_approx = 150 / 12.0   # ~12.5 feet (longest dimension)
+        self.room_width_approx = self.space.dimensions['width_ft']    # ~15.83 feet (widest point)
+        self.room_length_approx = self.space.dimensions['length_ft']  # ~12.5 feet (longest dimension)
         
         # Frequency bands for analysis (matching reference chart)
         self.frequency_bands = [125, 250, 500, 1000, 2000, 4000, 8000]
         self.frequency_labels = ['125Hz', '250Hz', '500Hz', '1kHz', '2kHz', '4kHz', '8kHz']
         
-        # Measurement positions for The Hub (based on available data files)
-        # Coordinates are approximate relative positions within the hexagonal space
-        self.measurement_positions = {
-            "MidRoom": {"coords": [0, 0, 6], "name": "Mid Room"},
-            "BackCorner": {"coords": [-6, -2, 6], "name": "Back Corner"},
-            "Chair1": {"coords": [-4.5, 0.5, 4], "name": "Chair 1"},
-            "Chair2": {"coords": [-3.5, 1.5, 4], "name": "Chair 2"},
-            "CeilingCorner": {"coords": [5, 1, 10], "name": "Ceiling Corner"}
-        }
+        # Measurement positions for The Hub (approximate relative positions within the hexagonal space)
+        self.measurement_positions = self.space.measurement_positions
+        
+        # Position x band panel effectiveness (fixed per space, reused for every panel count)
+        self.panel_effectiveness = np.array([[self.get_position_panel_effectiveness(pos_name, freq)
+                                              for freq in self.frequency_bands]
+                                             for pos_name in self.measurement_positions])
         
         # Load actual RT60 measurements from Smaart logs
         self.load_smaart_rt60_data()
     
+    @timed('load')
     def load_smaart_rt60_data(self):
         """Load actual RT60 measurements from The Hub Smaart log files"""
-        # Path to The Hub logs
-        smaart_path = Path('data/raw/250715-smaartLogs/TheHub')
-        
-        # Mapping from file names to our position names
-        file_to_position = {
-            'TheHub-MidRoom-64k.txt': 'MidRoom',
-            'TheHub-BackCorner-64k.txt': 'BackCorner',
-            'TheHub-Chair1-64k.txt': 'Chair1',
-            'TheHub-Chair2-64k.txt': 'Chair2',
-            'TheHub-CeilingCorner-64k.txt': 'CeilingCorner'
-        }
+        # (position, band) RT60 matrix from the multi-campaign index (latest campaign unless one was chosen);
+        # bands that failed ingest validation or were never measured are NaN
+        self.measured_rt60 = get_measurement_index().table(self.space.name, 'RT60', list(self.measurement_positions),
+                                                           self.frequency_bands, self.campaign)
+        self.rt60_valid = ~np.isnan(self.measured_rt60)
         
-        # Store actual RT60 measurements
+        # Store actual RT60 measurements (valid bands only)
         self.actual_rt60_data = {}
-        
-        # Read each Smaart log file
-        for filename, position in file_to_position.items():
-            file_path = smaart_path / filename
-            if file_path.exists():
-                rt60_data = self.parse_smaart_file(file_path)
-                if rt60_data:
-                    self.actual_rt60_data[position] = rt60_data
-                    print(f"✅ Loaded {position}: {len(rt60_data)} frequency bands")
-                else:
-                    print(f"⚠️  Failed to parse {filename}")
+        for position, row, valid in zip(self.measurement_positions, self.measured_rt60, self.rt60_valid):
+            if valid.any():
+                self.actual_rt60_data[position] = dict(zip(np.asarray(self.frequency_bands)[valid].tolist(), row[valid].tolist()))
+                print(f"✅ Loaded {position}: {int(valid.sum())} frequency bands")
             else:
-                print(f"❌ File not found: {filename}")
+                print(f"❌ No valid measurements for {position}")
     
-    def parse_smaart_file(self, file_path):
-        """Parse Smaart log file to extract RT60 values by frequency"""
-        rt60_data = {}
-        
-        try:
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
-            
-            # Find the octave band RT60 data (lines starting with "Oct")
-            for line in lines:
-                line = line.strip()
-                if line.startswith('Oct\t') and 'Hz' in line:
-                    parts = line.split('\t')
-                    if len(parts) >= 3:
-                        freq_str = parts[1].replace('Hz', '')
-                        try:
-                            # Handle kHz notation (1kHz -> 1000, 2kHz -> 2000, etc.)
-                            if 'k' in freq_str:
-                                freq = int(freq_str.replace('k', '')) * 1000
-                            else:
-                                freq = int(freq_str)
-                            rt60_value = float(parts[2])
-                            
-                            # Only store frequencies we're interested in
-                            if freq in self.frequency_bands and rt60_value > 0:
-                                rt60_data[freq] = rt60_value
-                        except ValueError:
-                            continue
-            
-            return rt60_data if rt60_data else None
-            
-        except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
-            return None
-    
-    def calculate_rt60_with_panels(self, panel_count):
-        """Calculate RT60 at each measurement position with given panel count using actual measured data"""
-        rt60_data = {}
+    def calculate_rt60_matrix(self, panel_count):
+        """(position, band) RT60 array with the given panels applied to the measured data
         
+        Unmeasured bands stay NaN (see self.rt60_valid) rather than being filled with a default.
+        """
         # Calculate panel improvement factor based on count and placement
         panel_improvement_factor = self.get_panel_improvement_factor(panel_count)
         
-        for pos_name, pos_data in self.measurement_positions.items():
-            rt60_freq = {}
-            
-            # Get actual measured RT60 data for this position
-            if pos_name in self.actual_rt60_data:
-                measured_data = self.actual_rt60_data[pos_name]
-                
-                for freq in self.frequency_bands:
-                    if freq in measured_data:
-                        # Start with actual measured RT60
-                        baseline_rt60 = measured_data[freq]
-                        
-                        # Apply panel improvement (panels reduce RT60)
-                        # More panels = greater reduction
-                        panel_reduction = panel_improvement_factor * self.get_position_panel_effectiveness(pos_name, freq)
-                        
-                        # Calculate improved RT60 (never go below 0.15s minimum)
-                        improved_rt60 = baseline_rt60 * (1.0 - panel_reduction)
-                        improved_rt60 = max(improved_rt60, 0.15)
-                        
-                        rt60_freq[freq] = improved_rt60
-                    else:
-                        # Fallback for missing frequency data
-                        rt60_freq[freq] = 0.5  # Reasonable default
-            else:
-                # Fallback for missing position data
-                for freq in self.frequency_bands:
-                    rt60_freq[freq] = 0.6  # Reasonable default
-            
-            rt60_data[pos_name] = rt60_freq
+        # Panels reduce the measured RT60 (more panels = greater reduction), never below 0.15s
+        panel_reduction = panel_improvement_factor * self.panel_effectiveness
+        return np.maximum(self.measured_rt60 * (1.0 - panel_reduction), 0.15)
+    
+    def calculate_rt60_with_panels(self, panel_count):
+        """Calculate RT60 at each measurement position with given panel count using actual measured data
         
-        return rt60_data
+        Returns {position: {frequency: RT60}} built from calculate_rt60_matrix().
+        """
+        rt60 = self.calculate_rt60_matrix(panel_count)
+        return {pos_name: dict(zip(self.frequency_bands, row.tolist()))
+                for pos_name, row in zip(self.measurement_positions, rt60)}
     
     def get_panel_improvement_factor(self, panel_count):
         """Calculate overall improvement factor based on panel count for The Hub"""
@@ -185,6 +123,8 @@ class RT60HeatmapAnalyzerHub:
         
         return base_effectiveness.get(position_name, 1.0) * freq_factor
     
+    @timed('figure')
+    @cached_figure('rt60_heatmap', space=lambda self: (self.space.name, self.campaign))
     def create_rt60_heatmap(self, panel_count=8):
         """Create RT60 heatmap visualization using actual Hub measurement data"""
         
@@ -212,7 +152,7 @@ class RT60HeatmapAnalyzerHub:
                 hover_info = (
                     f"<b>{pos_info['name']}</b><br>"
                     f"Frequency: {frequencies[freq_idx]}<br>"
-                    f"RT60: {rt60_value:.2f}s<br>"
+                    f"RT60: {f'{rt60_value:.2f}s' if not np.isnan(rt60_value) else 'not measured'}<br>"
                     f"Position: ({pos_info['coords'][0]:.1f}', {pos_info['coords'][1]:.1f}', {pos_info['coords'][2]:.1f}')<br>"
                     f"Panels: {panel_count}"
                 )
@@ -280,14 +220,13 @@ class RT60HeatmapAnalyzerHub:
         
         return fig
     
+    @timed('render')
     def render_rt60_summary(self, panel_count):
         """Render condensed RT60 analysis summary for The Hub"""
-        rt60_data = self.calculate_rt60_with_panels(panel_count)
+        rt60 = self.calculate_rt60_matrix(panel_count)
         
-        # Calculate key statistics
-        all_values = []
-        for pos_data in rt60_data.values():
-            all_values.extend(pos_data.values())
+        # Calculate key statistics over the measured bands
+        all_values = rt60[self.rt60_valid]
         
         avg_rt60 = np.mean(all_values)
         min_rt60 = np.min(all_values)
@@ -295,8 +234,8 @@ class RT60HeatmapAnalyzerHub:
         std_rt60 = np.std(all_values)
         
         # Target range analysis - broadcast standards
-        target_min, target_max = 0.3, 0.5
-        in_target = sum(1 for val in all_values if target_min <= val <= target_max)
+        target_min, target_max = self.space.targets['rt60_range']
+        in_target = np.count_nonzero((all_values >= target_min) & (all_values <= target_max))
         target_percentage = (in_target / len(all_values)) * 100
         
         # Metrics aligned with heatmap cells (accounting for y-axis labels)
@@ -325,6 +264,7 @@ class RT60HeatmapAnalyzerHub:
         else:
             st.caption("🟡 Good progress - approaching green zones")
 
+    @timed('figure')
     def create_hub_3d_heatmap_overlay(self, panel_count=8):
         """Create 3D visualization of The Hub with RT60 heatmap overlay"""
         from enhanced_3d_visualizer import Enhanced3DVisualizer
@@ -334,13 +274,13 @@ class RT60HeatmapAnalyzerHub:
         fig = visualizer.create_hub_detailed_model(show_panels=True, panel_count=panel_count)
         
         # Get RT60 data for overlay
-        rt60_data = self.calculate_rt60_with_panels(panel_count)
+        rt60 = self.calculate_rt60_matrix(panel_count)
         
         # Add RT60 measurement overlays at each position
-        for pos_name, pos_info in self.measurement_positions.items():
-            if pos_name in rt60_data:
-                # Calculate average RT60 across frequencies for color coding
-                avg_rt60 = np.mean(list(rt60_data[pos_name].values()))
+        for (pos_name, pos_info), row, valid in zip(self.measurement_positions.items(), rt60, self.rt60_valid):
+            if valid.any():
+                # Calculate average RT60 across measured frequencies for color coding
+                avg_rt60 = np.mean(row[valid])
                 
                 # Color code based on RT60 value
                 if avg_rt60 <= 0.35:
@@ -400,12 +340,7 @@ if __name__ == "__main__":
     print()
     print("Testing panel count effects for The Hub:")
     for panels in [0, 5, 10, 16]:
-        rt60_data = analyzer.calculate_rt60_with_panels(panels)
-        all_values = []
-        for pos_data in rt60_data.values():
-            all_values.extend(pos_data.values())
-        
-        avg_rt60 = np.mean(all_values)
+        avg_rt60 = np.mean(analyzer.calculate_rt60_matrix(panels)[analyzer.rt60_valid])
         print(f"  {panels:2d} panels → {avg_rt60:.2f}s average (realistic range for Hub)")
 
     print()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Scoped Cache
+Process-wide computation cache with named namespaces, keyed on the version of the datasets each result was built from
+"""
+
+import functools
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+def dataset_version(*paths):
+    """Short hash of the given files' sizes and mtimes
+
+    A generated dataset may exist as its CSV, its .npz bundle or both, so both
+    are included for CSV paths. Missing files hash as missing; a dataset that
+    appears later gets a new version.
+    """
+    stats = []
+    for path in paths:
+        path = Path(path)
+        for candidate in ([path, path.with_suffix('.npz')] if path.suffix == '.csv' else [path]):
+            try:
+                stat = candidate.stat()
+                stats.append([str(candidate), stat.st_size, stat.st_mtime_ns])
+            except OSError:
+                stats.append([str(candidate), None, None])
+    return hashlib.sha1(json.dumps(stats).encode()).hexdigest()[:16]
+
+
+class ScopedCache:
+    """Results grouped by namespace (e.g. 'freq_explorer', 'data_explorer')
+
+    Each entry remembers the dataset paths it was built from, so invalidation
+    can target one namespace, one dataset, or both. Namespaces hold at most
+    max_entries results and drop the least recently used first.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._namespaces = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key):
+        """(True, value) on a hit, (False, None) on a miss"""
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            if entries is None or key not in entries:
+                return False, None
+            entries.move_to_end(key)
+            return True, entries[key][0]
+
+    def put(self, namespace, key, value, datasets=()):
+        with self._lock:
+            entries = self._namespaces.setdefault(namespace, OrderedDict())
+            entries[key] = (value, frozenset(str(Path(path)) for path in datasets))
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def invalidate(self, namespace=None, dataset=None):
+        """Drop entries of a namespace, entries built from a dataset, or both; returns the number dropped
+
+        With neither argument every namespace is cleared.
+        """
+        dataset = str(Path(dataset)) if dataset is not None else None
+        dropped = 0
+        with self._lock:
+            for name, entries in self._namespaces.items():
+                if namespace is not None and name != namespace:
+                    continue
+                stale = [key for key, (_, sources) in entries.items() if dataset is None or dataset in sources]
+                for key in stale:
+                    del entries[key]
+                dropped += len(stale)
+        return dropped
+
+    def stats(self):
+        """Entry count per namespace"""
+        with self._lock:
+            return {name: len(entries) for name, entries in self._namespaces.items()}
+
+
+# Process-wide cache shared by every Streamlit session
+_cache = ScopedCache()
+
+
+def cached(namespace, datasets=None):
+    """Decorator caching a function's results in a namespace of the shared cache
+
+    datasets is called with the function's arguments and returns the files the
+    result depends on; their current version is part of the cache key, so an
+    edited or regenerated dataset is a cache miss without any explicit clear.
+    Cached values are shared between sessions and must not be modified.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            sources = [str(path) for path in datasets(*args, **kwargs)] if datasets else []
+            key = (func.__qualname__, repr(args), repr(sorted(kwargs.items())), dataset_version(*sources))
+            hit, value = _cache.get(namespace, key)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            _cache.put(namespace, key, value, sources)
+            return value
+        return wrapper
+    return decorator
+
+
+def invalidate(namespace=None, dataset=None):
+    """Drop cached results for a namespace and/or a dataset path (see ScopedCache.invalidate)"""
+    return _cache.invalidate(namespace, dataset)
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        print(f"{sys.argv[1]}: {dataset_version(*sys.argv[1:])}")
+    else:
+        print("Usage: python scoped_cache.py <dataset.csv> [...]  (prints the dataset version hash)")
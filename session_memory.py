@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Session Memory
+Per-session figure cache with size accounting and a process-wide byte budget, evicting least recently used figures
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+MAX_BYTES = int(float(os.environ.get('CBC_SESSION_MEMORY_MB', '64')) * 1024 * 1024)
+MAX_IDLE_S = float(os.environ.get('CBC_SESSION_IDLE_MINUTES', '60')) * 60  # Closed tabs never say goodbye
+
+
+def estimate_bytes(obj, _seen=None):
+    """Approximate memory held by obj and everything it references (shared objects counted once)
+
+    Plotly figures are measured through their plotly JSON dict; numpy arrays
+    count their buffers.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if hasattr(obj, 'to_plotly_json'):
+        return sys.getsizeof(obj) + estimate_bytes(obj.to_plotly_json(), seen)
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_bytes(key, seen) + estimate_bytes(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_bytes(item, seen) for item in obj)
+    return size
+
+
+class SessionFigureCache:
+    """Figures each session keeps between reruns, keyed by (session id, name)
+
+    Names say exactly which figure an entry is, e.g. (space, view, panel_count),
+    so an entry is valid for as long as it is kept and never depends on
+    other session state.
+
+    Figures shared with the process-wide figure store cost nothing extra, so
+    only figures held by sessions alone (built without a store, or left over
+    after the data changed) count towards max_bytes; beyond it the least
+    recently used of those are dropped and the session looks its figure up
+    again. A figure held by several sessions is counted once. Entries unused
+    for max_idle_s are dropped whatever their size.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, is_shared=None, max_idle_s=MAX_IDLE_S):
+        self.max_bytes = max_bytes
+        self.max_idle_s = max_idle_s
+        self.is_shared = is_shared or (lambda figure: False)
+        self.evictions = 0
+        self._entries = OrderedDict()  # (session, name) -> {'figure', 'bytes', 'last_used'}, least recent first
+        self._lock = threading.Lock()
+
+    def get(self, session, name):
+        """The session's figure, or None if it has none or it was evicted"""
+        with self._lock:
+            entry = self._entries.get((session, name))
+            if entry is None:
+                return None
+            entry['last_used'] = time.time()
+            self._entries.move_to_end((session, name))
+            return entry['figure']
+
+    def put(self, session, name, figure):
+        with self._lock:
+            known = next((entry['bytes'] for entry in self._entries.values() if entry['figure'] is figure), None)
+        size = known if known is not None else estimate_bytes(figure)
+        with self._lock:
+            self._entries[(session, name)] = {'figure': figure, 'bytes': size, 'last_used': time.time()}
+            self._entries.move_to_end((session, name))
+            self._evict()
+
+    def drop(self, session, name=None):
+        """Forget one of the session's figures, or all of them"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == session and name in (None, key[1])]:
+                del self._entries[key]
+
+    def clear(self):
+        """Forget every session's figures"""
+        with self._lock:
+            self._entries.clear()
+
+    def _exclusive(self):
+        """{id(figure): bytes} of distinct figures that only sessions hold"""
+        return {id(entry['figure']): entry['bytes'] for entry in self._entries.values()
+                if not self.is_shared(entry['figure'])}
+
+    def _evict(self):
+        idle_before = time.time() - self.max_idle_s
+        while self._entries and next(iter(self._entries.values()))['last_used'] < idle_before:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        exclusive = self._exclusive()
+        total = sum(exclusive.values())
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            figure = self._entries[key]['figure']
+            if id(figure) not in exclusive:
+                continue
+            del self._entries[key]
+            self.evictions += 1
+            # Other sessions may still hold the same figure
+            if not any(entry['figure'] is figure for entry in self._entries.values()):
+                total -= exclusive.pop(id(figure))
+
+    def stats(self):
+        with self._lock:
+            exclusive = self._exclusive()
+            distinct = {id(entry['figure']): entry['bytes'] for entry in self._entries.values()}
+            return {'sessions': len({session for session, _ in self._entries}), 'entries': len(self._entries),
+                    'bytes': sum(distinct.values()), 'exclusive_bytes': sum(exclusive.values()),
+                    'max_bytes': self.max_bytes, 'evictions': self.evictions}
+
+    def sessions(self):
+        """[{'session', 'figures', 'bytes', 'exclusive_bytes', 'idle_s'}] per session, most recently active first"""
+        now = time.time()
+        rows = {}
+        with self._lock:
+            for (session, name), entry in self._entries.items():
+                row = rows.setdefault(session, {'session': session, 'figures': [], 'bytes': 0,
+                                                'exclusive_bytes': 0, 'idle_s': None})
+                row['figures'].append(figure_name(name))
+                row['bytes'] += entry['bytes']
+                if not self.is_shared(entry['figure']):
+                    row['exclusive_bytes'] += entry['bytes']
+                row['idle_s'] = round(now - entry['last_used'], 1)  # Entries are in use order, so the last one wins
+        return sorted(rows.values(), key=lambda row: row['idle_s'])
+
+
+def figure_name(name):
+    """Display form of a figure name: 'The Hub/3d_model/25' for ('The Hub', '3d_model', 25)"""
+    return '/'.join(str(part) for part in name) if isinstance(name, tuple) else str(name)
+
+
+def _in_figure_store(figure):
+    from figure_warmup import current_figure_store
+    store = current_figure_store()
+    return store is not None and store.holds(figure)
+
+
+_cache = SessionFigureCache(is_shared=_in_figure_store)
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except ImportError:
+        return None
+    return ctx.session_id if ctx else None
+
+
+def session_figure(name):
+    """This session's figure called name, or None (not stored yet, or evicted under the memory budget)
+
+    Use a name that identifies the figure completely, e.g. (space, view, panel_count).
+    """
+    return _cache.get(_session_id(), name)
+
+
+def keep_session_figure(name, figure):
+    """Keep figure for this session's later reruns"""
+    _cache.put(_session_id(), name, figure)
+
+
+def drop_session_figures(name=None):
+    """Forget this session's figure called name, or all of its figures"""
+    _cache.drop(_session_id(), name)
+
+
+def clear_session_figures():
+    """Forget the figures of every session (benchmarks reset between cases)"""
+    _cache.clear()
+
+
+def session_memory_stats():
+    return _cache.stats()
+
+
+def session_state_sizes():
+    """{key: estimated bytes} of this session's st.session_state, largest first"""
+    sizes = {key: estimate_bytes(value) for key, value in st.session_state.to_dict().items()}
+    return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+
+def render_memory_panel():
+    """Collapsible sidebar panel with session memory accounting (call at the end of the script)"""
+    import pandas as pd
+
+    stats = session_memory_stats()
+    this_session = _session_id()
+    with st.sidebar.expander("🧠 Session Memory", expanded=False):
+        st.caption(f"{stats['entries']} figures kept by {stats['sessions']} session(s): "
+                   f"{stats['bytes'] / 1024 / 1024:.1f} MB, of which {stats['exclusive_bytes'] / 1024 / 1024:.1f} MB "
+                   f"not shared (budget {stats['max_bytes'] / 1024 / 1024:.0f} MB, {stats['evictions']} evicted)")
+        sessions = _cache.sessions()
+        if sessions:
+            st.dataframe(pd.DataFrame([{
+                'session': str(row['session'])[:8] + (' (this)' if row['session'] == this_session else ''),
+                'figures': ', '.join(row['figures']),
+                'KB': round(row['bytes'] / 1024, 1),
+                'unshared KB': round(row['exclusive_bytes'] / 1024, 1),
+                'idle s': row['idle_s'],
+            } for row in sessions]), hide_index=True, use_container_width=True)
+        st.caption("This session's state")
+        st.dataframe(pd.DataFrame([{'key': key, 'KB': round(size / 1024, 1)}
+                                   for key, size in session_state_sizes().items()]),
+                     hide_index=True, use_container_width=True)
+
+
+if __name__ == "__main__":
+    import plotly.graph_objects as go
+
+    # Without a figure store every figure counts; the budget fits four, so the least recently used go
+    # (the figure sessions a and b share is only freed once both of their entries are dropped)
+    demo = SessionFigureCache(max_bytes=200_000)
+    shared = go.Figure(go.Scatter(x=np.arange(1000), y=np.random.rand(1000)))
+    demo.put('session-a', '3d_model', shared)
+    demo.put('session-b', '3d_model', shared)
+    for index in range(5):
+        demo.put('session-c', f'figure_{index}', go.Figure(go.Scatter(y=np.random.rand(2000))))
+    print(demo.stats())
+    for row in demo.sessions():
+        print(row)
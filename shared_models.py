@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Shared Model Layer
+Dashboard components built once per server process and shared read-only by every Streamlit session
+"""
+
+import hashlib
+import json
+import threading
+
+from columnar_store import GENERATED_DIR
+from ingest_campaign import RAW_DIR, discover_logs
+import space_registry
+from space_registry import get_space
+from startup_profile import import_component
+
+
+def data_fingerprint(raw_dir=RAW_DIR, generated_dir=GENERATED_DIR, spaces_dir=space_registry.SPACES_DIR):
+    """Short hash of every input the models are built from (Smaart logs, generated datasets, space files)
+
+    Only paths, sizes and mtimes are read. Columnar bundles are derived from
+    their CSVs (and written on first load), so a bundle only counts when it is
+    the dataset's sole copy. Compute this once per run; SharedModels hands it
+    to the components it builds for cached_figure keys.
+    """
+    files = list(discover_logs(raw_dir))
+    for directory, pattern in ((generated_dir, '*.csv'), (spaces_dir, '*.json')):
+        if directory.exists():
+            files.extend(sorted(directory.glob(pattern)))
+    if generated_dir.exists():
+        files.extend(path for path in sorted(generated_dir.glob('*.npz'))
+                     if not path.name.startswith('.') and not path.with_suffix('.csv').exists())
+
+    stats = []
+    for path in files:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # Removed while we were listing; the next check sees the new state
+        stats.append([str(path), stat.st_size, stat.st_mtime_ns])
+    return hashlib.sha1(json.dumps(stats).encode()).hexdigest()[:16]
+
+
+class SharedModels:
+    """Components for one data fingerprint
+
+    Components (and their modules) are only built when a page first asks for
+    them. The 3D visualizer is space-independent. The frequency explorer,
+    treatment simulator and RT60 analyzer hold per-space data, so one instance
+    of each is built per space and never switched to another space afterwards.
+    Sessions must treat them as read-only.
+    """
+
+    def __init__(self, fingerprint):
+        self.fingerprint = fingerprint
+        self._components = {}
+        self._lock = threading.Lock()
+
+    def _component(self, kind, space, build):
+        key = (kind, get_space(space).name if space is not None else None)
+        with self._lock:
+            if key not in self._components:
+                component = build(key[1])
+                if component is not None:
+                    # cached_figure keys this component's figures by the data it was built from
+                    component.data_fingerprint = self.fingerprint
+                self._components[key] = component
+            return self._components[key]
+
+    def visualizer_3d(self, space=None):
+        return self._component('visualizer_3d', None,
+                               lambda _: import_component('enhanced_3d_visualizer').Enhanced3DVisualizer())
+
+    def freq_explorer(self, space):
+        return self._component('freq_explorer', space,
+                               import_component('frequency_response_explorer').FrequencyResponseExplorer)
+
+    def treatment_sim(self, space):
+        return self._component('treatment_sim', space, import_component('treatment_simulator').TreatmentSimulator)
+
+    def rt60_analyzer(self, space):
+        """RT60 heatmap analyzer named in the space registry (None if the space has none)"""
+        return self._component('rt60_analyzer', space, lambda name: get_space(name).load_component('rt60_analyzer'))
+
+
+_models = None
+_models_lock = threading.Lock()
+
+
+def get_shared_models():
+    """Return the process-wide SharedModels, rebuilding them when the data fingerprint changes"""
+    global _models
+    fingerprint = data_fingerprint()
+    with _models_lock:
+        if _models is None or _models.fingerprint != fingerprint:
+            if _models is not None:
+                # Space files may have changed too; reparse them for the new models
+                space_registry.reload_registry()
+            _models = SharedModels(fingerprint)
+        return _models
+
+
+if __name__ == "__main__":
+    import time
+
+    for attempt in ("cold", "warm"):
+        start = time.perf_counter()
+        models = get_shared_models()
+        models.visualizer_3d()
+        for name in space_registry.space_names():
+            models.freq_explorer(name)
+            models.treatment_sim(name)
+            models.rt60_analyzer(name)
+        print(f"{attempt}: {(time.perf_counter() - start) * 1000:.1f} ms (fingerprint {models.fingerprint})")
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Shared Smaart Log Parser
+Reads a Smaart room-acoustics log export once into typed NumPy arrays
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Header metrics in the order they appear in Smaart exports
+HEADER_FIELDS = ('alcons_s', 'alcons_l', 'bass_ratio', 't_low', 't_mid', 'cis')
+HEADER_LABELS = {
+    '%Alcons (S)': 'alcons_s',
+    '%Alcons (L)': 'alcons_l',
+    'Bass Ratio': 'bass_ratio',
+    'T Low': 't_low',
+    'T Mid': 't_mid',
+    'CIS': 'cis'
+}
+
+# Speech intelligibility rows (first column is the overall value, then per band)
+STI_ROWS = ('STI', 'STIPA(IR)')
+STI_BAND_LABELS = ('125Hz', '250Hz', '500Hz', '1kHz', '2kHz', '4kHz', '8kHz')
+
+# Decay/clarity metrics in column order of the Filter table
+METRICS = ('RT60', 'EDT', 'D/R', 'C10', 'C35', 'C50', 'C80')
+
+# Decay times must be positive; D/R and clarity values may legitimately be zero or negative
+DECAY_METRICS = ('RT60', 'EDT')
+
+
+class SmaartParseError(ValueError):
+    """Raised when a file does not look like a Smaart log export"""
+
+
+def band_validity(values):
+    """Validity mask for a (bands x METRICS) table, computed for the whole table at once
+
+    A value is invalid when it is not finite, when its band is empty (Smaart
+    writes a row of 0.00 for bands below the analysis range, e.g. 16/32 Hz
+    octaves) or when it is a non-positive decay time.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.isfinite(values)
+    valid &= ~(values == 0).all(axis=1, keepdims=True)
+    decay = [METRICS.index(name) for name in DECAY_METRICS]
+    valid[:, decay] &= values[:, decay] > 0
+    return valid
+
+
+def parse_band_label(label):
+    """Convert a Smaart band label ('63Hz', '1.3kHz', '12.5kHz') to Hz"""
+    label = label.strip()
+    if label.endswith('kHz'):
+        return float(label[:-3]) * 1000.0
+    if label.endswith('Hz'):
+        return float(label[:-2])
+    return float(label)
+
+
+def band_label(frequency):
+    """Format a frequency in Hz the way Smaart labels bands"""
+    if frequency >= 1000:
+        return f"{frequency / 1000:g}kHz"
+    return f"{frequency:g}Hz"
+
+
+class SmaartLog:
+    """Columnar view of one Smaart log export
+
+    Attributes:
+        path: Source file path
+        date: Raw 'Date' header string (empty if missing)
+        header: float64 array ordered as HEADER_FIELDS (NaN when absent)
+        sti: float64 array (len(STI_ROWS), 1 + len(STI_BAND_LABELS)); column 0 is the overall value
+        broadband: float64 array of METRICS for the unfiltered row
+        octave_labels / octave_freqs / octave: octave band labels, centre Hz, values (bands x METRICS)
+        third_octave_labels / third_octave_freqs / third_octave: same for 1/3-octave bands
+    """
+
+    def __init__(self, path, date, header, sti, broadband,
+                 octave_labels, octave_freqs, octave,
+                 third_octave_labels, third_octave_freqs, third_octave):
+        self.path = Path(path)
+        self.date = date
+        self.header = header
+        self.sti = sti
+        self.broadband = broadband
+        self.octave_labels = octave_labels
+        self.octave_freqs = octave_freqs
+        self.octave = octave
+        self.third_octave_labels = third_octave_labels
+        self.third_octave_freqs = third_octave_freqs
+        self.third_octave = third_octave
+
+    def header_value(self, name, default=None):
+        """Return a header metric by field name, or default when it is missing"""
+        value = self.header[HEADER_FIELDS.index(name)]
+        return default if np.isnan(value) else float(value)
+
+    def header_dict(self):
+        """Header metrics as a plain dict (missing fields omitted)"""
+        return {name: float(value) for name, value in zip(HEADER_FIELDS, self.header) if not np.isnan(value)}
+
+    def sti_bands(self, row='STI'):
+        """Per-band STI (or STIPA) values, excluding the overall value"""
+        return self.sti[STI_ROWS.index(row), 1:]
+
+    def overall_sti(self, row='STI'):
+        """Overall STI (or STIPA) value"""
+        return float(self.sti[STI_ROWS.index(row), 0])
+
+    def bands(self, resolution='octave'):
+        """Return (labels, freqs, values) for 'octave' or 'third_octave' resolution"""
+        if resolution == 'octave':
+            return self.octave_labels, self.octave_freqs, self.octave
+        if resolution == 'third_octave':
+            return self.third_octave_labels, self.third_octave_freqs, self.third_octave
+        raise ValueError(f"Unknown band resolution: {resolution}")
+
+    def validity(self, resolution='octave'):
+        """band_validity() mask of the octave or 1/3-octave table"""
+        return band_validity(self.bands(resolution)[2])
+
+    def metric(self, name, resolution='octave'):
+        """Column of one metric (e.g. 'RT60', 'C50') across all bands"""
+        return self.bands(resolution)[2][:, METRICS.index(name)]
+
+    def metric_by_frequency(self, name, frequencies=None, resolution='octave', positive_only=True):
+        """Map centre frequency (Hz, int where whole) to a metric value
+
+        Args:
+            name: Metric name from METRICS
+            frequencies: Optional iterable of frequencies to keep
+            resolution: 'octave' or 'third_octave'
+            positive_only: Drop zeroed/negative values (Smaart writes 0.00 for empty bands)
+        """
+        _, freqs, _ = self.bands(resolution)
+        values = self.metric(name, resolution)
+        keep = np.ones(len(freqs), dtype=bool)
+        if frequencies is not None:
+            keep &= np.isin(freqs, np.asarray(list(frequencies), dtype=np.float64))
+        if positive_only:
+            keep &= values > 0
+        return {_as_key(freq): float(value) for freq, value in zip(freqs[keep], values[keep])}
+
+    def metric_by_label(self, name, labels=None, resolution='octave', positive_only=True):
+        """Map band label (e.g. '1kHz') to a metric value"""
+        band_labels, _, _ = self.bands(resolution)
+        values = self.metric(name, resolution)
+        result = {}
+        for label, value in zip(band_labels, values):
+            if labels is not None and label not in labels:
+                continue
+            if positive_only and not value > 0:
+                continue
+            result[str(label)] = float(value)
+        return result
+
+
+def _as_key(freq):
+    """Use integer keys for whole-Hz bands to match existing lookups like {125: ...}"""
+    freq = float(freq)
+    return int(freq) if freq.is_integer() else freq
+
+
+def _to_floats(fields, width):
+    """Parse up to width numeric fields, padding missing cells with NaN"""
+    values = np.full(width, np.nan, dtype=np.float64)
+    for i, field in enumerate(fields[:width]):
+        field = field.strip()
+        if field:
+            values[i] = float(field)
+    return values
+
+
+def parse_smaart_log(file_path):
+    """Parse a Smaart log export into a SmaartLog
+
+    Raises:
+        OSError: If the file cannot be read
+        SmaartParseError: If the file has no recognisable Smaart tables
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    return parse_smaart_text(text, file_path)
+
+
+def parse_smaart_text(text, file_path='<memory>'):
+    """Parse the text of a Smaart log export (see parse_smaart_log)"""
+    date = ''
+    header = np.full(len(HEADER_FIELDS), np.nan, dtype=np.float64)
+    sti = np.full((len(STI_ROWS), 1 + len(STI_BAND_LABELS)), np.nan, dtype=np.float64)
+    broadband = np.full(len(METRICS), np.nan, dtype=np.float64)
+    rows = {'Oct': ([], []), '1/3': ([], [])}
+    in_filter_table = False
+
+    try:
+        for line in text.splitlines():
+            parts = line.rstrip('\r\n').split('\t')
+            key = parts[0].strip()
+
+            if key == 'Date' and len(parts) > 1:
+                date = parts[1].strip()
+            elif key in HEADER_LABELS and len(parts) > 1:
+                header[HEADER_FIELDS.index(HEADER_LABELS[key])] = float(parts[1])
+            elif key in STI_ROWS:
+                sti[STI_ROWS.index(key)] = _to_floats(parts[1:], sti.shape[1])
+            elif key == 'Filter':
+                in_filter_table = True
+            elif key in rows and len(parts) >= 3:
+                labels, values = rows[key]
+                labels.append(parts[1].strip())
+                values.append(_to_floats(parts[2:], len(METRICS)))
+            elif in_filter_table and key == '' and len(parts) > 2 and parts[1].strip() == '':
+                # Unlabelled row directly under the Filter header is the broadband result
+                broadband = _to_floats(parts[2:], len(METRICS))
+    except ValueError as e:
+        raise SmaartParseError(f"{file_path}: malformed value ({e})") from e
+
+    if not rows['Oct'][0] and not rows['1/3'][0] and np.isnan(sti).all():
+        raise SmaartParseError(f"{file_path}: no Smaart band tables found")
+
+    tables = []
+    for key in ('Oct', '1/3'):
+        labels, values = rows[key]
+        try:
+            freqs = np.array([parse_band_label(label) for label in labels], dtype=np.float64)
+        except ValueError as e:
+            raise SmaartParseError(f"{file_path}: bad band label ({e})") from e
+        matrix = np.vstack(values) if values else np.empty((0, len(METRICS)), dtype=np.float64)
+        tables.append((np.array(labels, dtype=str), freqs, matrix))
+
+    (oct_labels, oct_freqs, octave), (third_labels, third_freqs, third_octave) = tables
+    return SmaartLog(file_path, date, header, sti, broadband,
+                     oct_labels, oct_freqs, octave,
+                     third_labels, third_freqs, third_octave)
+
+
+# Process-wide parsed logs, keyed by resolved path and invalidated on size/mtime change
+# (backed by the persistent .npz cache in measurement_cache)
+_loaded_logs = {}
+_loaded_logs_lock = threading.Lock()
+
+
+def load_smaart_log(file_path):
+    """Return the parsed SmaartLog for a file, reusing the in-process or on-disk copy when unchanged
+
+    Returns None (and prints a warning) when the file is missing or unparseable,
+    matching the behaviour of the per-module parsers this replaces.
+    """
+    path = Path(file_path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = str(path.resolve())
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    with _loaded_logs_lock:
+        cached = _loaded_logs.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        # Deferred import: measurement_cache builds on the classes defined here
+        from measurement_cache import get_measurement_cache
+        log = get_measurement_cache().load(path, stat)
+    except (OSError, SmaartParseError) as e:
+        print(f"Error parsing {path}: {e}")
+        return None
+
+    with _loaded_logs_lock:
+        _loaded_logs[key] = (stamp, log)
+    return log
+
+
+if __name__ == "__main__":
+    import sys
+
+    for arg in sys.argv[1:] or ['data/raw/250715-smaartLogs/Std8/Std8-HostA-128k-Sweep.txt']:
+        log = load_smaart_log(arg)
+        if log is None:
+            continue
+        print(f"{log.path.name}: {log.date}")
+        print(f"  Header: {log.header_dict()}")
+        print(f"  STI: {log.overall_sti():.2f} overall, bands {log.sti_bands().tolist()}")
+        print(f"  Octave RT60: {log.metric_by_frequency('RT60')}")
+        print(f"  1/3-octave bands: {len(log.third_octave_freqs)}")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Space Registry
+Broadcast space definitions (dimensions, geometry, positions, datasets, targets) loaded from data/spaces
+"""
+
+import json
+import threading
+from pathlib import Path
+
+from columnar_store import GENERATED_DIR, dataset_files
+from startup_profile import import_component
+
+SPACES_DIR = Path("data/spaces")
+REGISTRY_FILE = 'spaces.json'
+
+
+class SpaceDefinition:
+    """One broadcast space as described by its data/spaces/<id>.json file
+
+    Attributes mirror the top-level JSON keys; see Studio8.json for the full
+    layout. Baseline RT60 keys are converted to int Hz.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.name = config['name']
+        self.id = config['id']
+        self.description = config.get('description', '')
+        self.dimensions = config.get('dimensions', {})
+        self.geometry = config.get('geometry', {})
+        self.measurement_positions = config.get('measurement_positions', {})
+        self.position_sources = config.get('position_sources', {})
+        self.position_labels = config.get('position_labels', {})
+        self.reference_position = config.get('reference_position')
+        self.raw_logs = Path(config['raw_logs']) if config.get('raw_logs') else None
+        self.datasets = config.get('datasets', {})
+        self.panels = config.get('panels', {})
+        self.targets = config.get('targets', {})
+        self.features = config.get('features', {})
+
+        baseline = dict(config.get('baseline', {}))
+        if 'rt60_by_freq' in baseline:
+            baseline['rt60_by_freq'] = {int(freq): value for freq, value in baseline['rt60_by_freq'].items()}
+        self.baseline = baseline
+
+    def __repr__(self):
+        return f"SpaceDefinition({self.name!r})"
+
+    @property
+    def default_panels(self):
+        return self.panels.get('default_count', 0)
+
+    @property
+    def max_panels(self):
+        return self.panels.get('max_count', 32)
+
+    def has(self, feature):
+        """True when a boolean feature flag (e.g. 'sti', 'drape') is enabled"""
+        return bool(self.features.get(feature, False))
+
+    def dataset_path(self, kind, root=Path('.')):
+        """CSV path of a generated dataset ('frequency_response', 'modal_stack', ...)
+
+        Dataset names may be glob patterns; the first match (in name order)
+        wins. Returns the literal path when nothing matches, or None when the
+        space defines no such dataset.
+        """
+        pattern = self.datasets.get(kind)
+        if pattern is None:
+            return None
+        directory = Path(root) / GENERATED_DIR
+        matches = dataset_files(directory, pattern) if directory.exists() else []
+        return matches[0] if matches else directory / f"{pattern}.csv"
+
+    def load_component(self, key, *args, **kwargs):
+        """Instantiate a 'module:Class' component named in features (e.g. 'rt60_analyzer')
+
+        The module is imported only when the component is first needed, so a
+        space's analysis code never loads unless that space is selected.
+        """
+        target = self.features.get(key)
+        if not target:
+            return None
+        module_name, class_name = target.split(':')
+        return getattr(import_component(module_name), class_name)(*args, **kwargs)
+
+
+_registry = None
+_definitions = {}
+_lock = threading.Lock()
+
+
+def _load_registry():
+    """The small spaces.json index (names, ids, log prefixes); per-space files load on demand"""
+    global _registry
+    with _lock:
+        if _registry is None:
+            with open(SPACES_DIR / REGISTRY_FILE, 'r') as f:
+                _registry = json.load(f)['spaces']
+        return _registry
+
+
+def reload_registry():
+    """Forget parsed space files so the next lookup rereads data/spaces"""
+    global _registry
+    with _lock:
+        _registry = None
+        _definitions.clear()
+
+
+def space_names():
+    """Display names of every registered space, in registry order"""
+    return [entry['name'] for entry in _load_registry()]
+
+
+def log_prefixes():
+    """Map Smaart file-name prefixes (e.g. 'Std8') to space names"""
+    return {prefix: entry['name'] for entry in _load_registry() for prefix in entry.get('log_prefixes', [])}
+
+
+def get_space(name):
+    """SpaceDefinition for a display name or id, parsed the first time it is requested
+
+    Raises:
+        KeyError: If no registered space has that name or id
+    """
+    for entry in _load_registry():
+        if name in (entry['name'], entry['id']):
+            break
+    else:
+        raise KeyError(f"Unknown space: {name}")
+
+    with _lock:
+        definition = _definitions.get(entry['name'])
+        if definition is None:
+            with open(SPACES_DIR / entry['file'], 'r') as f:
+                definition = SpaceDefinition(json.load(f))
+            _definitions[entry['name']] = definition
+        return definition
+
+
+if __name__ == "__main__":
+    for name in space_names():
+        space = get_space(name)
+        print(f"{space.name} ({space.id}): {len(space.measurement_positions)} positions, "
+              f"panels {space.default_panels}/{space.max_panels}, features {sorted(space.features)}")
+        for kind in space.datasets:
+            path = space.dataset_path(kind)
+            print(f"  {kind:22s} {path}{'' if path.exists() else ' (missing)'}")
@@ -46,27 +46,70 @@ echo "   File watching: disabled (for stability)"
 echo "   Usage stats: disabled"
 echo ""
 
-# Create a simple health check script
+# Create a health check script (server up, then every panel-count figure precomputed)
 cat > health_check.py << 'EOF'
+import json
+import os
 import time
 import requests
 import sys
 
+BASE_URL = 'http://127.0.0.1:8501'
+STATUS_FILE = os.path.join(os.environ.get('CBC_CACHE_DIR', '.cache'), 'warmup_status.json')
+
+# Wait for the server to come up
 max_attempts = 30
 for i in range(max_attempts):
     try:
-        response = requests.get('http://127.0.0.1:8501/_stcore/health', timeout=5)
+        response = requests.get(f'{BASE_URL}/_stcore/health', timeout=5)
         if response.status_code == 200:
             print(f"✅ Dashboard is healthy after {i+1} attempts")
-            sys.exit(0)
+            break
     except:
         pass
     time.sleep(1)
-    
-print("❌ Dashboard failed health check")
+else:
+    print("❌ Dashboard failed health check")
+    sys.exit(1)
+
+# Run the dashboard script once server-side (needs --server.scriptHealthCheckEnabled true);
+# the first run starts the panel-count figure warm-up without waiting for a browser
+try:
+    response = requests.get(f'{BASE_URL}/_stcore/script-health-check', timeout=120)
+    if response.status_code != 200:
+        print(f"❌ Dashboard script failed: {response.text}")
+        sys.exit(1)
+except requests.RequestException as e:
+    print(f"⚠️ Script health check unavailable ({e}); warm-up starts with the first visitor")
+
+# Ready once every panel-count figure has been precomputed by this server process
+server_pid = open('dashboard.pid').read().strip() if os.path.exists('dashboard.pid') else None
+max_wait = 300
+for i in range(max_wait):
+    try:
+        with open(STATUS_FILE) as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        status = None
+    if status and (server_pid is None or str(status['pid']) == server_pid):
+        if status['state'] == 'ready':
+            failed = f", {status['failed']} failed" if status['failed'] else ""
+            print(f"✅ Figures ready: {status['figures']} precomputed in {status['elapsed_s']}s{failed}")
+            sys.exit(0)
+        if status['state'] == 'disabled':
+            print("✅ Figure warm-up disabled (CBC_WARMUP=0); figures are built on demand")
+            sys.exit(0)
+        if i % 5 == 0:
+            print(f"⏳ Warming figures: {status['done']}/{status['total']}")
+    time.sleep(1)
+
+print("❌ Figure warm-up did not finish")
 sys.exit(1)
 EOF
 
+# Forget the previous server's figure warm-up status
+rm -f "${CBC_CACHE_DIR:-.cache}/warmup_status.json"
+
 # Launch dashboard in background with nohup for complete detachment
 echo "🚀 Launching dashboard..."
 nohup python3 -m streamlit run cbc8_acoustic_dashboard.py \
@@ -77,6 +120,7 @@ nohup python3 -m streamlit run cbc8_acoustic_dashboard.py \
     --server.allowRunOnSave false \
     --browser.gatherUsageStats false \
     --server.fileWatcherType none \
+    --server.scriptHealthCheckEnabled true \
     --logger.level warning > dashboard_background.log 2>&1 &
 
 DASHBOARD_PID=$!
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Startup Profile
+Lazy, timed imports of dashboard components and a per-page import cost report for cold starts
+"""
+
+import importlib
+import re
+import subprocess
+import sys
+import threading
+import time
+
+# Component modules each dashboard page imports on first use (the Summary page needs none)
+PAGE_MODULES = {
+    "Summary": [],
+    "Data Explorer": ["data_explorer"],
+    "3D Room Model": ["enhanced_3d_visualizer", "rt60_heatmap_analyzer_fixed", "measurement_index"],
+    "Frequency Response": ["frequency_response_explorer"],
+    "Treatment Simulator": ["treatment_simulator"],
+}
+DASHBOARD_MODULE = "cbc8_acoustic_dashboard"
+
+_timings = {}
+_timings_lock = threading.Lock()
+
+
+def import_component(module_name):
+    """Import a component module on first use, recording how long the first import took"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    with _timings_lock:
+        _timings.setdefault(module_name, (time.perf_counter() - start) * 1000)
+    return module
+
+
+def import_timings():
+    """{module: ms} for components imported lazily by this process, in import order"""
+    with _timings_lock:
+        return dict(_timings)
+
+
+def measure_imports(modules, python=sys.executable):
+    """Cold-import modules in a fresh interpreter; returns [(module, ms, depth)] in import order
+
+    Uses ``python -X importtime``, so ms is the cumulative cost of a module
+    including every dependency it was first to import (streamlit, pandas,
+    plotly, ...). Depth 0 entries are imported directly by the interpreter,
+    depth 1 entries by those, and so on.
+    """
+    result = subprocess.run([python, "-X", "importtime", "-c", "; ".join(f"import {m}" for m in modules)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+
+    costs = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$", line)
+        if match:
+            costs.append((match.group(3), int(match.group(1)) / 1000, len(match.group(2)) // 2))
+    # importtime reports a module when its import finishes, so children precede their parent
+    return costs
+
+
+def startup_report():
+    """Per-page cold import cost: {page: {'total_ms', 'interpreter_ms', 'modules': [(module, ms), ...]}}
+
+    Every page starts from a fresh interpreter importing the dashboard, so each
+    total is what a newly started replica pays before that page first paints.
+    modules lists the dashboard and page modules followed by their direct
+    imports ('dashboard/streamlit'), largest first.
+    """
+    report = {}
+    for page, modules in PAGE_MODULES.items():
+        requested = [DASHBOARD_MODULE] + modules
+        costs = measure_imports(requested)
+
+        entries, children = [], []
+        for module, ms, depth in costs:
+            if depth == 1:
+                children.append((module, ms))
+            elif depth == 0:
+                if module in requested:
+                    entries.append((module, ms))
+                    entries.extend((f"{module}/{child}", child_ms) for child, child_ms in children)
+                children = []
+
+        total_ms = sum(ms for _, ms, depth in costs if depth == 0)
+        requested_ms = sum(ms for module, ms in entries if module in requested)
+        report[page] = {'total_ms': total_ms, 'interpreter_ms': total_ms - requested_ms,
+                        'modules': sorted(entries, key=lambda entry: -entry[1])}
+    return report
+
+
+if __name__ == "__main__":
+    import json
+
+    report = startup_report()
+    if "--json" in sys.argv:
+        print(json.dumps(report, indent=1))
+    else:
+        for page, entry in report.items():
+            print(f"{page}: {entry['total_ms']:.0f} ms (interpreter startup {entry['interpreter_ms']:.0f} ms)")
+            for module, ms in entry['modules'][:10]:
+                print(f"  {ms:8.1f} ms  {module}")
@@ -6,19 +6,36 @@ Real-time before/after comparison with interactive panel placement
 
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
-import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
 
+from columnar_store import read_dataset
+from frequency_axis import frequency_axis, warp_frequency
+from render_timing import timed
+from space_registry import get_space, space_names
+
+# Panel quantity inputs in display order (spaces override limits/help via panels.inputs in data/spaces)
+PANEL_INPUTS = {
+    "11_inch": {"label": '11"', "max": 20, "key": "panel_11_input",
+                "help": "Superior bass traps for corners - maximum low frequency absorption (63Hz+)"},
+    "5_5_inch": {"label": '5.5"', "max": 50, "key": "panel_5_5_input",
+                 "help": "Excellent broadband absorption, especially low frequencies (125Hz+)"},
+    "3_inch": {"label": '3"', "max": 50, "key": "panel_3_input",
+               "help": "Good for mid-to-high frequency absorption (500Hz+)"},
+    "2_inch": {"label": '2"', "max": 50, "key": "panel_2_input",
+               "help": "Budget option for high-frequency absorption (1kHz+)"}
+}
+
 class TreatmentSimulator:
-    def __init__(self):
+    def __init__(self, space=None):
         self.base_path = Path('/Users/chrislyons/Documents/CL/dev/std8/cbc-interactive-dashboard')
         
-        # Load default space data (will be updated in render method)
-        self._load_space_parameters("Studio 8")
+        # Load space data (the default space unless given; reloaded if rendered for another space)
+        self.space = space or space_names()[0]
+        self._load_space_parameters(self.space)
+        self.drape_data = self._load_drape_data(self.space)
         
         # Panel specifications
         self.panel_specs = {
@@ -48,38 +65,15 @@ class TreatmentSimulator:
             }
         }
         
-        # Current room conditions (from analysis)
-        self.current_conditions = {
-            "rt60_by_freq": {
-                125: 0.85, 250: 0.92, 500: 0.78, 1000: 0.71, 2000: 0.68, 4000: 0.55
-            },
-            "sti_by_position": {
-                "Host A (Reference)": 0.95,
-                "Host C (Talent)": 0.67,
-                "Mid Room": 0.71,
-                "NE Corner": 0.58,
-                "SE Corner": 0.62,
-                "Ceiling": 0.64
-            },
-            "average_sti": 0.67,
-            "average_rt60": 0.75
-        }
-        
-        # Target conditions
-        self.target_conditions = {
-            "rt60_target": 0.4,
-            "sti_target": 0.75,
-            "rt60_range": [0.3, 0.5]
-        }
+        # Current room conditions and targets come from the space definition (see _load_space_parameters)
     
     def _load_drape_data(self, space="Studio 8"):
         """Load drape compensation data from CSV file"""
         try:
-            # Determine space-specific file
-            space_id = "Studio8" if space == "Studio 8" else "TheHub"
-            drape_file = self.base_path / f"data/generated/250728-{space_id}-Drape_Compensation_Evidence.csv"
-            if drape_file.exists():
-                drape_df = pd.read_csv(drape_file)
+            # Space-specific file from the registry
+            drape_file = get_space(space).dataset_path('drape_compensation', self.base_path)
+            if drape_file is not None and drape_file.exists():
+                drape_df = read_dataset(drape_file)
                 # Convert to dictionary format for easy lookup
                 drape_absorption = {}
                 for _, row in drape_df.iterrows():
@@ -128,49 +122,25 @@ class TreatmentSimulator:
         return equivalents
     
     def _load_space_parameters(self, space="Studio 8"):
-        """Load space-specific room parameters and RT60 data"""
-        if space == "The Hub":
-            # The Hub parameters (hexagonal space)
-            self.room_volume = 1900  # cubic feet (estimated)
-            self.room_surface_area = 1400  # square feet (estimated)
-            
-            # The Hub RT60 data (different acoustic characteristics)
-            self.current_conditions = {
-                "rt60_by_freq": {
-                    125: 0.72, 250: 0.78, 500: 0.65, 1000: 0.58, 2000: 0.52, 4000: 0.48
-                },
-                "sti_by_position": {
-                    "Back Corner": 0.73,
-                    "Ceiling Corner": 0.68,
-                    "Chair 1": 0.75,
-                    "Chair 2": 0.71,
-                    "Mid Room": 0.69
-                },
-                "average_sti": 0.71,
-                "average_rt60": 0.62
-            }
-        else:
-            # Studio 8 parameters (default)
-            self.room_volume = 2650  # cubic feet
-            self.room_surface_area = 1847  # square feet
-            
-            # Studio 8 RT60 data (from analysis)
-            self.current_conditions = {
-                "rt60_by_freq": {
-                    125: 0.85, 250: 0.92, 500: 0.78, 1000: 0.71, 2000: 0.68, 4000: 0.55
-                },
-                "sti_by_position": {
-                    "Host A (Reference)": 0.95,
-                    "Host C (Talent)": 0.67,
-                    "Mid Room": 0.71,
-                    "NE Corner": 0.58,
-                    "SE Corner": 0.62,
-                    "Ceiling": 0.64
-                },
-                "average_sti": 0.67,
-                "average_rt60": 0.75
-            }
-    
+        """Load space-specific room parameters and RT60 data from the space registry"""
+        space_def = get_space(space)
+        self.room_volume = space_def.dimensions['volume_ft3']  # cubic feet
+        self.room_surface_area = space_def.dimensions['surface_area_ft2']  # square feet
+        
+        # Baseline RT60/STI from the analysis, copied so session edits never touch the registry
+        self.current_conditions = {
+            "rt60_by_freq": dict(space_def.baseline["rt60_by_freq"]),
+            "sti_by_position": dict(space_def.baseline["sti_by_position"]),
+            "average_sti": space_def.baseline["average_sti"],
+            "average_rt60": space_def.baseline["average_rt60"]
+        }
+        
+        # Target conditions
+        self.target_conditions = {
+            "rt60_target": space_def.targets["rt60_target"],
+            "sti_target": space_def.targets["sti_target"],
+            "rt60_range": list(space_def.targets["rt60_range"])
+        }
     
     def _get_absorption_curve(self, thickness):
         """Get frequency-dependent absorption coefficients"""
@@ -250,6 +220,7 @@ class TreatmentSimulator:
         
         return min(target_sti, current_sti + sti_improvement)
     
+    @timed('figure')
     def create_before_after_comparison(self, panel_counts, drape_removal):
         """Create sexy EQ-style curve comparison chart with richer frequency data"""
         
@@ -350,50 +321,20 @@ class TreatmentSimulator:
         avg_treated = np.mean(treated_smooth)
         improvement_pct = ((avg_current - avg_treated) / avg_current) * 100
         
-        # Transform frequency data with extended range (30Hz to 3kHz)
-        def transform_frequency_scale(freq):
-            """Transform frequency to evenly spaced positions with 30Hz-3kHz boundaries"""
-            # Extended tick frequencies with 30Hz and 3kHz boundaries
-            tick_freqs = [30, 60, 90, 120, 180, 250, 360, 540, 770, 1000, 1500, 2000, 3000]
-            
-            # Handle frequencies outside our range
-            if freq <= tick_freqs[0]:
-                return 0.0
-            if freq >= tick_freqs[-1]:
-                return float(len(tick_freqs) - 1)
-            
-            # Find the two adjacent tick frequencies
-            for i in range(len(tick_freqs) - 1):
-                if tick_freqs[i] <= freq <= tick_freqs[i + 1]:
-                    # Linear interpolation between the two evenly spaced positions
-                    freq_ratio = (freq - tick_freqs[i]) / (tick_freqs[i + 1] - tick_freqs[i])
-                    return float(i) + freq_ratio
-            
-            return 0.0  # Fallback
-        
-        # Transform the frequency data for all traces
-        transformed_freqs = [transform_frequency_scale(f) for f in extended_freqs]
+        # Warp the frequencies onto the evenly spaced 30Hz-3kHz tick scale
+        transformed_freqs = warp_frequency(extended_freqs)
         
         # Update all traces to use transformed frequencies
-        fig.data[0].x = transformed_freqs + transformed_freqs[::-1]  # Target zone
+        fig.data[0].x = np.concatenate([transformed_freqs, transformed_freqs[::-1]])  # Target zone
         fig.data[1].x = transformed_freqs  # Current RT60
         fig.data[2].x = transformed_freqs  # Treated RT60
         fig.data[3].x = transformed_freqs  # Target curve
         
-        # Set up tick configuration with 30Hz-3kHz range
-        tick_freqs = [30, 60, 90, 120, 180, 250, 360, 540, 770, 1000, 1500, 2000, 3000]
-        tick_texts = ["30Hz", "60Hz", "90Hz", "120Hz", "180Hz", "250Hz", "360Hz", "540Hz", "770Hz", "1kHz", "1.5kHz", "2kHz", "3kHz"]
-        tick_positions = list(range(len(tick_freqs)))  # 0, 1, 2, ... 12
-        
         fig.update_layout(
             title="",  # Empty string instead of None to avoid "undefined"
             xaxis=dict(
                 title="Frequency (Hz)",
-                type="linear",  # Linear scale with pre-transformed data
-                range=[0, len(tick_freqs) - 1],  # 0 to 14
-                tickmode="array",
-                tickvals=tick_positions,
-                ticktext=tick_texts,
+                **frequency_axis(),
                 gridcolor="rgba(128,128,128,0.2)",
                 showgrid=True,
                 zeroline=False
@@ -431,6 +372,7 @@ class TreatmentSimulator:
         
         return fig
     
+    @timed('figure')
     def create_treatment_effectiveness_chart(self, panel_counts, drape_removal):
         """Create treatment effectiveness visualization"""
         
@@ -474,6 +416,7 @@ class TreatmentSimulator:
         
         return fig
     
+    @timed('figure')
     def create_cost_benefit_analysis(self, max_panels=50):
         """Create cost vs benefit analysis"""
         
@@ -572,6 +515,7 @@ class TreatmentSimulator:
         
         return fig
     
+    @timed('figure')
     def create_position_improvement_heatmap(self, panel_counts, drape_removal):
         """Create position-specific improvement predictions"""
         
@@ -640,18 +584,20 @@ class TreatmentSimulator:
         
         return fig
     
+    @timed('render')
     def render_treatment_simulator(self, space="Studio 8"):
         """Main rendering function for treatment simulator"""
         
+        space_def = get_space(space)
+        
         # Show space-specific info
-        if space == "The Hub":
-            st.info("**Interactive Panel Planning:** Build an acoustic treatment package for The Hub by selecting quantities of different panel thicknesses. See real-time acoustic impact and cost calculations..")
-        else:
-            st.info("**Interactive Panel Planning:** Build an acoustic treatment package for Studio 8 by selecting quantities of different panel thicknesses. See real-time acoustic impact and cost calculations.")
+        st.info(f"**Interactive Panel Planning:** Build an acoustic treatment package for {space_def.name} by selecting quantities of different panel thicknesses. See real-time acoustic impact and cost calculations.")
         
-        # Load space-specific data
-        self._load_space_parameters(space)
-        self.drape_data = self._load_drape_data(space)
+        # Load space-specific data (shared instances are built per space and skip this)
+        if space != self.space:
+            self.space = space
+            self._load_space_parameters(space)
+            self.drape_data = self._load_drape_data(space)
         
         # Control panel
         col1, col2 = st.columns([1, 1])
@@ -659,8 +605,8 @@ class TreatmentSimulator:
         with col1:
             st.subheader("Panel Planning")
             
-            # Drape removal consideration - only for Studio 8
-            if space == "Studio 8":
+            # Drape removal consideration - only for spaces with a removable drape
+            if space_def.has('drape'):
                 st.markdown("**Drape Impact Analysis**")
                 drape_removal = st.checkbox(
                     "Account for Lighting Grid Drape Removal",
@@ -678,144 +624,38 @@ class TreatmentSimulator:
                 
                 st.markdown("---")
             else:
-                # For The Hub, no drape to remove
+                # No drape to remove (e.g. The Hub)
                 drape_removal = False
             
             # Initialize session state for panel counts - space-specific defaults aligned with cannon
-            if space == "Studio 8":
-                # Studio 8 updated defaults: 25 total panels (3 + 6 + 12 + 4 = 25)
-                # Priority: 4x11" corner bass traps, 12x5.5" ceiling clouds, 3x2" desk clouds, 5x3" north wall
-                if 'panel_2_inch' not in st.session_state:
-                    st.session_state.panel_2_inch = 3  # Desk clouds
-                if 'panel_3_inch' not in st.session_state:
-                    st.session_state.panel_3_inch = 6  # Wall panels (updated)
-                if 'panel_5_5_inch' not in st.session_state:
-                    st.session_state.panel_5_5_inch = 12  # Ceiling clouds
-                if 'panel_11_inch' not in st.session_state:
-                    st.session_state.panel_11_inch = 4  # Corner bass traps
-            else:
-                # The Hub updated defaults: 8 total panels (0 + 4 + 4 + 0 = 8)
-                # Priority: 2x3" ceiling clouds, 2x5.5" east wall, 2x3" NE wall, 4x3" NW wall, 4x2" LED panels, 2x5.5" north wall
-                if 'panel_2_inch' not in st.session_state:
-                    st.session_state.panel_2_inch = 0  # Reduced for optimal 8-panel config
-                if 'panel_3_inch' not in st.session_state:
-                    st.session_state.panel_3_inch = 4  # Reduced for optimal 8-panel config
-                if 'panel_5_5_inch' not in st.session_state:
-                    st.session_state.panel_5_5_inch = 4  # East wall + North wall (2+2)
-                if 'panel_11_inch' not in st.session_state:
-                    st.session_state.panel_11_inch = 0  # Default 0, max 1x 11" bass trap for The Hub
-            
-            # Shopping cart style selectors - horizontal layout with 4 columns for Studio 8
+            # (Studio 8: 4x11" corner bass traps, 12x5.5" ceiling clouds, 6x3" walls, 3x2" desk clouds;
+            #  The Hub: 4x3" + 4x5.5" optimal 8-panel config)
+            for panel_type, default_count in space_def.panels['simulator_defaults'].items():
+                if f'panel_{panel_type}' not in st.session_state:
+                    st.session_state[f'panel_{panel_type}'] = default_count
+            
+            # Shopping cart style selectors - horizontal layout with one column per panel type
+            # (per-space limits, e.g. at most one 11" bass trap in The Hub, come from the registry)
             st.markdown("**Panels (Mineral Wool, Framing, Hardware, Fabric)**")
-            if space == "Studio 8":
-                col_11, col_5, col_3, col_2 = st.columns(4)
-                
-                with col_11:
-                    st.markdown("**11\" @ $45 ea.**")
-                    panel_11_count = st.number_input(
-                        "Qty:",
-                        min_value=0,
-                        max_value=20,
-                        value=st.session_state.panel_11_inch,
-                        step=1,
-                        key="panel_11_input",
-                        help="Superior bass traps for corners - maximum low frequency absorption (63Hz+)"
-                    )
-                    st.session_state.panel_11_inch = panel_11_count
-                
-                with col_5:
-                    st.markdown("**5.5\" @ $30 ea.**")
-                    panel_5_5_count = st.number_input(
-                        "Qty:",
-                        min_value=0,
-                        max_value=50,
-                        value=st.session_state.panel_5_5_inch,
-                        step=1,
-                        key="panel_5_5_input",
-                        help="Excellent broadband absorption, especially low frequencies (125Hz+)"
-                    )
-                    st.session_state.panel_5_5_inch = panel_5_5_count
-                
-                with col_3:
-                    st.markdown("**3\" @ $25 ea.**")
-                    panel_3_count = st.number_input(
-                        "Qty:",
-                        min_value=0,
-                        max_value=50,
-                        value=st.session_state.panel_3_inch,
-                        step=1,
-                        key="panel_3_input",
-                        help="Good for mid-to-high frequency absorption (500Hz+)"
-                    )
-                    st.session_state.panel_3_inch = panel_3_count
-                
-                with col_2:
-                    st.markdown("**2\" @ $20 ea.**")
-                    panel_2_count = st.number_input(
-                        "Qty:",
-                        min_value=0,
-                        max_value=50,
-                        value=st.session_state.panel_2_inch,
-                        step=1,
-                        key="panel_2_input",
-                        help="Budget option for high-frequency absorption (1kHz+)"
-                    )
-                    st.session_state.panel_2_inch = panel_2_count
-            else:
-                # The Hub - 4 columns including 11" bass trap (max 1)
-                col_11, col_5, col_3, col_2 = st.columns(4)
-                
-                with col_11:
-                    st.markdown("**11\" @ $45 ea.**")
-                    panel_11_count = st.number_input(
-                        "Qty:",
-                        min_value=0,
-                        max_value=1,  # Maximum 1x 11" bass trap for The Hub
-                        value=st.session_state.panel_11_inch,
-                        step=1,
-                        key="panel_11_input_hub",
-                        help="Premium corner bass trap - maximum low frequency absorption (top priority)"
-                    )
-                    st.session_state.panel_11_inch = panel_11_count
-                
-                with col_5:
-                    st.markdown("**5.5\" @ $30 ea.**")
-                    panel_5_5_count = st.number_input(
-                        "Qty:",
-                        min_value=0,
-                        max_value=50,
-                        value=st.session_state.panel_5_5_inch,
-                        step=1,
-                        key="panel_5_5_input",
-                        help="Excellent broadband absorption, especially low frequencies (125Hz+)"
-                    )
-                    st.session_state.panel_5_5_inch = panel_5_5_count
-                
-                with col_3:
-                    st.markdown("**3\" @ $25 ea.**")
-                    panel_3_count = st.number_input(
-                        "Qty:",
-                        min_value=0,
-                        max_value=50,
-                        value=st.session_state.panel_3_inch,
-                        step=1,
-                        key="panel_3_input",
-                        help="Good for mid-to-high frequency absorption (500Hz+)"
-                    )
-                    st.session_state.panel_3_inch = panel_3_count
-                
-                with col_2:
-                    st.markdown("**2\" @ $20 ea.**")
-                    panel_2_count = st.number_input(
+            selected_counts = {}
+            for column, (panel_type, panel_input) in zip(st.columns(len(PANEL_INPUTS)), PANEL_INPUTS.items()):
+                panel_input = {**panel_input, **space_def.panels.get('inputs', {}).get(panel_type, {})}
+                with column:
+                    st.markdown(f"**{panel_input['label']} @ ${self.panel_specs[panel_type]['cost']} ea.**")
+                    selected_counts[panel_type] = st.number_input(
                         "Qty:",
                         min_value=0,
-                        max_value=50,
-                        value=st.session_state.panel_2_inch,
+                        max_value=panel_input['max'],
+                        value=st.session_state[f'panel_{panel_type}'],
                         step=1,
-                        key="panel_2_input",
-                        help="Budget option for high-frequency absorption (1kHz+)"
+                        key=panel_input['key'],
+                        help=panel_input['help']
                     )
-                    st.session_state.panel_2_inch = panel_2_count
+                    st.session_state[f'panel_{panel_type}'] = selected_counts[panel_type]
+            panel_11_count = selected_counts["11_inch"]
+            panel_5_5_count = selected_counts["5_5_inch"]
+            panel_3_count = selected_counts["3_inch"]
+            panel_2_count = selected_counts["2_inch"]
             
             # Create panel counts dictionary
             panel_counts = {
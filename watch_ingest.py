@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Watch-Folder Incremental Ingestion
+Polls data/raw for new Smaart logs and updates only the affected derived rows
+
+Screenshots are not watched: their responses are modelled by hand in
+generate_hub_frequency_response_from_screenshots.py, so a new screenshot
+carries no data this script could read.
+
+The first run records what is already on disk as ingested and changes
+nothing; pass --rebuild to process every log instead.
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from ingest_campaign import RAW_DIR, TABLE_PATH, campaign_for, log_table, parse_log_name, write_csv_atomic
+from measurement_cache import get_measurement_cache
+from smaart_parser import SmaartParseError
+
+GENERATED_DIR = Path("data/generated")
+STATE_PATH = Path(os.environ.get('CBC_CACHE_DIR', '.cache')) / 'watch_ingest.json'
+
+# Spaces whose derived datasets are generated from raw files (see generate_hub_*.py)
+DERIVED_SPACE_IDS = {'The Hub': 'TheHub'}
+
+
+def latest_dataset(space_id, dataset):
+    """Newest generated CSV for a space/dataset, e.g. 250731-TheHub-Complete_Frequency_Response.csv"""
+    matches = sorted(GENERATED_DIR.glob(f"*-{space_id}-{dataset}.csv"))
+    return matches[-1] if matches else None
+
+
+def splice_rows(output_file, key_column, key_value, new_rows, sort_by=None):
+    """Replace the rows of one position in a generated CSV, keeping every other row untouched
+
+    New columns are appended; existing column order is preserved. The file is
+    rewritten atomically so the dashboard never reads a half-updated dataset.
+    """
+    existing = pd.read_csv(output_file)
+    new_df = pd.DataFrame(new_rows)
+    columns = list(existing.columns) + [c for c in new_df.columns if c not in existing.columns]
+    kept = existing[existing[key_column] != key_value]
+    updated = pd.concat([kept, new_df], ignore_index=True).reindex(columns=columns)
+    if sort_by is not None:
+        updated = updated.sort_values(sort_by, ascending=False)
+    write_csv_atomic(updated, output_file)
+    return len(existing) - len(kept), len(new_df)
+
+
+class WatchIngest:
+    """Incrementally folds new raw measurement files into the generated datasets"""
+
+    def __init__(self, raw_dir=RAW_DIR, state_path=STATE_PATH, table_path=TABLE_PATH, rebuild=False):
+        self.raw_dir = Path(raw_dir)
+        self.state_path = Path(state_path)
+        self.table_path = Path(table_path)
+        # An empty state (rather than None) makes every log on disk count as new
+        self.seen = {} if rebuild else self._load_state()
+        self.pending = {}
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.seen, f, indent=1)
+        os.replace(tmp_path, self.state_path)
+
+    def _snapshot(self):
+        """Current (size, mtime) of every watched Smaart log"""
+        snapshot = {}
+        for path in self.raw_dir.rglob('*.txt'):
+            if path.is_file():
+                stat = path.stat()
+                snapshot[str(path)] = [stat.st_size, stat.st_mtime_ns]
+        return snapshot
+
+    def poll(self):
+        """Process files that are new or changed since the last poll
+
+        A file is only processed once its size/mtime are unchanged across two
+        polls, so exports still being copied in are not read half-written.
+
+        Returns:
+            List of (path, message) describing what was updated
+        """
+        snapshot = self._snapshot()
+        if self.seen is None:
+            # First run: treat what is already on disk as ingested (see --rebuild)
+            self.seen = snapshot
+            self._save_state()
+            return []
+
+        results = []
+        for path, stamp in snapshot.items():
+            if self.seen.get(path) == stamp:
+                self.pending.pop(path, None)
+                continue
+            if self.pending.get(path) != stamp:
+                self.pending[path] = stamp
+                continue
+            del self.pending[path]
+            try:
+                message = self.process_log(Path(path))
+            except (OSError, SmaartParseError, KeyError, ValueError) as e:
+                message = f"failed: {e}"
+            self.seen[path] = stamp
+            results.append((path, message))
+
+        removed = [path for path in self.seen if path not in snapshot]
+        for path in removed:
+            del self.seen[path]
+        if results or removed:
+            self._save_state()
+        return results
+
+    def process_log(self, path):
+        """Parse one Smaart log and splice its rows into the table and derived datasets"""
+        parsed = parse_log_name(path)
+        if parsed is None:
+            return "skipped: not named <Space>-<Position>-<FFT>.txt"
+        space, position, _ = parsed
+        smaart_log = get_measurement_cache().load(path)
+        updates = []
+
+        if self.table_path.exists():
+            splice_rows(self.table_path, 'source_file', str(path), log_table(path, smaart_log).to_dict('records'))
+            updates.append(self.table_path.name)
+
+        space_id = DERIVED_SPACE_IDS.get(space)
+        if space_id is None:
+            note = f"no derived datasets are generated from {space} logs"
+            return f"updated {', '.join(updates)}; {note}" if updates else f"skipped: {note}"
+
+        import generate_hub_data
+        import generate_hub_frequency_simple
+
+        position_data = generate_hub_data.parse_smaart_file(path)
+        position_name = generate_hub_data.hub_position_name(path)
+        # The explorer's Complete_Frequency_Response is the dense 20 Hz-20 kHz curve from
+        # generate_hub_frequency_simple, not generate_hub_data's sparse third-octave rows
+        dense_rows = generate_hub_frequency_simple.position_frequency_rows(
+            position_name, generate_hub_frequency_simple.parse_smaart_file(path))
+        targets = [
+            ('Complete_Frequency_Response', 'position', position_name, dense_rows, None),
+            ('Evidence_Degradation_Analysis', 'position', position,
+             [generate_hub_data.evidence_degradation_row(position_name, position_data)], None),
+            ('Treatment_Priority_Matrix', 'position', position,
+             [generate_hub_data.treatment_priority_row(position_name, position_data)], 'priority_score')
+        ]
+        for dataset, key_column, key_value, rows, sort_by in targets:
+            output_file = latest_dataset(space_id, dataset)
+            if output_file is None:
+                output_file = GENERATED_DIR / f"{campaign_for(path, smaart_log.date)}-{space_id}-{dataset}.csv"
+                write_csv_atomic(pd.DataFrame(rows), output_file)
+            else:
+                splice_rows(output_file, key_column, key_value, rows, sort_by)
+            updates.append(f"{output_file.name} ({len(rows)} rows)")
+        return "updated " + ", ".join(updates)
+
+    def run(self, interval=2.0):
+        """Poll forever, printing each update"""
+        print(f"Watching {self.raw_dir} every {interval:g}s (Ctrl+C to stop)")
+        try:
+            while True:
+                for path, message in self.poll():
+                    print(f"{path}: {message}")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopped watching")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch data/raw and incrementally rebuild derived datasets")
+    parser.add_argument('--raw-dir', default=str(RAW_DIR), help="Directory to watch")
+    parser.add_argument('--interval', type=float, default=2.0, help="Polling interval in seconds")
+    parser.add_argument('--once', action='store_true', help="Process changes since the last run and exit")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="Ignore the saved state and process every log on disk")
+    args = parser.parse_args()
+
+    watcher = WatchIngest(raw_dir=args.raw_dir, rebuild=args.rebuild)
+    if args.once:
+        # Two polls so files that arrived while stopped pass the stability check
+        watcher.poll()
+        for path, message in watcher.poll():
+            print(f"{path}: {message}")
+    else:
+        watcher.run(args.interval)
+
+
+if __name__ == "__main__":
+    main()